@@ -1,7 +1,7 @@
 """MCP integration modules for Agent-NN."""
 
-from .mcp_client import MCPClient
+from .mcp_client import AsyncMCPClient, MCPClient
 from .mcp_server import create_app
 from .context_adapter import to_mcp, from_mcp
 
-__all__ = ["MCPClient", "create_app", "to_mcp", "from_mcp"]
+__all__ = ["MCPClient", "AsyncMCPClient", "create_app", "to_mcp", "from_mcp"]
@@ -2,20 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
 from typing import Any, List
 
 import httpx
 
 from core.model_context import ModelContext
+from core.tracing import traced
 
 from .context_adapter import from_mcp, to_mcp
 
+MCP_MAX_CONNECTIONS = int(os.getenv("MCP_MAX_CONNECTIONS", "100"))
+MCP_TIMEOUT = float(os.getenv("MCP_TIMEOUT", "30"))
+
+logger = logging.getLogger(__name__)
+
 
 class MCPClient:
     """Simple MCP client for executing tasks and managing context."""
 
     def __init__(self, endpoint: str = "http://localhost:9000") -> None:
-        self._client = httpx.Client(base_url=endpoint.rstrip("/"))
+        self._client = traced(httpx.Client(base_url=endpoint.rstrip("/")))
 
     def execute(self, ctx: ModelContext) -> ModelContext:
         """Dispatch a context to an MCP server and return the updated context."""
@@ -35,3 +44,84 @@ class MCPClient:
         resp.raise_for_status()
         data = resp.json().get("context", [])
         return [from_mcp(item) for item in data]
+
+
+class AsyncMCPClient:
+    """Async variant of :class:`MCPClient` sharing one connection pool.
+
+    The underlying ``httpx.AsyncClient`` is created on first use and bound to
+    the running event loop. When the client is used from a different loop,
+    the old pool is closed and a new one is created.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:9000",
+        max_connections: int = MCP_MAX_CONNECTIONS,
+        timeout: float = MCP_TIMEOUT,
+    ) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def _pool(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            stale, stale_loop = self._client, self._loop
+            self._client = traced(
+                httpx.AsyncClient(
+                    base_url=self.endpoint,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                )
+            )
+            self._loop = loop
+            if stale is not None and not stale.is_closed:
+                await self._close_stale(stale, stale_loop)
+        return self._client
+
+    @staticmethod
+    async def _close_stale(
+        client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None
+    ) -> None:
+        """Close a pool that belongs to another event loop."""
+        if loop is not None and loop.is_running():
+            # its connections are bound to that loop, so close it there
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except Exception:  # pragma: no cover - transports of a closed loop
+            logger.debug("closing stale MCP client failed", exc_info=True)
+
+    async def execute(self, ctx: ModelContext) -> ModelContext:
+        """Dispatch a context to an MCP server and return the updated context."""
+        pool = await self._pool()
+        resp = await pool.post("/v1/mcp/execute", json=to_mcp(ctx))
+        resp.raise_for_status()
+        return from_mcp(resp.json())
+
+    async def update_context(self, ctx: ModelContext) -> dict[str, Any]:
+        """Store context information at the MCP server."""
+        pool = await self._pool()
+        resp = await pool.post("/v1/mcp/context", json=to_mcp(ctx))
+        resp.raise_for_status()
+        return resp.json()
+
+    async def get_context(self, session_id: str) -> List[ModelContext]:
+        """Fetch all contexts for a given session."""
+        pool = await self._pool()
+        resp = await pool.get(f"/v1/mcp/context/{session_id}")
+        resp.raise_for_status()
+        data = resp.json().get("context", [])
+        return [from_mcp(item) for item in data]
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
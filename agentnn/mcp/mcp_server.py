@@ -16,6 +16,7 @@ from ..session.session_manager import SessionManager
 from .mcp_ws import ws_server
 from core.model_context import ModelContext
 from core.run_service import run_service
+from core.tracing import TracingMiddleware
 
 DISPATCHER_URL = os.getenv("DISPATCHER_URL", "http://task_dispatcher:8000")
 SESSION_MANAGER_URL = os.getenv("SESSION_MANAGER_URL", "http://session_manager:8000")
@@ -126,7 +127,7 @@ def create_app() -> FastAPI:
 
     @router.post("/session/{sid}/run_task")
     async def run_task_route(sid: str, payload: dict) -> dict:
-        ctx = session_pool.run_task(sid, payload.get("task", ""))
+        ctx = await session_pool.run_task_async(sid, payload.get("task", ""))
         return ctx.model_dump()
 
     @router.post("/task/ask", response_model=ModelContext)
@@ -169,6 +170,7 @@ def create_app() -> FastAPI:
         return {"status": "recorded"}
 
     app = FastAPI(title="Agent-NN MCP Server")
+    app.add_middleware(TracingMiddleware, service="mcp_server")
     app.include_router(router)
     app.include_router(ws_server.router)
     return app
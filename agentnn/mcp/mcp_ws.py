@@ -2,39 +2,152 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import os
+from typing import Any, Dict, List, Set
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.websockets import WebSocketState
+
+# events queued per connection before the overflow policy applies
+MCP_WS_QUEUE_SIZE = int(os.getenv("MCP_WS_QUEUE_SIZE", "100"))
+# "coalesce": drop the oldest queued events, "disconnect": close the socket
+MCP_WS_OVERFLOW = os.getenv("MCP_WS_OVERFLOW", "coalesce")
+# path segment subscribing to the events of all sessions
+ALL_SESSIONS = "*"
+
+
+class Subscription:
+    """A connected socket with its own bounded queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, sid: str, maxsize: int) -> None:
+        self.websocket = websocket
+        self.sid = sid
+        self.queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.closed = False
+        self.writer: asyncio.Task | None = None
+
+    def offer(self, event: Dict[str, Any], overflow: str) -> bool:
+        """Queue ``event``; return ``False`` if the consumer must be dropped."""
+        if self.queue.full():
+            if overflow == "disconnect":
+                return False
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+        return True
+
+    async def write(self) -> None:
+        while True:
+            event = await self.queue.get()
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                await self.websocket.send_json(
+                    {"event": "events_dropped", "session_id": self.sid, "count": dropped}
+                )
+            await self.websocket.send_json(event)
 
 
 class MCPWebSocketServer:
-    """Manage connections and broadcast session events."""
+    """Manage per-session subscriptions and fan out session events.
+
+    Each connection gets a bounded queue drained by its own writer task, so a
+    slow client only delays itself. :meth:`publish` may be called from any
+    thread; :meth:`broadcast` is the coroutine variant.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, queue_size: int = MCP_WS_QUEUE_SIZE, overflow: str = MCP_WS_OVERFLOW
+    ) -> None:
         self.router = APIRouter()
-        self.connections: List[WebSocket] = []
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.subscriptions: Dict[str, Set[Subscription]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
         self._register()
 
+    @property
+    def connections(self) -> List[WebSocket]:
+        return [s.websocket for subs in self.subscriptions.values() for s in subs]
+
     def _register(self) -> None:
         @self.router.websocket("/ws/session/{sid}")
         async def session_ws(websocket: WebSocket, sid: str) -> None:
             await websocket.accept()
-            self.connections.append(websocket)
+            sub = self._subscribe(websocket, sid)
             try:
-                while True:
+                while not sub.closed:
                     # keep connection alive
                     await websocket.receive_text()
-            except WebSocketDisconnect:
-                self.connections.remove(websocket)
+            except (WebSocketDisconnect, RuntimeError):
+                pass
+            finally:
+                self._unsubscribe(sub)
+
+    def _subscribe(self, websocket: WebSocket, sid: str) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        sub = Subscription(websocket, sid, self.queue_size)
+        sub.writer = asyncio.create_task(self._run_writer(sub))
+        self.subscriptions.setdefault(sid, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        sub.closed = True
+        if sub.writer and sub.writer is not asyncio.current_task():
+            sub.writer.cancel()
+        subs = self.subscriptions.get(sub.sid)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self.subscriptions[sub.sid]
+
+    async def _run_writer(self, sub: Subscription) -> None:
+        try:
+            await sub.write()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # client went away mid-send
+            self._unsubscribe(sub)
+
+    async def _disconnect(self, sub: Subscription) -> None:
+        self._unsubscribe(sub)
+        try:
+            await sub.websocket.close(code=1013)
+        except Exception:
+            pass
+
+    def _fanout(self, event: Dict[str, Any]) -> None:
+        """Queue ``event`` for its session and the wildcard subscribers."""
+        sid = event.get("session_id")
+        if sid is None:
+            targets = [s for subs in self.subscriptions.values() for s in subs]
+        else:
+            targets = [
+                *self.subscriptions.get(str(sid), ()),
+                *self.subscriptions.get(ALL_SESSIONS, ()),
+            ]
+        for sub in targets:
+            if not sub.offer(event, self.overflow):
+                asyncio.ensure_future(self._disconnect(sub))
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Thread-safe, non-blocking publish of ``event``."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self.subscriptions:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(event)
+        else:
+            loop.call_soon_threadsafe(self._fanout, event)
 
     async def broadcast(self, event: Dict[str, Any]) -> None:
-        """Send an event to all connected clients."""
-        for ws in list(self.connections):
-            if ws.application_state == WebSocketState.CONNECTED:
-                await ws.send_json(event)
-            else:
-                self.connections.remove(ws)
+        """Send an event to the subscribers of its session."""
+        self.publish(event)
 
 
 ws_server = MCPWebSocketServer()
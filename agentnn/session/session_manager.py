@@ -2,31 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 import uuid
-from typing import Any, Dict
+from itertools import groupby
+from typing import Any, Dict, List
 
 from core.model_context import ModelContext, TaskContext
 
-from ..mcp.mcp_client import MCPClient
+from ..mcp.mcp_client import AsyncMCPClient, MCPClient
 from ..mcp.mcp_ws import ws_server
 
+# agents of one priority tier executed at the same time by run_task_async
+MCP_SESSION_CONCURRENCY = int(os.getenv("MCP_SESSION_CONCURRENCY", "8"))
+
 
 class SessionManager:
     """Manage dialog sessions with a pool of agents."""
 
     def __init__(self, endpoint: str = "http://localhost:8090") -> None:
         self.client = MCPClient(endpoint)
+        self.async_client = AsyncMCPClient(endpoint)
         self._sessions: Dict[str, Dict[str, Any]] = {}
 
     def create_session(self) -> str:
         """Return a new session id."""
         sid = str(uuid.uuid4())
         self._sessions[sid] = {"linked_agents": [], "message_history": []}
-        try:
-            # broadcast creation event
-            ws_server.broadcast({"event": "session_created", "session_id": sid})
-        except Exception:
-            pass
+        ws_server.publish({"event": "session_created", "session_id": sid})
         return sid
 
     def add_agent(
@@ -50,12 +53,46 @@ class SessionManager:
                 "exclusive": exclusive,
             }
         )
-        try:
-            ws_server.broadcast(
-                {"event": "agent_added", "session_id": session_id, "agent": agent_id}
-            )
-        except Exception:
-            pass
+        ws_server.publish(
+            {"event": "agent_added", "session_id": session_id, "agent": agent_id}
+        )
+
+    def _agent_context(
+        self, session_id: str, task: str, agent: Dict[str, Any]
+    ) -> ModelContext:
+        return ModelContext(
+            session_id=session_id,
+            task_context=TaskContext(task_type="chat", description=task),
+            agent_selection=agent["id"],
+            mission_role=agent.get("role"),
+        )
+
+    def _record(
+        self,
+        session: Dict[str, Any],
+        session_id: str,
+        task: str,
+        agent: Dict[str, Any],
+        result: Any,
+        error: str | None = None,
+    ) -> None:
+        entry = {
+            "agent": agent["id"],
+            "role": agent.get("role"),
+            "task": task,
+            "result": result,
+        }
+        if error is not None:
+            entry["error"] = error
+        session["message_history"].append(entry)
+        ws_server.publish(
+            {
+                "event": "agent_result",
+                "session_id": session_id,
+                "agent": agent["id"],
+                "result": result,
+            }
+        )
 
     def run_task(self, session_id: str, task: str) -> ModelContext:
         """Execute the task with all linked agents."""
@@ -65,38 +102,65 @@ class SessionManager:
         result_ctx: ModelContext | None = None
         agents = sorted(session["linked_agents"], key=lambda a: a.get("priority", 1))
         for agent in agents:
-            ctx = ModelContext(
-                session_id=session_id,
-                task_context=TaskContext(task_type="chat", description=task),
-                agent_selection=agent["id"],
-                mission_role=agent.get("role"),
-            )
+            ctx = self._agent_context(session_id, task, agent)
             result_ctx = self.client.execute(ctx)
-            session["message_history"].append(
-                {
-                    "agent": agent["id"],
-                    "role": agent.get("role"),
-                    "task": task,
-                    "result": result_ctx.result,
-                }
-            )
-            try:
-                ws_server.broadcast(
-                    {
-                        "event": "agent_result",
-                        "session_id": session_id,
-                        "agent": agent["id"],
-                        "result": result_ctx.result,
-                    }
-                )
-            except Exception:
-                pass
+            self._record(session, session_id, task, agent, result_ctx.result)
             if agent.get("exclusive"):
                 break
         return result_ctx or ModelContext(
             task_context=TaskContext(task_type="chat", description=task)
         )
 
+    async def run_task_async(
+        self,
+        session_id: str,
+        task: str,
+        max_concurrency: int = MCP_SESSION_CONCURRENCY,
+    ) -> ModelContext:
+        """Execute the task with all linked agents without blocking the loop.
+
+        Agents of the same priority run concurrently. Lower priority tiers are
+        skipped once an exclusive agent of a tier has answered. Failed agents
+        are recorded with an ``error``; if no agent answers, the first error
+        is raised.
+        """
+        session = self._sessions.get(session_id)
+        if not session:
+            raise ValueError("unknown session")
+        limit = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def call(agent: Dict[str, Any]) -> ModelContext:
+            async with limit:
+                return await self.async_client.execute(
+                    self._agent_context(session_id, task, agent)
+                )
+
+        result_ctx: ModelContext | None = None
+        errors: List[BaseException] = []
+        agents = sorted(session["linked_agents"], key=lambda a: a.get("priority", 1))
+        for _, tier_iter in groupby(agents, key=lambda a: a.get("priority", 1)):
+            tier = list(tier_iter)
+            results = await asyncio.gather(
+                *(call(agent) for agent in tier), return_exceptions=True
+            )
+            exclusive: ModelContext | None = None
+            for agent, outcome in zip(tier, results):
+                if isinstance(outcome, BaseException):
+                    errors.append(outcome)
+                    self._record(session, session_id, task, agent, None, str(outcome))
+                    continue
+                result_ctx = outcome
+                self._record(session, session_id, task, agent, outcome.result)
+                if agent.get("exclusive") and exclusive is None:
+                    exclusive = outcome
+            if exclusive is not None:
+                return exclusive
+        if result_ctx is None and errors:
+            raise errors[0]
+        return result_ctx or ModelContext(
+            task_context=TaskContext(task_type="chat", description=task)
+        )
+
     def get_session(self, session_id: str) -> Dict[str, Any] | None:
         """Return stored metadata for a session."""
         return self._sessions.get(session_id)
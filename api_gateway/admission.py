@@ -0,0 +1,171 @@
+"""Adaptive concurrency limit and load shedding for gateway routes."""
+
+import math
+import os
+import time
+
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.metrics_utils import CONCURRENCY_LIMIT, SHED_REQUESTS
+
+ADAPTIVE_LIMIT_ENABLED = os.getenv("GATEWAY_ADAPTIVE_LIMIT", "true").lower() == "true"
+LIMIT_INITIAL = float(os.getenv("GATEWAY_LIMIT_INITIAL", "20"))
+LIMIT_MIN = float(os.getenv("GATEWAY_LIMIT_MIN", "2"))
+LIMIT_MAX = float(os.getenv("GATEWAY_LIMIT_MAX", "200"))
+# smoothed latency above baseline * tolerance counts as overload
+LIMIT_TOLERANCE = float(os.getenv("GATEWAY_LIMIT_TOLERANCE", "2.0"))
+
+# share of the limit each class may occupy; interactive traffic is shed last
+PRIORITY_SHARES = {"interactive": 1.0, "standard": 0.8, "bulk": 0.5}
+PRIORITY_ROUTES = {
+    "/chat": "interactive",
+    "/llm/generate": "interactive",
+    "/embed": "bulk",
+}
+EXEMPT_PATHS = {"/metrics", "/health", "/cache/invalidate"}
+# downstream answers that signal overload rather than a bad request
+_OVERLOAD_STATUS = {502, 503, 504}
+
+
+def priority_for(path: str) -> str:
+    """Return the priority class of a gateway ``path``."""
+    for prefix, priority in PRIORITY_ROUTES.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return priority
+    return "standard"
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrent requests driven by observed latency.
+
+    The lowest smoothed latency seen is the no-load baseline. While the
+    smoothed latency stays within ``tolerance`` times the baseline and the
+    limit is in use, it grows by about one per round trip; overload or
+    downstream errors cut it by ``backoff`` at most once per round trip.
+    """
+
+    def __init__(
+        self,
+        initial: float = LIMIT_INITIAL,
+        min_limit: float = LIMIT_MIN,
+        max_limit: float = LIMIT_MAX,
+        tolerance: float = LIMIT_TOLERANCE,
+        backoff: float = 0.9,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.inflight = 0
+        self.latency: float | None = None
+        self.baseline: float | None = None
+        self._last_decrease = 0.0
+
+    def try_acquire(self, priority: str = "standard") -> bool:
+        share = PRIORITY_SHARES.get(priority, PRIORITY_SHARES["standard"])
+        if self.inflight >= max(1.0, self.limit * share):
+            return False
+        self.inflight += 1
+        return True
+
+    def release(self) -> None:
+        self.inflight = max(0, self.inflight - 1)
+
+    def observe(self, latency: float, overloaded: bool = False) -> None:
+        """Adjust the limit after a request took ``latency`` seconds."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+        if self.baseline is None or self.latency < self.baseline:
+            self.baseline = self.latency
+        else:
+            # drift up slowly so a permanently slower backend becomes normal
+            self.baseline += 0.01 * (self.latency - self.baseline)
+        now = time.monotonic()
+        if overloaded or self.latency > self.baseline * self.tolerance:
+            if now - self._last_decrease >= self.latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif self.inflight + 1 >= self.limit / 2:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait before trying again."""
+        return max(1, math.ceil(self.latency or 0))
+
+
+class _ReleaseOnExit:
+    """Send ``response`` and run ``release`` however sending ends.
+
+    A generator ``finally`` around the body is not enough: when the client
+    is gone before the response starts, the body iterator never runs.
+    """
+
+    def __init__(self, response, release) -> None:
+        self.response = response
+        self.release = release
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            self.release()
+
+
+class AdmissionMiddleware(BaseHTTPMiddleware):
+    """Shed requests beyond the adaptive limit with ``503`` and Retry-After.
+
+    Latency is measured until the response starts; streamed bodies keep
+    their slot until they finish.
+    """
+
+    def __init__(
+        self,
+        app,
+        service: str,
+        limiter: AdaptiveLimiter | None = None,
+        enabled: bool = ADAPTIVE_LIMIT_ENABLED,
+    ) -> None:
+        super().__init__(app)
+        self.service = service
+        self.limiter = limiter or AdaptiveLimiter()
+        self.enabled = enabled
+
+    async def dispatch(self, request, call_next):
+        path = request.url.path
+        if not self.enabled or path in EXEMPT_PATHS:
+            return await call_next(request)
+        limiter = self.limiter
+        priority = priority_for(path)
+        if not limiter.try_acquire(priority):
+            SHED_REQUESTS.labels(self.service, priority).inc()
+            return JSONResponse(
+                {"detail": "Overloaded"},
+                status_code=503,
+                headers={"Retry-After": str(limiter.retry_after())},
+            )
+        start = time.monotonic()
+        try:
+            response = await call_next(request)
+        except Exception:
+            limiter.observe(time.monotonic() - start, overloaded=True)
+            limiter.release()
+            CONCURRENCY_LIMIT.labels(self.service).set(limiter.limit)
+            raise
+        limiter.observe(
+            time.monotonic() - start,
+            overloaded=response.status_code in _OVERLOAD_STATUS,
+        )
+        CONCURRENCY_LIMIT.labels(self.service).set(limiter.limit)
+        return _ReleaseOnExit(response, limiter.release)
+
+
+__all__ = ["AdaptiveLimiter", "AdmissionMiddleware", "priority_for"]
@@ -0,0 +1,148 @@
+"""Response cache for read-heavy gateway routes."""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+
+from core.http_cache import etag_for, etag_matches
+
+from .connectors import ServiceConnector
+
+GATEWAY_CACHE_ENABLED = os.getenv("GATEWAY_CACHE_ENABLED", "true").lower() == "true"
+GATEWAY_CACHE_TTL = float(os.getenv("GATEWAY_CACHE_TTL", "2"))
+GATEWAY_CACHE_SIZE = int(os.getenv("GATEWAY_CACHE_SIZE", "1024"))
+# per route overrides, e.g. "agents=10,session_history=2"
+GATEWAY_CACHE_TTLS = os.getenv("GATEWAY_CACHE_TTLS", "agents=5")
+
+
+def _parse_ttls(spec: str) -> Dict[str, float]:
+    ttls: Dict[str, float] = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            ttls[name.strip()] = float(value)
+    return ttls
+
+
+@dataclass
+class CacheEntry:
+    data: Any
+    etag: str
+    backend_etag: str | None
+    expires: float
+    tags: Tuple[str, ...] = field(default_factory=tuple)
+
+
+class ResponseCache:
+    """LRU cache of backend JSON responses with per-route TTLs.
+
+    Entries are keyed by route, path, query and the caller's auth scope.
+    Expired entries are revalidated against the backend with its ETag
+    before they are refetched, and are served stale if the backend fails.
+    """
+
+    def __init__(
+        self,
+        size: int = GATEWAY_CACHE_SIZE,
+        default_ttl: float = GATEWAY_CACHE_TTL,
+        ttls: Dict[str, float] | None = None,
+        enabled: bool = GATEWAY_CACHE_ENABLED,
+    ) -> None:
+        self.size = size
+        self.default_ttl = default_ttl
+        self.ttls = _parse_ttls(GATEWAY_CACHE_TTLS) if ttls is None else ttls
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def ttl(self, route: str) -> float:
+        return self.ttls.get(route, self.default_ttl)
+
+    @staticmethod
+    def key(route: str, request: Request, scope: Hashable) -> Hashable:
+        query = tuple(sorted(request.query_params.multi_items()))
+        return (route, request.url.path, query, scope)
+
+    def _store(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop entries carrying any of ``tags``; return how many."""
+        wanted = set(tags)
+        stale = [k for k, e in self._entries.items() if wanted.intersection(e.tags)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _load(
+        self, key: Hashable, route: str, conn: ServiceConnector, path: str, tags
+    ) -> CacheEntry:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > now:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        try:
+            data, backend_etag = await conn.revalidate(
+                path, entry.backend_etag if entry else None
+            )
+        except HTTPException:
+            if entry is None:
+                raise
+            # stale if error: keep serving the last good copy
+            return entry
+        if data is None and entry is not None:
+            self.revalidated += 1
+            entry.expires = now + self.ttl(route)
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        body = json.dumps(data, sort_keys=True, default=str).encode()
+        entry = CacheEntry(
+            data=data,
+            etag=etag_for(body),
+            backend_etag=backend_etag,
+            expires=now + self.ttl(route),
+            tags=tuple(tags),
+        )
+        self._store(key, entry)
+        return entry
+
+    async def respond(
+        self,
+        route: str,
+        request: Request,
+        scope: Hashable,
+        conn: ServiceConnector,
+        path: str,
+        tags: Iterable[str] = (),
+    ) -> Response:
+        """Serve ``path`` of ``conn`` for ``request`` through the cache."""
+        if not self.enabled:
+            return JSONResponse(await conn.get(path))
+        entry = await self._load(self.key(route, request, scope), route, conn, path, tags)
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"private, max-age={int(self.ttl(route))}",
+        }
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(entry.data, headers=headers)
+
+
+__all__ = ["ResponseCache", "CacheEntry"]
@@ -1,41 +1,374 @@
 import asyncio
+import hashlib
+import json as jsonlib
 import os
-from typing import Any, Optional
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 import httpx
 from fastapi import HTTPException
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.tracing import traced
+
+BREAKER_FAILURES = int(os.getenv("CONNECTOR_BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("CONNECTOR_BREAKER_RESET", "30"))
+HEDGE_ENABLED = os.getenv("CONNECTOR_HEDGE", "false").lower() == "true"
+HEDGE_MIN_SAMPLES = int(os.getenv("CONNECTOR_HEDGE_MIN_SAMPLES", "20"))
+# remaining time budget in seconds, sent to and read from other services
+DEADLINE_HEADER = "X-Request-Timeout"
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_budget(seconds: float | None) -> Iterator[None]:
+    """Limit connector calls in this context to ``seconds`` from now.
+
+    An enclosing, earlier deadline is kept.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + max(0.0, seconds)
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> float | None:
+    """Seconds left until the current deadline or ``None`` without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class DeadlineMiddleware(BaseHTTPMiddleware):
+    """Adopt the caller's ``X-Request-Timeout`` budget for the request."""
+
+    async def dispatch(self, request, call_next):
+        try:
+            budget = float(request.headers[DEADLINE_HEADER])
+        except (KeyError, ValueError):
+            budget = None
+        with deadline_budget(budget):
+            return await call_next(request)
+
+
+class CircuitBreaker:
+    """Per-downstream breaker: closed, open and half-open with one probe."""
+
+    def __init__(
+        self, failures: int = BREAKER_FAILURES, reset_timeout: float = BREAKER_RESET
+    ) -> None:
+        self.failure_threshold = failures
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def release(self) -> None:
+        """Give up a probe slot without a verdict, e.g. on cancellation."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(base_url: str) -> CircuitBreaker:
+    """Return the breaker shared by all connectors of ``base_url``."""
+    return _breakers.setdefault(base_url, CircuitBreaker())
+
+
+class _Admission:
+    """One call admitted by a breaker.
+
+    A half-open probe that ends without :meth:`success` or :meth:`failure`,
+    e.g. through cancellation or an unexpected exception, gives its slot
+    back on exit so the breaker cannot stay half-open for good.
+    """
+
+    def __init__(self, breaker: CircuitBreaker) -> None:
+        self.breaker = breaker
+        self.probe = False
+        self.decided = False
+
+    def __enter__(self) -> "_Admission":
+        self.probe = self.breaker.state == "half_open"
+        if not self.breaker.allow():
+            raise HTTPException(status_code=503, detail="CircuitOpen")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.probe and not self.decided:
+            self.breaker.release()
+
+    def success(self) -> None:
+        self.decided = True
+        self.breaker.record_success()
+
+    def failure(self) -> None:
+        self.decided = True
+        self.breaker.record_failure()
+
+
+class _Flight:
+    """A shared backend call and the number of callers waiting for it."""
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+def _flight_key(method: str, path: str, json: Optional[dict]) -> str:
+    body = b"" if json is None else jsonlib.dumps(json, sort_keys=True).encode()
+    return f"{method} {path} {hashlib.sha256(body).hexdigest()}"
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, error: httpx.HTTPStatusError) -> None:
+        super().__init__(str(error))
+        self.error = error
 
 
 class ServiceConnector:
-    """Helper for internal service requests with retry and timeout."""
+    """Helper for internal service requests.
+
+    Requests are retried with backoff within the caller's deadline and
+    fail fast while the downstream's circuit breaker is open. Identical
+    concurrent GETs share one backend call, and each caller waits for it
+    only within its own deadline; with ``hedge`` enabled a second GET is
+    started once the first exceeds the observed p95 latency.
+    """
 
     def __init__(
-        self, base_url: str, timeout: float | None = None, retries: int = 2
+        self,
+        base_url: str,
+        timeout: float | None = None,
+        retries: int = 2,
+        hedge: bool = HEDGE_ENABLED,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         default_timeout = float(os.getenv("TIMEOUT_DEFAULT", "10"))
         self.timeout = timeout or default_timeout
         self.retries = retries
-        self.client = httpx.AsyncClient()
+        self.hedge = hedge
+        self.breaker = breaker_for(self.base_url)
+        self.latencies: deque[float] = deque(maxlen=200)
+        self._inflight: Dict[str, _Flight] = {}
+        self.client = traced(httpx.AsyncClient())
 
-    async def request(self, method: str, path: str, json: Optional[dict] = None) -> Any:
+    def _p95(self) -> float | None:
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _budget(self) -> float:
+        remaining = remaining_budget()
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            raise HTTPException(status_code=504, detail="DeadlineExceeded")
+        return min(self.timeout, remaining)
+
+    async def _send(
+        self, method: str, url: str, json: Optional[dict], timeout: float
+    ) -> Any:
+        headers = {}
+        if remaining_budget() is not None:
+            headers[DEADLINE_HEADER] = f"{timeout:.3f}"
+        start = time.monotonic()
+        resp = await self.client.request(
+            method, url, json=json, timeout=timeout, headers=headers or None
+        )
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if resp.status_code >= 500:
+                raise _RetryableStatus(exc) from exc
+            raise
+        self.latencies.append(time.monotonic() - start)
+        return resp.json()
+
+    async def _attempt(
+        self, method: str, url: str, json: Optional[dict], timeout: float
+    ) -> Any:
+        delay = self._p95() if self.hedge and method == "GET" else None
+        if delay is None or delay >= timeout:
+            return await self._send(method, url, json, timeout)
+        first = asyncio.ensure_future(self._send(method, url, json, timeout))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        second = asyncio.ensure_future(
+            self._send(method, url, json, max(0.001, timeout - delay))
+        )
+        pending = {first, second}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(self, method: str, path: str, json: Optional[dict]) -> Any:
         url = f"{self.base_url}{path}"
         for attempt in range(self.retries + 1):
-            try:
-                resp = await self.client.request(
-                    method, url, json=json, timeout=self.timeout
-                )
-                resp.raise_for_status()
-                return resp.json()
-            except (httpx.RequestError, httpx.HTTPStatusError) as exc:
-                if attempt >= self.retries:
+            timeout = self._budget()
+            with _Admission(self.breaker) as admission:
+                try:
+                    result = await self._attempt(method, url, json, timeout)
+                except httpx.HTTPStatusError as exc:
+                    # client errors are not the downstream's fault; no retry
+                    admission.success()
                     raise HTTPException(
                         status_code=503, detail="ServiceUnavailable"
                     ) from exc
-                await asyncio.sleep(0.2 * (attempt + 1))
+                except (httpx.RequestError, _RetryableStatus) as exc:
+                    admission.failure()
+                    backoff = 0.2 * (attempt + 1)
+                    remaining = remaining_budget()
+                    if attempt >= self.retries or (
+                        remaining is not None and remaining <= backoff
+                    ):
+                        raise HTTPException(
+                            status_code=503, detail="ServiceUnavailable"
+                        ) from exc
+                else:
+                    admission.success()
+                    return result
+            await asyncio.sleep(backoff)
+
+    async def _shared(self, method: str, path: str, json: Optional[dict]) -> Any:
+        # the shared call outlives callers with short deadlines; each caller
+        # applies its own deadline while waiting in request()
+        _deadline.set(None)
+        return await self._request(method, path, json)
+
+    async def request(self, method: str, path: str, json: Optional[dict] = None) -> Any:
+        if method != "GET":
+            return await self._request(method, path, json)
+        # single flight: concurrent identical GETs share one backend call
+        key = _flight_key(method, path, json)
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._shared(method, path, json)))
+            self._inflight[key] = flight
+            flight.future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise HTTPException(status_code=504, detail="DeadlineExceeded")
+        flight.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.future), remaining)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="DeadlineExceeded") from None
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.future.done():
+                flight.future.cancel()
 
     async def get(self, path: str) -> Any:
         return await self.request("GET", path)
 
+    async def revalidate(
+        self, path: str, etag: str | None = None
+    ) -> tuple[Any | None, str | None]:
+        """Conditional GET of ``path``.
+
+        Returns ``(None, etag)`` if the backend answered 304 for ``etag`` and
+        ``(data, new_etag)`` otherwise. Not retried: callers hold a cached copy.
+        """
+        timeout = self._budget()
+        headers = {"If-None-Match": etag} if etag else None
+        with _Admission(self.breaker) as admission:
+            try:
+                resp = await self.client.request(
+                    "GET", f"{self.base_url}{path}", timeout=timeout, headers=headers
+                )
+                if resp.status_code == 304:
+                    admission.success()
+                    return None, etag
+                resp.raise_for_status()
+            except (httpx.RequestError, httpx.HTTPStatusError) as exc:
+                if (
+                    isinstance(exc, httpx.RequestError)
+                    or exc.response.status_code >= 500
+                ):
+                    admission.failure()
+                else:
+                    admission.success()
+                raise HTTPException(
+                    status_code=503, detail="ServiceUnavailable"
+                ) from exc
+            admission.success()
+            return resp.json(), resp.headers.get("ETag")
+
     async def post(self, path: str, json: dict) -> Any:
         return await self.request("POST", path, json=json)
+
+    async def stream(
+        self, method: str, path: str, json: Optional[dict] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield the raw response body of ``path`` as it arrives.
+
+        Streams are not retried since chunks may already have been forwarded.
+        """
+        timeout = self._budget()
+        url = f"{self.base_url}{path}"
+        with _Admission(self.breaker) as admission:
+            try:
+                async with self.client.stream(
+                    method, url, json=json, timeout=timeout
+                ) as resp:
+                    resp.raise_for_status()
+                    admission.success()
+                    async for chunk in resp.aiter_bytes():
+                        yield chunk
+            except (httpx.RequestError, httpx.HTTPStatusError) as exc:
+                admission.failure()
+                raise HTTPException(
+                    status_code=503, detail="ServiceUnavailable"
+                ) from exc
@@ -1,13 +1,19 @@
+import hashlib
 import os
+import time
 from fastapi import FastAPI, Request, HTTPException
 from utils.api_utils import api_route
-from .connectors import ServiceConnector
+from .admission import AdmissionMiddleware
+from .cache import ResponseCache
+from .connectors import DeadlineMiddleware, ServiceConnector
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi.responses import Response, StreamingResponse
 
 from core.logging_utils import LoggingMiddleware, exception_handler, init_logging
 from core.metrics_utils import MetricsMiddleware, metrics_router
+from core.rate_limit import RateLimiter, header_identity
+from core.tracing import TracingMiddleware
+from core.stream_utils import SSE_MEDIA_TYPE, sse_event
 from jose import JWTError, jwt
 
 
@@ -25,12 +31,13 @@ RATE_LIMIT = os.getenv("RATE_LIMIT", "60/minute")
 CORS_ALLOW_ORIGINS = os.getenv("CORS_ALLOW_ORIGINS", "*")
 
 logger = init_logging("api_gateway")
-limiter = Limiter(key_func=get_remote_address, default_limits=[RATE_LIMIT])
 app = FastAPI(title="API Gateway")
 app.add_middleware(LoggingMiddleware, logger=logger)
 app.add_middleware(MetricsMiddleware, service="api_gateway")
+app.add_middleware(TracingMiddleware, service="api_gateway")
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(AdmissionMiddleware, service="api_gateway")
 app.add_exception_handler(Exception, exception_handler(logger))
-app.state.limiter = limiter
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ALLOW_ORIGINS.split(","),
@@ -45,13 +52,54 @@ session_conn = ServiceConnector(SESSION_MANAGER_URL)
 llm_conn = ServiceConnector(LLM_GATEWAY_URL)
 registry_conn = ServiceConnector(AGENT_REGISTRY_URL)
 vector_conn = ServiceConnector(VECTOR_STORE_URL)
+response_cache = ResponseCache()
+
+# decoded JWT payloads by token; entries are dropped once the token expires
+_token_cache: dict[str, dict] = {}
+_TOKEN_CACHE_SIZE = 1024
 
 
 def _decode_token(token: str) -> dict | None:
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp") is None or payload["exp"] > time.time():
+            return payload
+        _token_cache.pop(token, None)
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except JWTError:  # pragma: no cover - invalid tokens
         return None
+    if len(_token_cache) >= _TOKEN_CACHE_SIZE:
+        _token_cache.clear()
+    _token_cache[token] = payload
+    return payload
+
+
+def _cache_scope(request: Request) -> str:
+    """Return a key separating cached responses of different callers."""
+    if not API_AUTH_ENABLED:
+        return "public"
+    credential = request.headers.get("Authorization") or request.headers.get(
+        "X-API-Key", ""
+    )
+    return hashlib.sha256(credential.encode()).hexdigest()[:16]
+
+
+def _identity(request: Request) -> tuple[str | None, str | None]:
+    """Return user and tenant for quotas from verified JWT claims.
+
+    Unauthenticated callers fall back to :func:`header_identity`, which
+    only trusts identity headers from internal callers.
+    """
+    token = request.headers.get("Authorization")
+    if API_AUTH_ENABLED and token and token.startswith("Bearer "):
+        payload = _decode_token(token.split()[1]) or {}
+        if payload.get("sub"):
+            return payload["sub"], payload.get("tenant")
+    return header_identity(request)
+
+
+limiter = RateLimiter(identify=_identity)
 
 
 def check_scope(request: Request, scope: str) -> None:
@@ -98,15 +146,54 @@ async def chat(request: Request) -> dict:
         "session_id": sid,
     }
     result = await dispatcher_conn.post("/task", data)
+    response_cache.invalidate([f"session:{sid}"])
     return {"session_id": sid, **result}
 
 
+@api_route(version="dev")  # \U0001F6A7 experimental
+@app.post("/chat/stream")
+@limiter.limit(RATE_LIMIT)
+async def chat_stream(request: Request) -> StreamingResponse:
+    """Stream chat tokens from the dispatcher as server-sent events."""
+    check_scope(request, "chat:write")
+    payload = await request.json()
+    sid = payload.get("session_id")
+    if not sid:
+        resp = await session_conn.post("/start_session", {})
+        sid = resp.get("session_id")
+
+    data = {
+        "task_type": "chat",
+        "input": payload.get("message", ""),
+        "session_id": sid,
+    }
+
+    async def events():
+        yield sse_event("session", {"session_id": sid}).encode()
+        # the response has started, so failures can only be reported in-band
+        try:
+            async for chunk in dispatcher_conn.stream("POST", "/task/stream", data):
+                yield chunk
+        except HTTPException as exc:
+            logger.warning("chat_stream_error", session_id=sid, error=str(exc.detail))
+            yield sse_event("error", {"error": exc.detail}).encode()
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE)
+
+
 @api_route(version="dev")  # \U0001F6A7 experimental
 @app.get("/chat/history/{sid}")
 @limiter.limit(RATE_LIMIT)
-async def chat_history(sid: str, request: Request) -> dict:
+async def chat_history(sid: str, request: Request) -> Response:
     check_scope(request, "chat:read")
-    return await session_conn.get(f"/context/{sid}")
+    return await response_cache.respond(
+        "chat_history",
+        request,
+        _cache_scope(request),
+        session_conn,
+        f"/context/{sid}",
+        tags=[f"session:{sid}"],
+    )
 
 
 @api_route(version="dev")  # \U0001F6A7 experimental
@@ -116,7 +203,9 @@ async def chat_feedback(request: Request) -> dict:
     check_scope(request, "feedback:write")
     payload = await request.json()
     sid = payload.get("session_id")
-    return await session_conn.post(f"/session/{sid}/feedback", payload)
+    result = await session_conn.post(f"/session/{sid}/feedback", payload)
+    response_cache.invalidate([f"session:{sid}"])
+    return result
 
 
 @api_route(version="dev")
@@ -131,19 +220,37 @@ async def start_session_route(request: Request) -> dict:
 @api_route(version="dev")
 @app.get("/sessions/{sid}/history")
 @limiter.limit(RATE_LIMIT)
-async def session_history_route(sid: str, request: Request) -> dict:
+async def session_history_route(sid: str, request: Request) -> Response:
     """Return conversation history for a session."""
     check_scope(request, "session:read")
-    return await session_conn.get(f"/context/{sid}")
+    return await response_cache.respond(
+        "session_history",
+        request,
+        _cache_scope(request),
+        session_conn,
+        f"/context/{sid}",
+        tags=[f"session:{sid}"],
+    )
 
 
 @api_route(version="dev")
 @app.get("/agents")
 @limiter.limit(RATE_LIMIT)
-async def list_agents_route(request: Request) -> dict:
+async def list_agents_route(request: Request) -> Response:
     """List available agents."""
     check_scope(request, "agents:read")
-    return await registry_conn.get("/agents")
+    return await response_cache.respond(
+        "agents", request, _cache_scope(request), registry_conn, "/agents", ["agents"]
+    )
+
+
+@api_route(version="dev")
+@app.post("/cache/invalidate")
+async def cache_invalidate_route(request: Request) -> dict:
+    """Drop cached responses tagged by a backend write."""
+    check_scope(request, "cache:write")
+    payload = await request.json()
+    return {"invalidated": response_cache.invalidate(payload.get("tags", []))}
 
 
 @api_route(version="dev")
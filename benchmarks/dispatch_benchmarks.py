@@ -0,0 +1,403 @@
+"""End-to-end benchmarks for the task dispatch path.
+
+The registry, session manager, coalition manager, coordinator, workers,
+LLM gateway and vector store are replaced by in-process stand-ins behind
+an ``httpx.MockTransport``. The real ``TaskDispatcherService`` and
+``AgentCoordinatorService`` code runs unchanged, including request and
+response serialization, governance checks and audit writes.
+
+Example::
+
+    python -m benchmarks.dispatch_benchmarks --modes single,parallel \\
+        --requests 200 --concurrency 8 --worker-latency-ms 20 \\
+        --out bench.json --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from unittest import mock
+
+import httpx
+
+from core.utils.latency import compare_summary, percentile
+
+MODES = ("single", "parallel", "voting", "orchestrated", "coalition")
+
+REGISTRY = "http://registry.bench"
+SESSIONS = "http://sessions.bench"
+COORDINATOR = "http://coordinator.bench"
+COALITIONS = "http://coalitions.bench"
+LLM = "http://llm.bench"
+VECTOR = "http://vector.bench"
+ROUTING = "http://routing.bench"
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in services."""
+
+    agents: int = 4
+    worker_latency_ms: float = 5.0
+    worker_jitter_ms: float = 1.0
+    llm_latency_ms: float = 5.0
+    payload_bytes: int = 1024
+    history_length: int = 5
+    worker: str = "stub"  # "stub" or "sample" (real SampleAgentService)
+    roles: List[str] = field(
+        default_factory=lambda: ["writer", "retriever", "summarizer", "critic"]
+    )
+
+
+@dataclass
+class BenchResult:
+    mode: str
+    requests: int
+    concurrency: int
+    errors: int
+    duration: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+
+
+def _sleep(ms: float, jitter_ms: float = 0.0) -> None:
+    delay = ms + (random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+    if delay > 0:
+        time.sleep(delay / 1000)
+
+
+class StubServices:
+    """Route ``httpx`` requests to in-process stand-ins."""
+
+    def __init__(self, config: StubConfig) -> None:
+        from services.agent_coordinator.service import AgentCoordinatorService
+
+        self.config = config
+        self.coordinator = AgentCoordinatorService()
+        self.agents = [
+            {
+                "id": f"agent{i}",
+                "name": f"bench_agent{i}",
+                "role": config.roles[i % len(config.roles)],
+                "url": f"http://worker{i}.bench",
+                "capabilities": ["bench"],
+                "skills": [],
+                "load_factor": i / max(config.agents, 1),
+                "estimated_cost_per_token": 0.001 * (i + 1),
+            }
+            for i in range(config.agents)
+        ]
+        self.history = [
+            {
+                "agent_selection": "agent0",
+                "metrics": {"tokens_used": 10},
+                "memory": [],
+            }
+            for _ in range(config.history_length)
+        ]
+        self.payload = "x" * config.payload_bytes
+        self.sample = None
+        if config.worker == "sample":
+            from services.agent_worker.sample_agent.service import SampleAgentService
+
+            self.sample = SampleAgentService(llm_url=LLM, vector_url=VECTOR)
+
+    # -- handlers ------------------------------------------------------------
+    def _worker(self, request: httpx.Request) -> httpx.Response:
+        from core.model_context import ModelContext
+
+        if request.url.path.endswith("/vote"):
+            _sleep(self.config.worker_latency_ms, self.config.worker_jitter_ms)
+            return httpx.Response(200, json={"score": random.random(), "feedback": "ok"})
+        ctx = ModelContext.model_validate_json(request.content)
+        if self.sample is not None:
+            ctx = self.sample.run(ctx)
+        else:
+            _sleep(self.config.worker_latency_ms, self.config.worker_jitter_ms)
+            ctx.result = self.payload
+            ctx.metrics = {"tokens_used": len(self.payload) // 4}
+        return httpx.Response(200, content=ctx.model_dump_json())
+
+    def _coordinator(self, request: httpx.Request) -> httpx.Response:
+        from core.model_context import ModelContext
+
+        data = json.loads(request.content)
+        ctx = ModelContext(**data["context"])
+        ctx = self.coordinator.coordinate(ctx, data.get("mode", "parallel"))
+        return httpx.Response(200, content=ctx.model_dump_json())
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        base = f"{request.url.scheme}://{request.url.host}"
+        path = request.url.path
+        if base == REGISTRY:
+            if path == "/agents":
+                return httpx.Response(200, json={"agents": self.agents})
+            return httpx.Response(200, json={"status": "ok"})
+        if base == SESSIONS:
+            return httpx.Response(200, json={"context": self.history})
+        if base == COORDINATOR:
+            return self._coordinator(request)
+        if base == COALITIONS:
+            if path.endswith("/init"):
+                return httpx.Response(200, json={"id": "bench-coalition"})
+            return httpx.Response(200, json={"status": "ok"})
+        if base == LLM:
+            _sleep(self.config.llm_latency_ms)
+            return httpx.Response(
+                200,
+                json={
+                    "completion": self.payload,
+                    "tokens_used": len(self.payload) // 4,
+                    "provider": "bench",
+                },
+            )
+        if base == VECTOR:
+            return httpx.Response(200, json={"matches": []})
+        if request.url.host.endswith(".bench"):
+            return self._worker(request)
+        return httpx.Response(404)
+
+    @contextmanager
+    def installed(self) -> Iterator[None]:
+        """Send every ``httpx.Client`` request to the stand-ins."""
+        original = httpx.Client
+        transport = httpx.MockTransport(self.handle)
+
+        def client(*args: Any, **kwargs: Any) -> httpx.Client:
+            kwargs["transport"] = transport
+            return original(*args, **kwargs)
+
+        httpx.Client = client  # type: ignore[assignment]
+        try:
+            yield
+        finally:
+            httpx.Client = original  # type: ignore[assignment]
+
+
+def _prepare_governance(stubs: StubServices) -> None:
+    """Create contracts, and delegations for roles that may not submit tasks."""
+    from core.access_control import is_authorized
+    from core.agent_profile import AgentIdentity
+    from core.delegation import grant_delegation
+    from core.governance import AgentContract
+
+    AgentIdentity(
+        name="sample_agent",
+        role="writer",
+        traits={},
+        skills=[],
+        memory_index=None,
+        created_at="bench",
+    ).save()
+    for agent in stubs.agents:
+        AgentContract(
+            agent=agent["name"],
+            allowed_roles=[agent["role"]],
+            max_tokens=0,
+            trust_level_required=0.0,
+            constraints={},
+        ).save()
+        if not is_authorized(agent["name"], agent["role"], "submit_task", "bench"):
+            grant_delegation("bench_admin", agent["name"], agent["role"], "permanent")
+
+
+def run_mode(
+    mode: str,
+    requests: int,
+    concurrency: int,
+    config: StubConfig,
+    session_id: str | None = "bench-session",
+) -> BenchResult:
+    """Dispatch ``requests`` tasks in ``mode`` and collect latencies."""
+    from core.model_context import TaskContext
+    from services.task_dispatcher.service import TaskDispatcherService
+
+    stubs = StubServices(config)
+    _prepare_governance(stubs)
+    dispatcher = TaskDispatcherService(
+        registry_url=REGISTRY,
+        session_url=SESSIONS,
+        coordinator_url=COORDINATOR,
+        coalition_url=COALITIONS,
+        routing_url=ROUTING,
+    )
+
+    def one(i: int) -> tuple[float, bool]:
+        task = TaskContext(task_type="bench", description=f"benchmark task {i}")
+        start = time.perf_counter()
+        try:
+            ctx = dispatcher.dispatch_task(task, session_id=session_id, mode=mode)
+            ok = ctx.result is not None or ctx.aggregated_result is not None
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with stubs.installed():
+        one(-1)  # warm up imports and caches
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one, range(requests)))
+        duration = time.perf_counter() - start
+
+    latencies = [s[0] * 1000 for s in samples]
+    return BenchResult(
+        mode=mode,
+        requests=requests,
+        concurrency=concurrency,
+        errors=sum(1 for _, ok in samples if not ok),
+        duration=round(duration, 4),
+        throughput=round(requests / duration if duration else 0.0, 2),
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        mean_ms=round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+    )
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.1
+) -> List[str]:
+    """Return regressions of ``results`` against ``baseline`` per mode.
+
+    See :func:`core.utils.latency.compare_summary` for the thresholds.
+    """
+    regressions: List[str] = []
+    base_modes = {r["mode"]: r for r in baseline.get("results", [])}
+    for current in results.get("results", []):
+        base = base_modes.get(current["mode"])
+        if not base:
+            continue
+        regressions.extend(
+            f"{current['mode']}: {regression}"
+            for regression in compare_summary(base, current, tolerance)
+        )
+    return regressions
+
+
+@contextmanager
+def workspace(workdir: Path) -> Iterator[None]:
+    """Keep files written by the dispatch path below ``workdir``.
+
+    Contracts, profiles, delegations, feedback and audit logs go to
+    ``workdir``; signature checks and tracing are off. Everything is
+    restored on exit and the working directory is left alone.
+    """
+    import core.agent_profile
+    import core.audit_log
+    import core.delegation
+    import core.feedback_loop
+    import core.governance
+    import core.tracing
+
+    record_feedback = functools.partial(
+        core.feedback_loop.record_feedback, base_dir=str(workdir / "feedback_loops")
+    )
+    audit_defaults = (str(workdir / "audit"),)
+    with ExitStack() as stack:
+        stack.enter_context(
+            mock.patch.dict(os.environ, {"DISABLE_SIGNATURE_VALIDATION": "true"})
+        )
+        for target, name, value in (
+            (core.governance, "CONTRACT_DIR", workdir / "contracts"),
+            (core.agent_profile, "PROFILE_DIR", workdir / "agent_profiles"),
+            (core.delegation, "DELEGATION_DIR", workdir / "delegations"),
+            (core.feedback_loop, "record_feedback", record_feedback),
+            (core.tracing, "TRACING_ENABLED", False),
+            # AuditLog() creates its directory on construction
+            (core.audit_log.AuditLog.__init__, "__defaults__", audit_defaults),
+        ):
+            stack.enter_context(mock.patch.object(target, name, value))
+        yield
+
+
+def run_suite(
+    modes: List[str],
+    requests: int,
+    concurrency: int,
+    config: StubConfig,
+    workdir: Optional[Path] = None,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> Dict[str, Any]:
+    """Run all ``modes`` with their files in ``workdir`` and return the report."""
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="agentnn-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    results = []
+    with workspace(workdir):
+        for mode in modes:
+            result = run_mode(mode, requests, concurrency, config)
+            if progress:
+                progress(result)
+            results.append(asdict(result))
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": asdict(config),
+        "results": results,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--worker-latency-ms", type=float, default=5.0)
+    parser.add_argument("--worker-jitter-ms", type=float, default=1.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=5.0)
+    parser.add_argument("--payload-bytes", type=int, default=1024)
+    parser.add_argument("--history", type=int, default=5)
+    parser.add_argument("--worker", choices=["stub", "sample"], default="stub")
+    parser.add_argument("--workdir", type=Path)
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    config = StubConfig(
+        agents=args.agents,
+        worker_latency_ms=args.worker_latency_ms,
+        worker_jitter_ms=args.worker_jitter_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        payload_bytes=args.payload_bytes,
+        history_length=args.history,
+        worker=args.worker,
+    )
+    report = run_suite(
+        modes,
+        args.requests,
+        args.concurrency,
+        config,
+        args.workdir,
+        progress=lambda r: print(json.dumps(asdict(r)), file=sys.stderr),
+    )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        report["regressions"] = compare(report, baseline, args.tolerance)
+    output = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(output)
+    print(output)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entry point
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Benchmark HybridMatcher.match_task by agent count.
+
+``batched`` runs the matcher as shipped. ``per_agent`` is the previous
+approach, kept here as the baseline: one forward pass and ``.item()`` per
+agent, then a linear search for each agent's score. Event logging is
+switched off so both modes time scoring only.
+
+Example::
+
+    python -m benchmarks.matching_benchmarks --agents 10,100,1000 \\
+        --out matching.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import torch
+
+from managers.hybrid_matcher import HybridMatcher
+
+MODES = ("per_agent", "batched")
+
+
+@dataclass
+class MatchingResult:
+    mode: str
+    agents: int
+    median_ms: float
+
+
+def _agents(count: int, matcher: HybridMatcher) -> Dict[str, Dict[str, torch.Tensor]]:
+    gen = torch.Generator().manual_seed(0)
+    return {
+        f"agent{i}": {
+            "embedding": torch.randn(1, matcher.embedding_size, generator=gen),
+            "features": torch.randn(1, matcher.feature_size, generator=gen),
+        }
+        for i in range(count)
+    }
+
+
+def _per_agent(
+    matcher: HybridMatcher,
+    task_embedding: torch.Tensor,
+    agents: Dict[str, Dict[str, torch.Tensor]],
+) -> List[str]:
+    meta = matcher.meta_learner
+    scores = []
+    for name, data in agents.items():
+        with torch.no_grad():
+            scores.append((name, meta(task_embedding, data["features"]).item()))
+    ranked = []
+    for name, data in agents.items():
+        similarity = matcher._calculate_similarity(task_embedding, data["embedding"])
+        nn_score = next((s for n, s in scores if n == name), 0.0)
+        ranked.append((matcher._combine_scores(similarity, nn_score, name), name))
+    ranked.sort(reverse=True)
+    return [name for _, name in ranked]
+
+
+def _batched(
+    matcher: HybridMatcher,
+    task_embedding: torch.Tensor,
+    agents: Dict[str, Dict[str, torch.Tensor]],
+) -> List[str]:
+    return [r.agent_name for r in matcher.match_task("bench", task_embedding, agents)]
+
+
+RUNNERS: Dict[str, Callable] = {"per_agent": _per_agent, "batched": _batched}
+
+
+def measure(mode: str, agents: int, repeats: int = 5) -> MatchingResult:
+    """Return the median time of one match for a mode and agent count."""
+    matcher = HybridMatcher()
+    matcher.meta_learner.eval()
+    matcher.log_event = lambda *args, **kwargs: None
+    data = _agents(agents, matcher)
+    task_embedding = torch.randn(1, matcher.embedding_size)
+    run = RUNNERS[mode]
+    run(matcher, task_embedding, data)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run(matcher, task_embedding, data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return MatchingResult(mode, agents, statistics.median(timings))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", default="10,100,1000")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    results = []
+    for count in (int(a) for a in args.agents.split(",")):
+        for mode in modes:
+            result = measure(mode, count, repeats=args.repeats)
+            results.append(result)
+            print(json.dumps(asdict(result)), file=sys.stderr)
+    print(f"{'agents':>8} " + " ".join(f"{m:>12}" for m in modes))
+    for count in dict.fromkeys(r.agents for r in results):
+        row = {r.mode: r for r in results if r.agents == count}
+        cells = [f"{row[m].median_ms:.2f}ms" for m in modes]
+        print(f"{count:>8} " + " ".join(f"{c:>12}" for c in cells))
+    if args.out:
+        args.out.write_text(json.dumps([asdict(r) for r in results], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
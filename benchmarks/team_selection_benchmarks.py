@@ -0,0 +1,110 @@
+"""Benchmark team selection time of MultiAgentQLearner by agent count.
+
+Each learner is trained on random teams first, so the Q-values it selects
+from are populated. Exhaustive selection is skipped once the number of
+combinations exceeds ``--max-combinations``.
+
+Example::
+
+    python -m benchmarks.team_selection_benchmarks --agents 10,50,150 \\
+        --team-size 3 --out team_selection.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+from core.model_context import TaskContext
+from training.reinforcement_learning import SELECTION_MODES, MultiAgentQLearner
+
+
+@dataclass
+class SelectionResult:
+    selection: str
+    agents: int
+    team_size: int
+    median_ms: float | None
+    skipped: bool = False
+
+
+def _train(
+    learner: MultiAgentQLearner, task: TaskContext, agents: List[str], rounds: int
+) -> None:
+    rng = random.Random(0)
+    for _ in range(rounds):
+        team = tuple(sorted(rng.sample(agents, learner.team_size)))
+        learner.learn_team(task, team, reward=rng.random())
+
+
+def measure(
+    selection: str,
+    agents: int,
+    team_size: int,
+    repeats: int = 5,
+    train_rounds: int = 200,
+    max_combinations: int = 200_000,
+) -> SelectionResult:
+    """Return the median selection time for one mode and agent count."""
+    if selection == "exhaustive" and math.comb(agents, team_size) > max_combinations:
+        return SelectionResult(selection, agents, team_size, None, skipped=True)
+    names = [f"agent{i}" for i in range(agents)]
+    learner = MultiAgentQLearner(epsilon=0.0, team_size=team_size, selection=selection)
+    task = TaskContext(task_type="bench")
+    _train(learner, task, names, train_rounds)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        learner.select_team(task, names)
+        timings.append((time.perf_counter() - start) * 1000)
+    return SelectionResult(selection, agents, team_size, statistics.median(timings))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", default="5,10,20,50,100,150")
+    parser.add_argument("--team-size", type=int, default=3)
+    parser.add_argument("--modes", default=",".join(SELECTION_MODES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-combinations", type=int, default=200_000)
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(SELECTION_MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    results = []
+    for count in (int(a) for a in args.agents.split(",")):
+        for mode in modes:
+            result = measure(
+                mode,
+                count,
+                args.team_size,
+                repeats=args.repeats,
+                max_combinations=args.max_combinations,
+            )
+            results.append(result)
+            print(json.dumps(asdict(result)), file=sys.stderr)
+    print(f"{'agents':>8} " + " ".join(f"{m:>12}" for m in modes))
+    for count in dict.fromkeys(r.agents for r in results):
+        row = {r.selection: r for r in results if r.agents == count}
+        cells = [
+            "skipped" if row[m].skipped else f"{row[m].median_ms:.2f}ms" for m in modes
+        ]
+        print(f"{count:>8} " + " ".join(f"{c:>12}" for c in cells))
+    if args.out:
+        args.out.write_text(json.dumps([asdict(r) for r in results], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
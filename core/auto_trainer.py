@@ -1,36 +1,140 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
 
 from services.session_manager.service import SessionManagerService
+from .session_store import FileSessionStore
 from .training.weights import accumulate_weights
 
 logger = logging.getLogger(__name__)
 
+AUTOTRAINER_CHECKPOINT = os.getenv("AUTOTRAINER_CHECKPOINT")
+AUTOTRAINER_WORKERS = int(os.getenv("AUTOTRAINER_WORKERS", str(os.cpu_count() or 1)))
+AUTOTRAINER_POOL_MIN = int(os.getenv("AUTOTRAINER_POOL_MIN", "64"))
+
+Feedback = List[Tuple[str, float]]
+
+
+def _match_session(
+    contexts: Iterable[dict], feedback: Feedback, task_type: str
+) -> List[Tuple[str, float]]:
+    """Return the feedback of a session that refers to ``task_type`` runs."""
+    agents = {
+        ctx.get("agent_selection")
+        for ctx in contexts
+        if (ctx.get("task_context") or {}).get("task_type") == task_type
+    }
+    return [(agent, score) for agent, score in feedback if agent in agents]
+
+
+def _match_session_file(
+    path: str, feedback: Feedback, task_type: str
+) -> List[Tuple[str, float]]:
+    """Process-pool worker reading a session file of a FileSessionStore."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            contexts = json.load(fh)
+    except (OSError, ValueError):
+        return []
+    return _match_session(contexts, feedback, task_type)
+
 
 class AutoTrainer:
-    """Simple feedback-driven trainer."""
+    """Simple feedback-driven trainer.
+
+    A feedback entry counts once if its session holds any ``task_type`` run
+    of the rated agent, however many such runs there are.
 
-    def __init__(self, service: SessionManagerService) -> None:
+    Each run only looks at feedback added since the previous run. The
+    per-session high-water marks and the accumulated weights are stored in
+    ``checkpoint`` when given.
+    """
+
+    def __init__(
+        self,
+        service: SessionManagerService,
+        checkpoint: str | Path | None = AUTOTRAINER_CHECKPOINT,
+        task_type: str = "docker",
+        workers: int = AUTOTRAINER_WORKERS,
+    ) -> None:
         self.service = service
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        self.task_type = task_type
+        self.workers = workers
         self.weights: Dict[str, float] = {}
+        self.processed: Dict[str, int] = {}
+        self._load_checkpoint()
+
+    def _load_checkpoint(self) -> None:
+        if self.checkpoint and self.checkpoint.exists():
+            with self.checkpoint.open(encoding="utf-8") as fh:
+                data = json.load(fh)
+            self.weights = data.get("weights", {})
+            self.processed = data.get("processed", {})
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint:
+            return
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump({"weights": self.weights, "processed": self.processed}, fh)
+        os.replace(tmp, self.checkpoint)
+
+    def _new_feedback(self) -> Tuple[Dict[str, Feedback], Dict[str, int]]:
+        """Group feedback not seen by earlier runs by session.
+
+        Also returns the feedback count per session, to be stored as
+        processed once the run succeeded.
+        """
+        seen: Dict[str, int] = {}
+        grouped: Dict[str, Feedback] = {}
+        for fb in self.service.feedback_store.iter_feedback():
+            index = seen.get(fb.session_id, 0)
+            seen[fb.session_id] = index + 1
+            if index >= self.processed.get(fb.session_id, 0):
+                grouped.setdefault(fb.session_id, []).append((fb.agent_id, fb.score))
+        return grouped, seen
+
+    def _collect(self, grouped: Dict[str, Feedback]) -> List[Tuple[str, float]]:
+        store = self.service.store
+        entries: List[Tuple[str, float]] = []
+        if (
+            isinstance(store, FileSessionStore)
+            and self.workers > 1
+            and len(grouped) >= AUTOTRAINER_POOL_MIN
+        ):
+            sids = list(grouped)
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = pool.map(
+                    _match_session_file,
+                    [store.session_path(sid) for sid in sids],
+                    [grouped[sid] for sid in sids],
+                    [self.task_type] * len(sids),
+                    chunksize=max(1, len(sids) // (self.workers * 4)),
+                )
+                for matched in results:
+                    entries.extend(matched)
+            return entries
+        for sid, feedback in grouped.items():
+            # raw context dicts: no ModelContext or memory copy per session
+            contexts = store.get_context(sid)
+            entries.extend(_match_session(contexts, feedback, self.task_type))
+        return entries
 
     def run(self) -> None:
-        """Analyse feedback and adjust weights."""
-        entries = []
-        for fb in self.service.feedback_store.all_feedback():
-            ctxs = self.service.get_context(fb.session_id)
-            for ctx in ctxs:
-                if (
-                    ctx.agent_selection == fb.agent_id
-                    and ctx.task_context
-                    and ctx.task_context.task_type == "docker"
-                ):
-                    entries.append((fb.agent_id, fb.score))
-        stats = accumulate_weights(entries)
+        """Analyse new feedback and adjust weights."""
+        grouped, seen = self._new_feedback()
+        stats = accumulate_weights(self._collect(grouped)) if grouped else {}
         if stats:
-            logger.info("auto_trainer_update", weights=stats)
+            logger.info("auto_trainer_update", extra={"weights": stats})
             for agent, weight in stats.items():
                 self.weights[agent] = self.weights.get(agent, 0.0) + weight
-
+        # only now: a failed run sees the same feedback again next time
+        self.processed.update(seen)
+        self._save_checkpoint()
@@ -0,0 +1,116 @@
+"""Gzip bodies of internal batch calls in both directions."""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Iterable, Iterator
+
+GZIP_ENCODING = "gzip"
+
+
+def gzip_body(data: bytes) -> bytes:
+    """Compress a request body for ``Content-Encoding: gzip``."""
+    return gzip.compress(data, compresslevel=5)
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return ``True`` if an ``Accept-Encoding`` header allows gzip."""
+    return GZIP_ENCODING in (accept_encoding or "").lower()
+
+
+def gzip_stream(chunks: Iterable[str | bytes]) -> Iterator[bytes]:
+    """Gzip a streamed body and flush after every chunk.
+
+    Unlike ``GZipMiddleware`` this keeps streams such as NDJSON results
+    flowing line by line while later lines still reuse the dictionary.
+    """
+    compressor = zlib.compressobj(5, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = chunk.encode() if isinstance(chunk, str) else chunk
+        yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class GzipRequestMiddleware:
+    """Decompress request bodies sent with ``Content-Encoding: gzip``.
+
+    Starlette's ``GZipMiddleware`` only compresses responses; this covers
+    the other direction, e.g. federated ``/dispatch/batch`` calls. Bodies
+    are inflated incrementally and rejected with 413 as soon as they exceed
+    ``max_size``, so a small compressed body cannot expand without bound.
+    Register it inside authentication so only authorised bodies are
+    inflated.
+    """
+
+    def __init__(self, app, max_size: int = 64 * 1024 * 1024) -> None:
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        if headers.get(b"content-encoding", b"").lower() != GZIP_ENCODING.encode():
+            await self.app(scope, receive, send)
+            return
+        inflater = None
+        body = bytearray()
+        more = True
+        try:
+            while more:
+                message = await receive()
+                data = message.get("body", b"")
+                more = message.get("more_body", False)
+                while data:
+                    if inflater is None or inflater.eof:
+                        # a new, possibly concatenated, gzip member
+                        inflater = zlib.decompressobj(wbits=31)
+                    body += inflater.decompress(data, self.max_size + 1 - len(body))
+                    if len(body) > self.max_size:
+                        await _reject(send, 413, b"request body too large")
+                        return
+                    data = inflater.unconsumed_tail or inflater.unused_data
+            if inflater is not None and not inflater.eof:
+                raise zlib.error("truncated gzip body")
+        except zlib.error:
+            await _reject(send, 400, b"invalid gzip body")
+            return
+        body = bytes(body)
+        scope = dict(scope)
+        scope["headers"] = [
+            (k, v)
+            for k, v in scope["headers"]
+            if k not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode())]
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
+
+
+async def _reject(send, status: int, detail: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain")],
+        }
+    )
+    await send({"type": "http.response.body", "body": detail})
+
+
+__all__ = [
+    "GZIP_ENCODING",
+    "GzipRequestMiddleware",
+    "accepts_gzip",
+    "gzip_body",
+    "gzip_stream",
+]
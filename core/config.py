@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 from pathlib import Path
-from pydantic import ConfigDict
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application configuration loaded from ``.env``."""
 
-    model_config = ConfigDict(extra="allow")
+    model_config = SettingsConfigDict(
+        extra="allow", env_file=".env", case_sensitive=False
+    )
 
     DATA_DIR: str = "data"
     SESSIONS_DIR: str = "data/sessions"
@@ -42,10 +43,6 @@ class Settings(BaseSettings):
     API_AUTH_ENABLED: bool = False
     RATE_LIMITS_ENABLED: bool = True
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-
 
 settings = Settings()
 
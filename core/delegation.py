@@ -5,7 +5,7 @@ import os
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 from .agent_profile import AgentIdentity
 
@@ -24,6 +24,90 @@ class DelegationGrant:
     granted_at: str
 
 
+# delegate -> role -> grants ordered by expiry, latest (or never) first
+GrantIndex = Dict[str, Dict[str, List[dict]]]
+
+_index: GrantIndex | None = None
+_index_key: tuple[Path, int, int] | None = None
+
+
+def _index_path() -> Path:
+    return DELEGATION_DIR / "index.json"
+
+
+def _expiry_key(grant: dict) -> str:
+    # ``None`` never expires and sorts before any timestamp
+    return grant.get("expires_at") or "~"
+
+
+def _index_add(index: GrantIndex, grant: dict) -> None:
+    entries = index.setdefault(grant["delegate"], {}).setdefault(grant["role"], [])
+    entries.append(grant)
+    entries.sort(key=_expiry_key, reverse=True)
+
+
+def _save_index(index: GrantIndex) -> None:
+    global _index, _index_key
+    DELEGATION_DIR.mkdir(parents=True, exist_ok=True)
+    path = _index_path()
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(index, fh)
+    os.replace(tmp, path)
+    stat = path.stat()
+    _index = index
+    _index_key = (path, stat.st_mtime_ns, stat.st_size)
+
+
+def rebuild_delegation_index() -> GrantIndex:
+    """Rebuild the (delegate, role) index from all grant files."""
+    index: GrantIndex = {}
+    DELEGATION_DIR.mkdir(parents=True, exist_ok=True)
+    for file in DELEGATION_DIR.glob("*.jsonl"):
+        for grant in load_grants(file.stem):
+            _index_add(index, asdict(grant))
+    _save_index(index)
+    return index
+
+
+def load_delegation_index() -> GrantIndex:
+    """Return the grant index, reloading it only when the file changed."""
+    global _index, _index_key
+    path = _index_path()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return rebuild_delegation_index()
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _index is None or _index_key != key:
+        with open(path, "r", encoding="utf-8") as fh:
+            _index = json.load(fh)
+        _index_key = key
+    return _index
+
+
+def sweep_expired_grants(now: str | None = None) -> int:
+    """Drop expired grants from the index and return how many were removed."""
+    now = now or datetime.utcnow().isoformat()
+    index = load_delegation_index()
+    removed = 0
+    for delegate in list(index):
+        roles = index[delegate]
+        for role in list(roles):
+            entries = roles[role]
+            # expired grants sit at the tail of the expiry ordering
+            while entries and _expiry_key(entries[-1]) < now:
+                entries.pop()
+                removed += 1
+            if not entries:
+                del roles[role]
+        if not roles:
+            del index[delegate]
+    if removed:
+        _save_index(index)
+    return removed
+
+
 def _path(delegator: str) -> Path:
     DELEGATION_DIR.mkdir(parents=True, exist_ok=True)
     return DELEGATION_DIR / f"{delegator}.jsonl"
@@ -32,8 +116,11 @@ def _path(delegator: str) -> Path:
 def save_grant(grant: DelegationGrant) -> None:
     """Append ``grant`` to the delegator file."""
     path = _path(grant.delegator)
+    index = load_delegation_index()
     with open(path, "a", encoding="utf-8") as fh:
         fh.write(json.dumps(asdict(grant)) + "\n")
+    _index_add(index, asdict(grant))
+    _save_index(index)
 
 
 def load_grants(delegator: str) -> List[DelegationGrant]:
@@ -56,6 +143,14 @@ def revoke_grant(delegator: str, delegate: str, role: str) -> None:
     with open(path, "w", encoding="utf-8") as fh:
         for g in grants:
             fh.write(json.dumps(asdict(g)) + "\n")
+    index = load_delegation_index()
+    roles = index.get(delegate, {})
+    roles[role] = [g for g in roles.get(role, []) if g["delegator"] != delegator]
+    if not roles[role]:
+        roles.pop(role)
+    if not roles:
+        index.pop(delegate, None)
+    _save_index(index)
     # update profiles
     delegator_profile = AgentIdentity.load(delegator)
     delegator_profile.active_delegations = [
@@ -104,22 +199,16 @@ def has_valid_delegation(
     require_endorsement: bool = False,
 ) -> Optional[DelegationGrant]:
     """Return a valid delegation for ``agent`` and ``role`` if present."""
-    now = datetime.utcnow().isoformat()
-    for file in DELEGATION_DIR.glob("*.jsonl"):
-        with open(file, "r", encoding="utf-8") as fh:
-            for line in fh:
-                if not line.strip():
-                    continue
-                data = json.loads(line)
-                grant = DelegationGrant(**data)
-                if grant.delegate != agent or grant.role != role:
-                    continue
-                if grant.expires_at and grant.expires_at < now:
-                    continue
-                if require_endorsement:
-                    from .trust_circle import is_trusted_for
-
-                    if not is_trusted_for(agent, role):
-                        continue
-                return grant
-    return None
+    entries = load_delegation_index().get(agent, {}).get(role)
+    if not entries:
+        return None
+    # the first entry expires last; if it has expired, so have all others
+    grant = entries[0]
+    if _expiry_key(grant) < datetime.utcnow().isoformat():
+        return None
+    if require_endorsement:
+        from .trust_circle import is_trusted_for
+
+        if not is_trusted_for(agent, role):
+            return None
+    return DelegationGrant(**grant)
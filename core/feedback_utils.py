@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List
 
 
 @dataclass
@@ -17,6 +20,32 @@ class FeedbackEntry:
     score: int
     comment: str | None = None
     timestamp: str = ""
+    task_type: str | None = None
+
+
+@dataclass
+class FeedbackCounters:
+    """Running feedback counts, overall and per agent and task type."""
+
+    total: int = 0
+    positive: int = 0
+    negative: int = 0
+    by_agent: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    by_task_type: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def add(self, entry: FeedbackEntry) -> None:
+        key = "positive" if entry.score > 0 else "negative"
+        self.total += 1
+        setattr(self, key, getattr(self, key) + 1)
+        for bucket, name in (
+            (self.by_agent, entry.agent_id or "unknown"),
+            (self.by_task_type, entry.task_type or "unknown"),
+        ):
+            counts = bucket.setdefault(name, {"positive": 0, "negative": 0})
+            counts[key] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return json.loads(json.dumps(asdict(self)))
 
 
 class BaseFeedbackStore(ABC):
@@ -34,15 +63,28 @@ class BaseFeedbackStore(ABC):
     def all_feedback(self) -> List[FeedbackEntry]:
         ...
 
+    def iter_feedback(self) -> Iterator[FeedbackEntry]:
+        """Yield all feedback entries one by one."""
+        yield from self.all_feedback()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return aggregated feedback counters."""
+        counters = FeedbackCounters()
+        for entry in self.iter_feedback():
+            counters.add(entry)
+        return counters.to_dict()
+
 
 class InMemoryFeedbackStore(BaseFeedbackStore):
     """Keep feedback in process memory."""
 
     def __init__(self) -> None:
         self._data: Dict[str, List[FeedbackEntry]] = {}
+        self._counters = FeedbackCounters()
 
     def add_feedback(self, entry: FeedbackEntry) -> None:
         self._data.setdefault(entry.session_id, []).append(entry)
+        self._counters.add(entry)
 
     def get_feedback(self, session_id: str) -> List[FeedbackEntry]:
         return list(self._data.get(session_id, []))
@@ -53,33 +95,137 @@ class InMemoryFeedbackStore(BaseFeedbackStore):
             items.extend(lst)
         return items
 
+    def stats(self) -> Dict[str, Any]:
+        return self._counters.to_dict()
+
 
 class FileFeedbackStore(BaseFeedbackStore):
-    """Persist feedback as JSON files."""
+    """Persist feedback as append-only JSONL files, one per session.
+
+    Running counters live in the SQLite file ``_stats.db`` next to the
+    sessions. Each write appends its entry and increments the counters in
+    one locked transaction, so processes sharing the directory neither lose
+    updates nor read stale counts. Sessions written by older versions as
+    ``<sid>.json`` are still read.
+    """
+
+    STATS_DB = "_stats.db"
+    LEGACY_STATS_FILE = "_stats.json"
 
     def __init__(self, base_path: str) -> None:
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.base_path / self.STATS_DB),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS counters (scope TEXT, name TEXT, "
+            "positive INTEGER, negative INTEGER, PRIMARY KEY (scope, name))"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY)")
+        with self._transaction():
+            # first store on this directory: count what is already there
+            if not self._db.execute("SELECT 1 FROM meta WHERE key='counted'").fetchone():
+                self._recount()
 
     def _file(self, sid: str) -> Path:
+        return self.base_path / f"{sid}.jsonl"
+
+    def _legacy_file(self, sid: str) -> Path:
         return self.base_path / f"{sid}.json"
 
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _count(self, entry: FeedbackEntry) -> None:
+        positive = 1 if entry.score > 0 else 0
+        for scope, name in (
+            ("total", ""),
+            ("agent", entry.agent_id or "unknown"),
+            ("task_type", entry.task_type or "unknown"),
+        ):
+            self._db.execute(
+                "INSERT INTO counters VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (scope, name) DO UPDATE SET "
+                "positive = positive + excluded.positive, "
+                "negative = negative + excluded.negative",
+                (scope, name, positive, 1 - positive),
+            )
+
+    def _recount(self) -> None:
+        self._db.execute("DELETE FROM counters")
+        for entry in self.iter_feedback():
+            self._count(entry)
+        self._db.execute("INSERT OR IGNORE INTO meta VALUES ('counted')")
+
     def add_feedback(self, entry: FeedbackEntry) -> None:
-        data = [asdict(e) for e in self.get_feedback(entry.session_id)]
-        data.append(asdict(entry))
-        with self._file(entry.session_id).open("w", encoding="utf-8") as fh:
-            json.dump(data, fh)
+        with self._transaction():
+            with self._file(entry.session_id).open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(asdict(entry)) + "\n")
+            self._count(entry)
+
+    def _iter_session(self, session_id: str) -> Iterator[FeedbackEntry]:
+        legacy = self._legacy_file(session_id)
+        if legacy.exists():
+            with legacy.open(encoding="utf-8") as fh:
+                for d in json.load(fh):
+                    yield FeedbackEntry(**d)
+        path = self._file(session_id)
+        if path.exists():
+            with path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        yield FeedbackEntry(**json.loads(line))
 
     def get_feedback(self, session_id: str) -> List[FeedbackEntry]:
-        path = self._file(session_id)
-        if not path.exists():
-            return []
-        with path.open(encoding="utf-8") as fh:
-            data = json.load(fh)
-        return [FeedbackEntry(**d) for d in data]
+        return list(self._iter_session(session_id))
+
+    def _session_ids(self) -> Iterator[str]:
+        seen: set[str] = set()
+        for file in self.base_path.iterdir():
+            if (
+                file.suffix not in {".json", ".jsonl"}
+                or file.name == self.LEGACY_STATS_FILE
+            ):
+                continue
+            if file.stem not in seen:
+                seen.add(file.stem)
+                yield file.stem
+
+    def iter_feedback(self) -> Iterator[FeedbackEntry]:
+        for sid in self._session_ids():
+            yield from self._iter_session(sid)
 
     def all_feedback(self) -> List[FeedbackEntry]:
-        items: List[FeedbackEntry] = []
-        for file in self.base_path.glob("*.json"):
-            items.extend(self.get_feedback(file.stem))
-        return items
+        return list(self.iter_feedback())
+
+    def stats(self) -> Dict[str, Any]:
+        counters = FeedbackCounters()
+        buckets = {"agent": counters.by_agent, "task_type": counters.by_task_type}
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM counters").fetchall()
+        for scope, name, positive, negative in rows:
+            if scope == "total":
+                counters.positive, counters.negative = positive, negative
+                counters.total = positive + negative
+            else:
+                buckets[scope][name] = {"positive": positive, "negative": negative}
+        return counters.to_dict()
+
+    def rebuild_stats(self) -> Dict[str, Any]:
+        """Recount all stored feedback and persist the counters."""
+        with self._transaction():
+            self._recount()
+        return self.stats()
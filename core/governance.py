@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import tempfile
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, List
@@ -59,5 +60,14 @@ class AgentContract:
     def save(self) -> None:
         CONTRACT_DIR.mkdir(parents=True, exist_ok=True)
         path = CONTRACT_DIR / f"{self.agent}.json"
-        with open(path, "w", encoding="utf-8") as fh:
-            json.dump(asdict(self), fh, indent=2)
+        # write aside and rename so concurrent loads never see a partial file
+        fh = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=CONTRACT_DIR, suffix=".tmp", delete=False
+        )
+        try:
+            with fh:
+                json.dump(asdict(self), fh, indent=2)
+            os.replace(fh.name, path)
+        except BaseException:
+            os.unlink(fh.name)
+            raise
@@ -0,0 +1,110 @@
+"""ETag support for GET endpoints and gateway cache invalidation."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Iterable, List, Set
+
+import httpx
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+# gateway endpoint notified about writes, e.g. http://api_gateway:8000/cache/invalidate
+GATEWAY_CACHE_INVALIDATE_URL = os.getenv("GATEWAY_CACHE_INVALIDATE_URL", "")
+# bearer token with the ``cache:write`` scope, sent with invalidations
+GATEWAY_SERVICE_TOKEN = os.getenv("GATEWAY_SERVICE_TOKEN", "")
+
+logger = logging.getLogger(__name__)
+
+# running invalidation tasks, referenced so they are not garbage collected
+_pending: Set[asyncio.Task] = set()
+
+
+def etag_for(body: bytes) -> str:
+    """Return a weak ETag for ``body``."""
+    return f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Return ``True`` if an ``If-None-Match`` header matches ``etag``."""
+    if not header:
+        return False
+    candidates = {c.strip() for c in header.split(",")}
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """Add ETags to JSON GET responses and answer revalidations with 304.
+
+    The handler still runs; a match only saves serialising the body onto the
+    wire and parsing it on the caller's side.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if (
+            request.method != "GET"
+            or response.status_code != 200
+            or not response.headers.get("content-type", "").startswith(
+                "application/json"
+            )
+        ):
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = etag_for(body)
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() != "content-length"
+        }
+        headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+        return Response(body, status_code=200, headers=headers)
+
+
+def notify_write(tags: Iterable[str]) -> None:
+    """Tell the API gateway to drop cached responses tagged with ``tags``.
+
+    Inside an event loop the request is sent in a background task, so the
+    calling route does not wait for the gateway.
+    """
+    if not GATEWAY_CACHE_INVALIDATE_URL:
+        return
+    tags = list(tags)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_post_invalidation(tags))
+        return
+    task = loop.create_task(_post_invalidation(tags))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def _post_invalidation(tags: List[str]) -> None:
+    headers = {}
+    if GATEWAY_SERVICE_TOKEN:
+        headers["Authorization"] = f"Bearer {GATEWAY_SERVICE_TOKEN}"
+    try:
+        async with httpx.AsyncClient() as client:
+            resp = await client.post(
+                GATEWAY_CACHE_INVALIDATE_URL,
+                json={"tags": tags},
+                headers=headers,
+                timeout=2,
+            )
+        resp.raise_for_status()
+    except Exception as exc:
+        logger.warning("cache invalidation for %s failed: %s", tags, exc)
+
+
+__all__ = [
+    "ConditionalGetMiddleware",
+    "etag_for",
+    "etag_matches",
+    "notify_write",
+]
@@ -8,7 +8,7 @@ from .audit_log import AuditEntry, AuditLog
 from .governance import AgentContract
 from .levels import load_levels
 from .rewards import grant_rewards
-from .trust_evaluator import calculate_trust
+from .trust_evaluator import trust_score
 
 
 def _agent_skills(agent: AgentIdentity) -> set[str]:
@@ -22,8 +22,7 @@ def check_level_up(agent: AgentIdentity) -> Optional[str]:
     """
 
     contract = AgentContract.load(agent.name)
-    history = contract.constraints.get("task_history", [])
-    trust = calculate_trust(agent.name, history)
+    trust = trust_score(agent.name, contract)
     levels = load_levels()
     current = agent.current_level
     current_index = -1
@@ -1,4 +1,5 @@
 from .base import LLMProvider
 from .manager import LLMBackendManager
+from .router import ProviderRouter
 
-__all__ = ["LLMBackendManager", "LLMProvider"]
+__all__ = ["LLMBackendManager", "LLMProvider", "ProviderRouter"]
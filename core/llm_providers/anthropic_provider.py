@@ -1,15 +1,78 @@
 from __future__ import annotations
 
+import json
+import os
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+
 from core.model_context import ModelContext
+from core.stream_utils import aparse_sse
 
 from .base import LLMProvider
 
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com/v1")
+ANTHROPIC_VERSION = "2023-06-01"
+
 
 class AnthropicProvider(LLMProvider):
-    def __init__(self, api_key: str | None = None) -> None:
+    """Messages API; echoes the prompt when no API key is set."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        base_url: str | None = None,
+        max_tokens: int | None = None,
+        timeout: float = 60.0,
+    ) -> None:
         self.name = "anthropic"
         self.api_key = api_key
+        self.model = model or "claude-3-haiku-20240307"
+        self.base_url = (base_url or ANTHROPIC_BASE_URL).rstrip("/")
+        self.max_tokens = max_tokens or int(os.getenv("LLM_MAX_TOKENS", "1000"))
+        self.timeout = timeout
+
+    def _request(self, ctx: ModelContext, stream: bool) -> Dict[str, Any]:
+        return {
+            "url": f"{self.base_url}/messages",
+            "headers": {
+                "x-api-key": self.api_key or "",
+                "anthropic-version": ANTHROPIC_VERSION,
+            },
+            "json": {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "messages": [{"role": "user", "content": ctx.task or ""}],
+                "stream": stream,
+            },
+            "timeout": self.timeout,
+        }
 
     def generate_response(self, ctx: ModelContext) -> str:
         prompt = ctx.task or ""
-        return f"anthropic:{prompt}"
+        if not self.api_key:
+            return f"anthropic:{prompt}"
+        with httpx.Client() as client:
+            resp = client.post(**self._request(ctx, stream=False))
+            resp.raise_for_status()
+            blocks = resp.json().get("content", [])
+            return "".join(b.get("text", "") for b in blocks if b.get("type") == "text")
+
+    async def stream_response(self, ctx: ModelContext) -> AsyncIterator[str]:
+        if not self.api_key:
+            async for token in super().stream_response(ctx):
+                yield token
+            return
+        async with httpx.AsyncClient() as client:
+            async with client.stream("POST", **self._request(ctx, stream=True)) as resp:
+                resp.raise_for_status()
+                async for event, data in aparse_sse(resp.aiter_lines()):
+                    if event == "message_stop":
+                        break
+                    payload = json.loads(data)
+                    if event == "error":
+                        raise RuntimeError(payload.get("error", {}).get("message", data))
+                    delta = payload.get("delta") or {}
+                    if event == "content_block_delta" and delta.get("type") == "text_delta":
+                        yield delta.get("text", "")
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from core.model_context import ModelContext
 
@@ -14,5 +16,16 @@ class LLMProvider(ABC):
     def generate_response(self, ctx: ModelContext) -> str:
         """Generate a completion for the given context."""
 
+    async def stream_response(self, ctx: ModelContext) -> AsyncIterator[str]:
+        """Yield completion tokens for ``ctx`` as they are produced.
+
+        Providers without native streaming run :meth:`generate_response` in a
+        worker thread and emit the completion word by word, so callers can
+        always consume a stream without blocking the event loop.
+        """
+        text = await asyncio.to_thread(self.generate_response, ctx)
+        for i, word in enumerate(text.split(" ")):
+            yield word if i == 0 else f" {word}"
+
     def embed(self, text: str) -> list[float]:  # pragma: no cover - optional
         raise NotImplementedError
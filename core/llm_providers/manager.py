@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from typing import Dict
+from typing import Any, Dict
 
 import yaml
 from pydantic_settings import BaseSettings
@@ -10,11 +10,13 @@ from .anthropic_provider import AnthropicProvider
 from .base import LLMProvider
 from .local_provider import GGUFProvider, LocalHFProvider
 from .openai_provider import OpenAIProvider
+from .router import ProviderRouter
 
 
 class LLMConfig(BaseSettings):
     default_provider: str = "openai"
     providers: Dict[str, Dict] = {}
+    routing: Dict[str, Any] = {}
 
     @classmethod
     def load(cls) -> "LLMConfig":
@@ -28,10 +30,19 @@ class LLMConfig(BaseSettings):
         return cls()
 
 
+def _api_key(env: str, info: Dict[str, Any]) -> str | None:
+    """Return the key from ``env`` or the config, ignoring ``${VAR}`` placeholders."""
+    key = os.getenv(env, info.get("api_key"))
+    if not key or (key.startswith("${") and key.endswith("}")):
+        return None
+    return key
+
+
 class LLMBackendManager:
     def __init__(self, config: LLMConfig | None = None) -> None:
         self.config = config or LLMConfig.load()
         self._cache: Dict[str, LLMProvider] = {}
+        self.router = ProviderRouter(self, self.config.routing)
 
     def get_provider(self, name: str | None = None) -> LLMProvider:
         provider_name = name or self.config.default_provider
@@ -43,11 +54,15 @@ class LLMBackendManager:
         type_ = info.get("type")
         if type_ == "openai":
             provider = OpenAIProvider(
-                api_key=os.getenv("OPENAI_API_KEY", info.get("api_key"))
+                api_key=_api_key("OPENAI_API_KEY", info),
+                model=info.get("model"),
+                base_url=info.get("base_url"),
             )
         elif type_ == "anthropic":
             provider = AnthropicProvider(
-                api_key=os.getenv("ANTHROPIC_API_KEY", info.get("api_key"))
+                api_key=_api_key("ANTHROPIC_API_KEY", info),
+                model=info.get("model"),
+                base_url=info.get("base_url"),
             )
         elif type_ == "local":
             provider = LocalHFProvider(model_path=info.get("model_path", ""))
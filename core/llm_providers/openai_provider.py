@@ -1,15 +1,68 @@
 from __future__ import annotations
 
+import json
+import os
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+
 from core.model_context import ModelContext
+from core.stream_utils import aparse_sse
 
 from .base import LLMProvider
 
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
 
 class OpenAIProvider(LLMProvider):
-    def __init__(self, api_key: str | None = None) -> None:
+    """Chat completions API; echoes the prompt when no API key is set."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        base_url: str | None = None,
+        timeout: float = 60.0,
+    ) -> None:
         self.name = "openai"
         self.api_key = api_key
+        self.model = model or os.getenv("LLM_MODEL", "gpt-3.5-turbo")
+        self.base_url = (base_url or OPENAI_BASE_URL).rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, ctx: ModelContext, stream: bool) -> Dict[str, Any]:
+        return {
+            "url": f"{self.base_url}/chat/completions",
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "json": {
+                "model": self.model,
+                "messages": [{"role": "user", "content": ctx.task or ""}],
+                "stream": stream,
+            },
+            "timeout": self.timeout,
+        }
 
     def generate_response(self, ctx: ModelContext) -> str:
         prompt = ctx.task or ""
-        return f"openai:{prompt}"
+        if not self.api_key:
+            return f"openai:{prompt}"
+        with httpx.Client() as client:
+            resp = client.post(**self._request(ctx, stream=False))
+            resp.raise_for_status()
+            return resp.json()["choices"][0]["message"]["content"] or ""
+
+    async def stream_response(self, ctx: ModelContext) -> AsyncIterator[str]:
+        if not self.api_key:
+            async for token in super().stream_response(ctx):
+                yield token
+            return
+        async with httpx.AsyncClient() as client:
+            async with client.stream("POST", **self._request(ctx, stream=True)) as resp:
+                resp.raise_for_status()
+                async for _, data in aparse_sse(resp.aiter_lines()):
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    token = (choices[0].get("delta") or {}).get("content")
+                    if token:
+                        yield token
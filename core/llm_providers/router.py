@@ -0,0 +1,268 @@
+"""Latency- and health-aware selection between configured LLM providers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Deque, Dict, Iterator
+
+from core.model_context import ModelContext
+
+from .base import LLMProvider
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle
+    from .manager import LLMBackendManager
+
+
+@dataclass
+class ProviderStats:
+    """Observed behaviour of a single provider."""
+
+    latency: float | None = None
+    error_rate: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    failures: int = 0
+    open_until: float = 0.0
+    half_open: bool = False
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[idx]
+
+
+class ProviderRouter:
+    """Pick, hedge and fail over between providers of a manager.
+
+    The ``routing`` section of ``llm_config.yaml`` tunes the behaviour::
+
+        routing:
+          alpha: 0.2              # EWMA smoothing factor
+          failure_threshold: 3    # consecutive errors before the breaker opens
+          cooldown_seconds: 30    # time until a half-open probe is allowed
+          hedge_percentile: 0.95  # start a backup call after this latency
+          hedge_min_samples: 20   # samples needed before hedging
+          latency_weight: 1.0
+          cost_weight: 1.0
+
+    Providers may define ``cost_per_1k_tokens`` and ``weight``; a weight of
+    ``0`` removes the provider from automatic fallback.
+    """
+
+    def __init__(
+        self,
+        manager: "LLMBackendManager",
+        settings: Dict[str, Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        cfg = settings or {}
+        self.manager = manager
+        self.alpha = float(cfg.get("alpha", 0.2))
+        self.failure_threshold = int(cfg.get("failure_threshold", 3))
+        self.cooldown = float(cfg.get("cooldown_seconds", 30.0))
+        self.hedge_percentile = float(cfg.get("hedge_percentile", 0.95))
+        self.hedge_min_samples = int(cfg.get("hedge_min_samples", 20))
+        self.latency_weight = float(cfg.get("latency_weight", 1.0))
+        self.cost_weight = float(cfg.get("cost_weight", 1.0))
+        self.stats: Dict[str, ProviderStats] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+
+    # -- bookkeeping -----------------------------------------------------
+    def _stats(self, name: str) -> ProviderStats:
+        with self._lock:
+            return self.stats.setdefault(name, ProviderStats())
+
+    def record(self, name: str, duration: float, ok: bool) -> None:
+        """Fold one call outcome into the provider statistics."""
+        stats = self._stats(name)
+        with self._lock:
+            if ok:
+                stats.latency = (
+                    duration
+                    if stats.latency is None
+                    else self.alpha * duration + (1 - self.alpha) * stats.latency
+                )
+                stats.samples.append(duration)
+                stats.failures = 0
+                stats.half_open = False
+                stats.open_until = 0.0
+            else:
+                stats.failures += 1
+                if stats.half_open or stats.failures >= self.failure_threshold:
+                    stats.open_until = self._clock() + self.cooldown
+                    stats.half_open = False
+            error = 0.0 if ok else 1.0
+            stats.error_rate = self.alpha * error + (1 - self.alpha) * stats.error_rate
+
+    def available(self, name: str) -> bool:
+        """Return ``True`` unless the provider's circuit is open."""
+        stats = self._stats(name)
+        with self._lock:
+            if not stats.open_until:
+                return True
+            now = self._clock()
+            if now >= stats.open_until:
+                # half-open: allow a single probe per cooldown period
+                stats.half_open = True
+                stats.open_until = now + self.cooldown
+                return True
+            return False
+
+    def _may_call(self, name: str) -> bool:
+        """Like :meth:`available` but without claiming a half-open probe."""
+        stats = self._stats(name)
+        with self._lock:
+            return not stats.open_until or self._clock() >= stats.open_until
+
+    def hedge_delay(self, name: str) -> float | None:
+        stats = self._stats(name)
+        if len(stats.samples) < self.hedge_min_samples:
+            return None
+        return stats.percentile(self.hedge_percentile)
+
+    # -- selection -------------------------------------------------------
+    def score(self, name: str) -> float:
+        """Lower is better: weighted latency, cost and error rate."""
+        info = self.manager.config.providers.get(name, {})
+        stats = self._stats(name)
+        known = [s.latency for s in self.stats.values() if s.latency is not None]
+        latency = stats.latency
+        if latency is None:
+            latency = sum(known) / len(known) if known else 0.0
+        cost = float(info.get("cost_per_1k_tokens", 0.0))
+        weight = float(info.get("weight", 1.0)) or 1e-6
+        base = self.latency_weight * latency + self.cost_weight * cost
+        return base * (1.0 + stats.error_rate) / weight
+
+    def candidates(self, preferred: str | None = None) -> list[str]:
+        """Return provider names in the order they should be tried.
+
+        Providers whose circuit is open are left out. Probe slots of
+        half-open providers are only claimed by :meth:`_admitted` when a
+        call actually reaches them.
+        """
+        providers = self.manager.config.providers
+        default = self.manager.config.default_provider
+        names = [
+            n for n in providers if float(providers[n].get("weight", 1.0)) > 0
+        ]
+        order = sorted(names, key=lambda n: (self.score(n), n != default))
+        primary = preferred or (order[0] if order else default)
+        order = [primary] + [n for n in order if n != primary]
+        healthy = [n for n in order if self._may_call(n)]
+        return healthy or order[:1]
+
+    def _admitted(self, order: list[str]) -> Iterator[str]:
+        """Yield names from ``order`` as their breakers admit a call."""
+        admitted = False
+        for name in order:
+            if self.available(name):
+                admitted = True
+                yield name
+        if not admitted and order:
+            # every circuit is open: still try the best provider
+            yield order[0]
+
+    # -- execution -------------------------------------------------------
+    def _call(self, name: str, ctx: ModelContext) -> tuple[LLMProvider, str]:
+        start = time.perf_counter()
+        try:
+            provider = self.manager.get_provider(name)
+            text = provider.generate_response(ctx)
+        except Exception:
+            self.record(name, time.perf_counter() - start, ok=False)
+            raise
+        self.record(name, time.perf_counter() - start, ok=True)
+        return provider, text
+
+    def complete(
+        self, ctx: ModelContext, preferred: str | None = None
+    ) -> tuple[LLMProvider, str]:
+        """Generate a completion, failing over and hedging as needed."""
+        order = self.candidates(preferred)
+        if len(order) > 1 and self.hedge_delay(order[0]) is not None:
+            return self._complete_hedged(ctx, order)
+        last_exc: Exception | None = None
+        for name in self._admitted(order):
+            try:
+                return self._call(name, ctx)
+            except Exception as exc:
+                last_exc = exc
+        raise last_exc or ValueError("no provider available")
+
+    def _complete_hedged(
+        self, ctx: ModelContext, order: list[str]
+    ) -> tuple[LLMProvider, str]:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix="llm-hedge"
+            )
+        pending: Dict[Future, str] = {}
+        names = self._admitted(order)
+        exhausted = False
+        last_exc: Exception | None = None
+
+        def launch() -> None:
+            nonlocal exhausted
+            name = next(names, None)
+            if name is None:
+                exhausted = True
+            else:
+                pending[self._pool.submit(self._call, name, ctx)] = name
+
+        launch()
+        hedged = False
+        try:
+            while pending:
+                timeout = None
+                if not hedged and not exhausted:
+                    timeout = self.hedge_delay(next(iter(pending.values())))
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch()
+                    continue
+                for fut in done:
+                    pending.pop(fut)
+                    try:
+                        return fut.result()
+                    except Exception as exc:
+                        last_exc = exc
+                if not pending and not exhausted:
+                    launch()
+        finally:
+            # calls already running in a thread finish and are recorded;
+            # queued ones are dropped
+            for fut in pending:
+                fut.cancel()
+        raise last_exc or ValueError("no provider available")
+
+    async def stream(
+        self, ctx: ModelContext, preferred: str | None = None
+    ) -> AsyncIterator[tuple[LLMProvider, str]]:
+        """Yield ``(provider, token)`` pairs, failing over before the first token."""
+        last_exc: Exception | None = None
+        for name in self._admitted(self.candidates(preferred)):
+            start = time.perf_counter()
+            started = False
+            try:
+                provider = self.manager.get_provider(name)
+                async for token in provider.stream_response(ctx):
+                    started = True
+                    yield provider, token
+            except Exception as exc:
+                self.record(name, time.perf_counter() - start, ok=False)
+                if started:
+                    raise
+                last_exc = exc
+                continue
+            self.record(name, time.perf_counter() - start, ok=True)
+            return
+        raise last_exc or ValueError("no provider available")
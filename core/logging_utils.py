@@ -16,6 +16,7 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from core.config import settings
+from core.tracing import current_span
 
 
 def init_logging(service: str) -> structlog.BoundLogger:
@@ -58,8 +59,10 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next: Callable):
         request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
+        span = current_span()
         log = self.logger.bind(
             request_id=request_id,
+            trace_id=span.trace_id if span else None,
             context_id=request.headers.get("x-context-id"),
             session_id=request.headers.get("x-session-id"),
             agent_id=request.headers.get("x-agent-id"),
@@ -1,4 +1,7 @@
 import time
+from contextlib import contextmanager
+from typing import Iterator
+
 from fastapi import APIRouter, Request
 from fastapi.responses import Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -6,9 +9,11 @@ from prometheus_client import (
     Counter,
     Gauge,
     Histogram,
+    REGISTRY,
     generate_latest,
     CONTENT_TYPE_LATEST,
 )
+from prometheus_client.openmetrics import exposition as openmetrics
 
 TASKS_PROCESSED = Counter(
     "agentnn_tasks_processed_total", "Total processed tasks", ["service"]
@@ -49,18 +54,81 @@ ROUTING_DECISIONS = Counter(
     ["task_type", "worker"],
 )
 
+# pipeline stage timings; exemplars carry the context uuid
+STAGE_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+STAGE_LATENCY = Histogram(
+    "agentnn_stage_seconds",
+    "Duration of a pipeline stage in seconds",
+    ["service", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+QUEUE_WAIT = Histogram(
+    "agentnn_queue_wait_seconds",
+    "Time a task spent queued before execution",
+    ["service"],
+    buckets=STAGE_BUCKETS,
+)
+
+# adaptive admission control
+CONCURRENCY_LIMIT = Gauge(
+    "agentnn_concurrency_limit", "Current adaptive in-flight limit", ["service"]
+)
+SHED_REQUESTS = Counter(
+    "agentnn_shed_requests_total",
+    "Requests rejected by load shedding",
+    ["service", "priority"],
+)
+
+
+def observe_stage(
+    service: str, stage: str, duration: float, context_id: str | None = None
+) -> None:
+    """Record ``duration`` for ``stage`` with an optional exemplar."""
+    exemplar = {"context_id": context_id} if context_id else None
+    STAGE_LATENCY.labels(service, stage).observe(duration, exemplar=exemplar)
+
+
+@contextmanager
+def stage_timer(
+    service: str, stage: str, context_id: str | None = None
+) -> Iterator[None]:
+    """Time the enclosed block as ``stage`` of ``service``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(service, stage, time.perf_counter() - start, context_id)
+
 
 def metrics_router() -> APIRouter:
     router = APIRouter()
 
     @router.get("/metrics")
-    async def metrics() -> Response:
+    async def metrics(request: Request) -> Response:
+        # exemplars are only part of the OpenMetrics format
+        if "application/openmetrics-text" in request.headers.get("accept", ""):
+            return Response(
+                content=openmetrics.generate_latest(REGISTRY),
+                media_type=openmetrics.CONTENT_TYPE_LATEST,
+            )
         data = generate_latest()
         return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
     return router
 
 
+def route_template(request: Request) -> str:
+    """Return the matched route path, e.g. ``/context/{session_id}``.
+
+    Raw paths contain ids and would create one series per request.
+    """
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Track request durations."""
 
@@ -74,15 +142,17 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
         except Exception:
             duration = time.perf_counter() - start
-            RESPONSE_TIME.labels(self.service, request.url.path).observe(duration)
-            REQUEST_ERRORS.labels(self.service, request.url.path, "500").inc()
+            path = route_template(request)
+            RESPONSE_TIME.labels(self.service, path).observe(duration)
+            REQUEST_ERRORS.labels(self.service, path, "500").inc()
             raise
         duration = time.perf_counter() - start
-        RESPONSE_TIME.labels(self.service, request.url.path).observe(duration)
+        path = route_template(request)
+        RESPONSE_TIME.labels(self.service, path).observe(duration)
         if response.status_code >= 400:
             REQUEST_ERRORS.labels(
                 self.service,
-                request.url.path,
+                path,
                 str(response.status_code),
             ).inc()
         return response
@@ -40,6 +40,7 @@ class AgentRunContext(BaseModel):
     voted_by: List[str] = []
     priority: int | None = None
     exclusive: bool = False
+    error: str | None = None
 
 
 class ModelContext(BaseModel):
@@ -0,0 +1,375 @@
+"""Token bucket rate limits with state shared between service replicas.
+
+Buckets live in a store selected by ``RATE_LIMIT_BACKEND``: ``memory`` for a
+single process, ``sqlite`` for replicas on one host and ``redis`` for a
+cluster. Each process leases up to ``RATE_LIMIT_BATCH`` tokens at a time and
+spends them locally, so the shared store is only consulted once per lease.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Protocol, Tuple
+
+import anyio
+from fastapi import HTTPException, Request
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis = None
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "data/rate_limits.db")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_BATCH = int(os.getenv("RATE_LIMIT_BATCH", "10"))
+# keys whose leases are kept in process memory, least recently used first out
+RATE_LIMIT_LOCAL_KEYS = int(os.getenv("RATE_LIMIT_LOCAL_KEYS", "10000"))
+# quotas shared by all routes; empty disables them
+RATE_LIMIT_USER = os.getenv("RATE_LIMIT_USER", "")
+RATE_LIMIT_TENANT = os.getenv("RATE_LIMIT_TENANT", "")
+# bearer tokens of internal callers whose X-User-Id/X-Tenant-Id are trusted
+RATE_LIMIT_TRUSTED_TOKENS = {
+    t.strip()
+    for t in os.getenv("RATE_LIMIT_TRUSTED_TOKENS", "").split(",")
+    if t.strip()
+}
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """Return ``(capacity, period_seconds)`` for a spec like ``60/minute``."""
+    count, _, period = spec.strip().partition("/")
+    period = period.strip().lower().rstrip("s") or "minute"
+    if period not in _PERIODS:
+        raise ValueError(f"unknown rate period: {spec}")
+    return int(count), float(_PERIODS[period])
+
+
+class BucketStore(Protocol):
+    def take(
+        self, key: str, want: int, capacity: int, period: float
+    ) -> Tuple[int, float]:
+        """Refill ``key`` and remove up to ``want`` tokens.
+
+        Returns the granted tokens and the tokens left in the bucket.
+        """
+
+
+class MemoryBucketStore:
+    """Buckets in process memory."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, want, capacity, period):
+        now = time.time()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (float(capacity), now))
+            tokens = min(capacity, tokens + (now - ts) * capacity / period)
+            granted = min(want, int(tokens))
+            self._buckets[key] = (tokens - granted, now)
+        return granted, tokens - granted
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file shared by processes on one host."""
+
+    def __init__(self, path: str = RATE_LIMIT_DB_PATH) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL, ts REAL)"
+        )
+        self._lock = threading.Lock()
+
+    def take(self, key, want, capacity, period):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, ts FROM buckets WHERE key=?", (key,)
+                ).fetchone()
+                tokens, ts = row if row else (float(capacity), now)
+                tokens = min(capacity, tokens + (now - ts) * capacity / period)
+                granted = min(want, int(tokens))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)",
+                    (key, tokens - granted, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return granted, tokens - granted
+
+
+_REDIS_TAKE = """
+local now = tonumber(ARGV[1])
+local want = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local period = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * capacity / period)
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(period * 2))
+return {granted, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """Buckets in Redis, updated atomically by a Lua script."""
+
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL) -> None:
+        if redis is None:
+            raise RuntimeError("redis package is required for RedisBucketStore")
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    def take(self, key, want, capacity, period):
+        granted, tokens = self._take(
+            keys=[f"ratelimit:{key}"], args=[time.time(), want, capacity, period]
+        )
+        return int(granted), float(tokens)
+
+
+def store_from_env() -> BucketStore:
+    """Return the bucket store configured by ``RATE_LIMIT_BACKEND``.
+
+    Raises ``RuntimeError`` if ``redis`` is configured but not installed;
+    limits kept per process would silently multiply by the replica count.
+    """
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketStore()
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBucketStore()
+    if RATE_LIMIT_BACKEND != "memory":
+        logger.warning(
+            "unknown RATE_LIMIT_BACKEND %r, using memory", RATE_LIMIT_BACKEND
+        )
+    return MemoryBucketStore()
+
+
+def client_identity(request: Request) -> Tuple[str | None, str | None]:
+    """Return the client address as user and no tenant."""
+    return f"ip:{request.client.host if request.client else 'unknown'}", None
+
+
+def header_identity(request: Request) -> Tuple[str | None, str | None]:
+    """Return ``(user, tenant)`` from ``X-User-Id`` and ``X-Tenant-Id``.
+
+    The headers are only trusted from internal callers presenting a bearer
+    token listed in ``RATE_LIMIT_TRUSTED_TOKENS``; anyone else could rotate
+    them for fresh buckets and is identified by address instead.
+    """
+    auth = request.headers.get("Authorization", "")
+    token = auth[7:] if auth.startswith("Bearer ") else ""
+    if token and token in RATE_LIMIT_TRUSTED_TOKENS:
+        user = request.headers.get("X-User-Id")
+        if user:
+            return user, request.headers.get("X-Tenant-Id")
+    return client_identity(request)
+
+
+class RateLimiter:
+    """Per-IP route limits plus per-user and per-tenant quotas.
+
+    ``limit(spec)`` decorates an endpoint like slowapi's ``Limiter.limit``;
+    the endpoint does not need a ``request`` parameter. Exceeding a limit
+    raises ``429`` with a ``Retry-After`` header. Calls to a shared store
+    run in a worker thread so they do not block the event loop, and leases
+    are kept for the ``local_keys`` most recently used keys only.
+    """
+
+    def __init__(
+        self,
+        store: BucketStore | None = None,
+        batch: int = RATE_LIMIT_BATCH,
+        user_limit: str = RATE_LIMIT_USER,
+        tenant_limit: str = RATE_LIMIT_TENANT,
+        identify: Callable[[Request], Tuple[str | None, str | None]] = header_identity,
+        local_keys: int = RATE_LIMIT_LOCAL_KEYS,
+    ) -> None:
+        self.store = store or store_from_env()
+        self.batch = batch
+        self.user_limit = parse_rate(user_limit) if user_limit else None
+        self.tenant_limit = parse_rate(tenant_limit) if tenant_limit else None
+        self.identify = identify
+        self.local_keys = local_keys
+        # key -> [leased tokens, denied until]
+        self._local: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> list:
+        state = self._local.get(key)
+        if state is None:
+            state = self._local[key] = [0, 0.0]
+            while len(self._local) > self.local_keys:
+                self._local.popitem(last=False)
+        else:
+            self._local.move_to_end(key)
+        return state
+
+    def _spend_leased(
+        self, key: str, now: float, tokens: int = 1
+    ) -> Tuple[bool, float | None, int]:
+        """Answer from the local lease.
+
+        Returns ``(False, None, leased)`` when the store must be asked.
+        """
+        with self._lock:
+            state = self._state(key)
+            if state[0] >= tokens:
+                state[0] -= tokens
+                return True, None, 0
+            if state[1] > now:
+                return True, state[1] - now, 0
+            return False, None, state[0]
+
+    def _lease(self, capacity: int, tokens: int = 1, leased: int = 0) -> int:
+        return max(1, min(self.batch, capacity // 10), tokens - leased)
+
+    def _settle(
+        self,
+        key: str,
+        now: float,
+        capacity: int,
+        period: float,
+        granted: int,
+        left: float,
+        tokens: int = 1,
+    ) -> float | None:
+        with self._lock:
+            state = self._state(key)
+            # tokens granted short of the cost stay leased for later calls
+            state[0] += granted
+            if state[0] >= tokens:
+                state[0] -= tokens
+                return None
+            wait = max(0.0, tokens - state[0] - left) * period / capacity
+            if tokens == 1:
+                state[1] = now + wait
+            return wait
+
+    def hit(
+        self, key: str, capacity: int, period: float, tokens: int = 1
+    ) -> float | None:
+        """Spend ``tokens`` of ``key``; return ``None`` or seconds to wait."""
+        if tokens <= 0:
+            return None
+        now = time.monotonic()
+        done, wait, leased = self._spend_leased(key, now, tokens)
+        if done:
+            return wait
+        granted, left = self.store.take(
+            key, self._lease(capacity, tokens, leased), capacity, period
+        )
+        return self._settle(key, now, capacity, period, granted, left, tokens)
+
+    async def ahit(
+        self, key: str, capacity: int, period: float, tokens: int = 1
+    ) -> float | None:
+        """Like :meth:`hit`, with store calls moved off the event loop."""
+        if tokens <= 0:
+            return None
+        now = time.monotonic()
+        done, wait, leased = self._spend_leased(key, now, tokens)
+        if done:
+            return wait
+        lease = self._lease(capacity, tokens, leased)
+        if isinstance(self.store, MemoryBucketStore):
+            granted, left = self.store.take(key, lease, capacity, period)
+        else:
+            granted, left = await anyio.to_thread.run_sync(
+                self.store.take, key, lease, capacity, period
+            )
+        return self._settle(key, now, capacity, period, granted, left, tokens)
+
+    async def check(
+        self, request: Request, spec: str, scope: str, tokens: int = 1
+    ) -> None:
+        ip = request.client.host if request.client else "unknown"
+        checks = [(f"{scope}:ip:{ip}", parse_rate(spec))]
+        user, tenant = self.identify(request)
+        if user and self.user_limit:
+            checks.append((f"user:{user}", self.user_limit))
+        if tenant and self.tenant_limit:
+            checks.append((f"tenant:{tenant}", self.tenant_limit))
+        for key, (capacity, period) in checks:
+            wait = await self.ahit(key, capacity, period, tokens)
+            if wait is not None:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Rate limit exceeded",
+                    headers={"Retry-After": str(max(1, math.ceil(wait)))},
+                )
+
+    def limit(
+        self,
+        spec: str,
+        scope: str | None = None,
+        cost: Callable[[Dict[str, Any]], int] | None = None,
+    ):
+        """Decorate an endpoint with the rate ``spec``, e.g. ``10/minute``.
+
+        ``cost`` maps the endpoint's keyword arguments to the number of
+        tokens a call spends; by default each call spends one.
+        """
+
+        def decorator(func):
+            sig = inspect.signature(func)
+            has_request = "request" in sig.parameters
+            name = scope or func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs["request"] if has_request else kwargs.pop("request")
+                tokens = cost(kwargs) if cost else 1
+                await self.check(request, spec, name, tokens)
+                result = func(*args, **kwargs)
+                return await result if inspect.isawaitable(result) else result
+
+            if not has_request:
+                request_param = inspect.Parameter(
+                    "request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                )
+                wrapper.__signature__ = sig.replace(
+                    parameters=[*sig.parameters.values(), request_param]
+                )
+            return wrapper
+
+        return decorator
+
+
+__all__ = [
+    "MemoryBucketStore",
+    "RateLimiter",
+    "RedisBucketStore",
+    "SQLiteBucketStore",
+    "client_identity",
+    "header_identity",
+    "parse_rate",
+    "store_from_env",
+]
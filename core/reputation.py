@@ -1,14 +1,32 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
-from dataclasses import asdict, dataclass
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from .agent_profile import AgentIdentity
+from .utils.imports import optional_import
+
+fcntl = optional_import("fcntl")
+logger = logging.getLogger(__name__)
 
 RATING_DIR = Path(os.getenv("RATING_DIR", "ratings"))
+REPUTATION_WINDOW = int(os.getenv("REPUTATION_WINDOW", "100"))
+REPUTATION_DECAY = float(os.getenv("REPUTATION_DECAY", "0.99"))
+REPUTATION_COMPACT_AT = int(os.getenv("REPUTATION_COMPACT_AT", "10000"))
+REPUTATION_KEEP = int(os.getenv("REPUTATION_KEEP", "1000"))
+FEEDBACK_LOG_SIZE = 10
+
+# without fcntl the ledger lock only covers threads of this process
+_LOCAL_LOCK = threading.RLock()
+_COMPACTIONS: Dict[str, threading.Thread] = {}
+_COMPACTIONS_LOCK = threading.Lock()
 
 
 @dataclass
@@ -22,42 +40,250 @@ class AgentRating:
     created_at: str
 
 
-def save_rating(rating: AgentRating) -> None:
-    """Append ``rating`` to ``ratings/{to_agent}.jsonl``."""
-    RATING_DIR.mkdir(parents=True, exist_ok=True)
-    path = RATING_DIR / f"{rating.to_agent}.jsonl"
-    with open(path, "a", encoding="utf-8") as fh:
-        fh.write(json.dumps(asdict(rating)) + "\n")
+@dataclass
+class RatingSummary:
+    """Materialized aggregate of an agent's ratings ledger.
 
+    ``ledger_lines`` counts the records in the ledger file and triggers
+    compaction once it exceeds ``REPUTATION_COMPACT_AT``.
+    """
 
-def load_ratings(agent_id: str) -> List[AgentRating]:
-    """Return all ratings for ``agent_id``."""
+    count: int = 0
+    total: float = 0.0
+    decayed_sum: float = 0.0
+    decayed_weight: float = 0.0
+    window: List[float] = field(default_factory=list)
+    recent: List[Dict[str, Any]] = field(default_factory=list)
+    ledger_lines: int = 0
+    updated_at: str | None = None
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def window_mean(self) -> float:
+        return sum(self.window) / len(self.window) if self.window else 0.0
+
+    @property
+    def decayed_mean(self) -> float:
+        return self.decayed_sum / self.decayed_weight if self.decayed_weight else 0.0
+
+    def add(self, rating: AgentRating) -> None:
+        self.count += 1
+        self.total += rating.rating
+        self.decayed_sum = self.decayed_sum * REPUTATION_DECAY + rating.rating
+        self.decayed_weight = self.decayed_weight * REPUTATION_DECAY + 1.0
+        self.window = (self.window + [rating.rating])[-REPUTATION_WINDOW:]
+        self.recent = (self.recent + [asdict(rating)])[-FEEDBACK_LOG_SIZE:]
+
+    def add_record(self, data: Dict[str, Any]) -> None:
+        """Fold one ledger record, a rating or a compacted summary, into the aggregate."""
+        self.ledger_lines += 1
+        if not data.get("summary"):
+            self.add(AgentRating(**data))
+            return
+        count = int(data["count"])
+        factor = REPUTATION_DECAY**count
+        self.count += count
+        self.total += float(data["sum"])
+        self.decayed_sum = self.decayed_sum * factor + float(data["decayed_sum"])
+        self.decayed_weight = self.decayed_weight * factor + float(
+            data["decayed_weight"]
+        )
+        self.window = (self.window + list(data.get("window", [])))[-REPUTATION_WINDOW:]
+
+
+def _ledger_path(agent_id: str) -> Path:
+    return RATING_DIR / f"{agent_id}.jsonl"
+
+
+def _summary_path(agent_id: str) -> Path:
+    return RATING_DIR / f"{agent_id}.summary.json"
+
+
+@contextmanager
+def _locked(agent_id: str) -> Iterator[None]:
+    """Serialize ledger and summary updates of ``agent_id`` across processes."""
     RATING_DIR.mkdir(parents=True, exist_ok=True)
-    path = RATING_DIR / f"{agent_id}.jsonl"
-    ratings: List[AgentRating] = []
+    if fcntl is None:
+        with _LOCAL_LOCK:
+            yield
+        return
+    with open(RATING_DIR / f"{agent_id}.lock", "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _read_ledger(agent_id: str) -> List[Dict[str, Any]]:
+    path = _ledger_path(agent_id)
+    records: List[Dict[str, Any]] = []
     if path.exists():
         with open(path, "r", encoding="utf-8") as fh:
             for line in fh:
-                if not line.strip():
-                    continue
-                data = json.loads(line)
-                ratings.append(AgentRating(**data))
-    return ratings
+                if line.strip():
+                    records.append(json.loads(line))
+    return records
+
+
+def _save_summary(agent_id: str, summary: RatingSummary) -> None:
+    summary.updated_at = datetime.utcnow().isoformat()
+    path = _summary_path(agent_id)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(asdict(summary), fh)
+    # readers do not take the lock, so never expose a partly written file
+    os.replace(tmp, path)
+
+
+def _read_summary(agent_id: str) -> Optional[RatingSummary]:
+    path = _summary_path(agent_id)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as fh:
+        return RatingSummary(**json.load(fh))
+
+
+def _rebuild(agent_id: str) -> RatingSummary:
+    summary = RatingSummary()
+    for data in _read_ledger(agent_id):
+        summary.add_record(data)
+    _save_summary(agent_id, summary)
+    return summary
+
+
+def _current_summary(agent_id: str) -> RatingSummary:
+    """Return the aggregate of ``agent_id``; the caller holds its lock."""
+    summary = _read_summary(agent_id)
+    if summary is not None:
+        return summary
+    if not _ledger_path(agent_id).exists():
+        return RatingSummary()
+    return _rebuild(agent_id)
+
+
+def rebuild_summary(agent_id: str) -> RatingSummary:
+    """Recompute and persist the aggregate of ``agent_id`` from its ledger."""
+    with _locked(agent_id):
+        return _rebuild(agent_id)
+
+
+def load_summary(agent_id: str) -> RatingSummary:
+    """Return the materialized aggregate, rebuilding it if missing."""
+    summary = _read_summary(agent_id)
+    if summary is not None:
+        return summary
+    with _locked(agent_id):
+        return _current_summary(agent_id)
+
+
+def compact_ratings(agent_id: str, keep: int | None = None) -> int:
+    """Collapse all but the newest ``keep`` ratings into one summary record.
+
+    Returns the number of ratings that were folded into the summary.
+    """
+    keep = REPUTATION_KEEP if keep is None else keep
+    with _locked(agent_id):
+        return _compact(agent_id, keep)
+
+
+def _compact(agent_id: str, keep: int) -> int:
+    records = _read_ledger(agent_id)
+    old, new = (records[:-keep], records[-keep:]) if keep else (records, [])
+    if len(old) <= 1:
+        return 0
+    folded = RatingSummary()
+    until = None
+    for data in old:
+        folded.add_record(data)
+        until = data.get("until", data.get("created_at", until))
+    record = {
+        "summary": True,
+        "count": folded.count,
+        "sum": folded.total,
+        "decayed_sum": folded.decayed_sum,
+        "decayed_weight": folded.decayed_weight,
+        "window": folded.window,
+        "until": until,
+    }
+    path = _ledger_path(agent_id)
+    tmp = path.with_suffix(".jsonl.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        for data in [record] + new:
+            fh.write(json.dumps(data) + "\n")
+    os.replace(tmp, path)
+    summary = _current_summary(agent_id)
+    summary.ledger_lines = 1 + len(new)
+    _save_summary(agent_id, summary)
+    return len(old)
+
+
+def _schedule_compaction(agent_id: str) -> Optional[threading.Thread]:
+    """Compact ``agent_id`` in a background thread unless one is running."""
+
+    def run() -> None:
+        try:
+            compact_ratings(agent_id)
+        except Exception:  # pragma: no cover - disk errors
+            logger.exception("compacting ratings of %s failed", agent_id)
+
+    with _COMPACTIONS_LOCK:
+        running = _COMPACTIONS.get(agent_id)
+        if running is not None and running.is_alive():
+            return None
+        thread = threading.Thread(
+            target=run, name=f"compact-ratings-{agent_id}", daemon=True
+        )
+        _COMPACTIONS[agent_id] = thread
+        thread.start()
+        return thread
+
+
+def save_rating(rating: AgentRating) -> None:
+    """Append ``rating`` to ``ratings/{to_agent}.jsonl`` and update its aggregate.
+
+    Once the ledger exceeds ``REPUTATION_COMPACT_AT`` lines it is compacted
+    in a background thread; the caller does not wait for it.
+    """
+    with _locked(rating.to_agent):
+        summary = _current_summary(rating.to_agent)
+        with open(_ledger_path(rating.to_agent), "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(asdict(rating)) + "\n")
+        summary.add(rating)
+        summary.ledger_lines += 1
+        _save_summary(rating.to_agent, summary)
+    if REPUTATION_COMPACT_AT and summary.ledger_lines > REPUTATION_COMPACT_AT:
+        _schedule_compaction(rating.to_agent)
+
+
+def load_ratings(agent_id: str) -> List[AgentRating]:
+    """Return the individual ratings still kept in the ledger of ``agent_id``.
+
+    Ratings folded by compaction survive only in the aggregate; use
+    :func:`load_summary` for counts and means over the full history.
+    """
+    RATING_DIR.mkdir(parents=True, exist_ok=True)
+    return [
+        AgentRating(**data)
+        for data in _read_ledger(agent_id)
+        if not data.get("summary")
+    ]
 
 
 def aggregate_score(agent_id: str) -> float:
-    """Calculate mean rating for ``agent_id``."""
-    ratings = load_ratings(agent_id)
-    if not ratings:
-        return 0.0
-    return sum(r.rating for r in ratings) / len(ratings)
+    """Return the mean rating for ``agent_id``."""
+    return load_summary(agent_id).mean
 
 
 def update_reputation(agent_id: str) -> float:
     """Update profile reputation info and return the new score."""
-    score = round(aggregate_score(agent_id), 3)
+    summary = load_summary(agent_id)
+    score = round(summary.mean, 3)
     profile = AgentIdentity.load(agent_id)
     profile.reputation_score = score
-    profile.feedback_log = [asdict(r) for r in load_ratings(agent_id)[-10:]]
+    profile.feedback_log = list(summary.recent)
     profile.save()
     return score
@@ -23,6 +23,11 @@ class BaseSessionStore(ABC):
     def update_context(self, session_id: str, ctx: Dict) -> None:
         """Persist a ModelContext dict for the session."""
 
+    def last_context(self, session_id: str) -> Dict | None:
+        """Return the most recent ModelContext dict of the session."""
+        contexts = self.get_context(session_id)
+        return contexts[-1] if contexts else None
+
 
 class InMemorySessionStore(BaseSessionStore):
     """Simple in-memory session store."""
@@ -38,6 +43,10 @@ class InMemorySessionStore(BaseSessionStore):
     def get_context(self, session_id: str) -> List[Dict]:
         return list(self._data.get(session_id, []))
 
+    def last_context(self, session_id: str) -> Dict | None:
+        contexts = self._data.get(session_id)
+        return contexts[-1] if contexts else None
+
     def update_context(self, session_id: str, ctx: Dict) -> None:
         self._data.setdefault(session_id, []).append(ctx)
 
@@ -65,6 +74,10 @@ class FileSessionStore(BaseSessionStore):
     def _file(self, sid: str) -> str:
         return os.path.join(self.base_path, f"{sid}.json")
 
+    def session_path(self, sid: str) -> str:
+        """Return the JSON file holding the contexts of session ``sid``."""
+        return self._file(sid)
+
     def _cleanup(self) -> None:
         """Remove session files older than the TTL."""
         if not self.ttl:
@@ -106,6 +119,12 @@ class FileSessionStore(BaseSessionStore):
         data.append(ctx)
         self._write(session_id, data)
 
+    def last_context(self, session_id: str) -> Dict | None:
+        if session_id not in self._cache:
+            self.get_context(session_id)
+        contexts = self._cache.get(session_id)
+        return contexts[-1] if contexts else None
+
 
 class NoOpSessionStore(BaseSessionStore):
     """Ignore all session operations."""
@@ -0,0 +1,67 @@
+"""Helpers for server-sent event (SSE) and NDJSON streams."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Return a single SSE frame for ``event`` carrying ``data``.
+
+    Strings are sent verbatim, everything else is JSON encoded.
+    """
+    payload = data if isinstance(data, str) else json.dumps(data)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def parse_sse(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Yield ``(event, data)`` pairs from an iterable of SSE lines."""
+    event = "message"
+    data: list[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+    if data:
+        yield event, "\n".join(data)
+
+
+async def aparse_sse(lines: AsyncIterable[str]) -> AsyncIterator[tuple[str, str]]:
+    """Async variant of :func:`parse_sse`."""
+    event = "message"
+    data: list[str] = []
+    async for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+    if data:
+        yield event, "\n".join(data)
+
+
+def ndjson_line(data: Any) -> str:
+    """Return ``data`` as one newline-terminated JSON line."""
+    return json.dumps(data, default=str) + "\n"
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Any]:
+    """Yield decoded objects from an iterable of NDJSON lines."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
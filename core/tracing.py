@@ -0,0 +1,493 @@
+"""Lightweight distributed tracing with W3C ``traceparent`` propagation.
+
+Spans are recorded per service and exported as OTLP/JSON, either to
+``TRACE_DIR/<service>.jsonl`` or, when ``OTEL_EXPORTER_OTLP_ENDPOINT`` is
+set, to an OTLP/HTTP collector. Tracing is opt-in via ``TRACING_ENABLED``.
+Outgoing requests of clients wrapped with :func:`traced` carry the current
+span as ``traceparent`` header.
+"""
+
+from __future__ import annotations
+
+import abc
+import atexit
+import json
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACE_DIR = Path(os.getenv("TRACE_DIR", "traces"))
+TRACE_FILE_MAX_BYTES = int(os.getenv("TRACE_FILE_MAX_BYTES", str(50 * 1024 * 1024)))
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "1.0"))
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    service: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str | None = None
+    kind: str = "internal"
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: bool = False
+
+    @property
+    def duration(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e9
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("agentnn_span", default=None)
+_service: str = os.getenv("SERVICE_NAME", "agentnn")
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str] | None:
+    """Return ``(trace_id, parent_span_id)`` from a ``traceparent`` header."""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if not match or set(match.group(1)) == {"0"}:
+        return None
+    return match.group(1), match.group(2)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach ``key`` to the active span, if any."""
+    span = _current.get()
+    if span is not None:
+        span.attributes[key] = value
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: str = "internal",
+    traceparent: str | None = None,
+    attributes: Dict[str, Any] | None = None,
+    service: str | None = None,
+) -> Iterator[Span]:
+    """Run the enclosed block as a span, child of the active span.
+
+    ``traceparent`` continues a remote trace instead.
+    """
+    parent = _current.get()
+    remote = parse_traceparent(traceparent)
+    if remote:
+        trace_id, parent_id = remote
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+    span = Span(
+        name=name,
+        service=service or (parent.service if parent else _service),
+        trace_id=trace_id,
+        parent_id=parent_id,
+        kind=kind,
+        attributes=dict(attributes or {}),
+    )
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException:
+        span.error = True
+        raise
+    finally:
+        _current.reset(token)
+        _finish(span)
+
+
+def _finish(span: Span) -> None:
+    span.end_ns = time.time_ns()
+    if TRACING_ENABLED:
+        exporter().submit(span)
+
+
+def inject_headers(headers: Dict[str, str] | None = None) -> Dict[str, str]:
+    """Return ``headers`` with the active span's ``traceparent`` added."""
+    headers = dict(headers or {})
+    span = _current.get()
+    if span is not None:
+        headers.setdefault("traceparent", span.traceparent())
+    return headers
+
+
+# -- OTLP/JSON encoding ----------------------------------------------------
+_KIND = {"internal": 1, "server": 2, "client": 3}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: Iterable[Span]) -> Dict[str, Any]:
+    """Encode ``spans`` as an OTLP ``ExportTraceServiceRequest``."""
+    by_service: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        item = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _KIND.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()
+            ],
+            "status": {"code": 2 if span.error else 1},
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        by_service.setdefault(span.service, []).append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": name}}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "agentnn"}, "spans": items}],
+            }
+            for name, items in by_service.items()
+        ]
+    }
+
+
+def from_otlp(data: Dict[str, Any]) -> List[Span]:
+    """Decode an OTLP ``ExportTraceServiceRequest`` into spans."""
+    kinds = {v: k for k, v in _KIND.items()}
+    spans: List[Span] = []
+    for resource in data.get("resourceSpans", []):
+        service = "unknown"
+        for attr in resource.get("resource", {}).get("attributes", []):
+            if attr.get("key") == "service.name":
+                service = attr["value"].get("stringValue", service)
+        for scope in resource.get("scopeSpans", []):
+            for item in scope.get("spans", []):
+                attributes = {
+                    a["key"]: next(iter(a["value"].values()), None)
+                    for a in item.get("attributes", [])
+                }
+                spans.append(
+                    Span(
+                        name=item["name"],
+                        service=service,
+                        trace_id=item["traceId"],
+                        span_id=item["spanId"],
+                        parent_id=item.get("parentSpanId"),
+                        kind=kinds.get(item.get("kind", 1), "internal"),
+                        start_ns=int(item["startTimeUnixNano"]),
+                        end_ns=int(item["endTimeUnixNano"]),
+                        attributes=attributes,
+                        error=item.get("status", {}).get("code") == 2,
+                    )
+                )
+    return spans
+
+
+# -- exporters -------------------------------------------------------------
+class SpanExporter(abc.ABC):
+    """Buffer finished spans and export them in batches from a thread."""
+
+    max_batch = 512
+
+    def __init__(self, interval: float = TRACE_FLUSH_INTERVAL) -> None:
+        self.interval = interval
+        self._queue: "queue.Queue[Span]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, span: Span) -> None:
+        self._queue.put(span)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="span-exporter", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self) -> None:
+        """Export all buffered spans now."""
+        with self._lock:
+            while True:
+                batch: List[Span] = []
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                try:
+                    self.export(batch)
+                except Exception:  # pragma: no cover - exporting is best effort
+                    pass
+
+    @abc.abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Send one batch of finished spans."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Append OTLP/JSON batches to ``<directory>/<service>.jsonl``.
+
+    A file larger than ``max_bytes`` is moved to ``<service>.jsonl.1``,
+    replacing the previous one, so each service keeps at most two files.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TRACE_DIR,
+        max_bytes: int = TRACE_FILE_MAX_BYTES,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def export(self, spans: List[Span]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        by_service: Dict[str, List[Span]] = {}
+        for span in spans:
+            by_service.setdefault(span.service, []).append(span)
+        for service, items in by_service.items():
+            path = self.directory / f"{service}.jsonl"
+            if path.exists() and path.stat().st_size >= self.max_bytes:
+                path.replace(path.with_name(path.name + ".1"))
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(to_otlp(items)) + "\n")
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """Send OTLP/JSON batches to ``<endpoint>/v1/traces``."""
+
+    def __init__(self, endpoint: str = OTLP_ENDPOINT, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+
+    def export(self, spans: List[Span]) -> None:
+        with _suppressed():
+            with httpx.Client() as client:
+                client.post(self.url, json=to_otlp(spans), timeout=5)
+
+
+class NoOpSpanExporter(SpanExporter):
+    def submit(self, span: Span) -> None:
+        pass
+
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+
+_exporter: SpanExporter | None = None
+
+
+def exporter() -> SpanExporter:
+    """Return the process-wide exporter selected by the environment."""
+    global _exporter
+    if _exporter is None:
+        kind = TRACE_EXPORTER or ("otlp" if OTLP_ENDPOINT else "file")
+        if kind == "otlp":
+            _exporter = OTLPHttpSpanExporter()
+        elif kind == "none":
+            _exporter = NoOpSpanExporter()
+        else:
+            _exporter = FileSpanExporter()
+        atexit.register(_exporter.flush)
+    return _exporter
+
+
+def set_exporter(value: SpanExporter | None) -> None:
+    global _exporter
+    _exporter = value
+
+
+# -- httpx instrumentation -------------------------------------------------
+_suppress: ContextVar[bool] = ContextVar("agentnn_trace_suppress", default=False)
+
+
+@contextmanager
+def _suppressed() -> Iterator[None]:
+    token = _suppress.set(True)
+    try:
+        yield
+    finally:
+        _suppress.reset(token)
+
+
+def _on_request(request: httpx.Request) -> None:
+    parent = _current.get()
+    if _suppress.get() or parent is None:
+        return
+    span = Span(
+        name=f"HTTP {request.method}",
+        service=parent.service,
+        trace_id=parent.trace_id,
+        parent_id=parent.span_id,
+        kind="client",
+        attributes={"http.method": request.method, "http.url": str(request.url)},
+    )
+    request.headers["traceparent"] = span.traceparent()
+    request.extensions["agentnn_span"] = span
+
+
+def _on_response(response: httpx.Response) -> None:
+    span = response.request.extensions.get("agentnn_span")
+    if span is None:
+        return
+    span.attributes["http.status_code"] = response.status_code
+    span.error = response.status_code >= 500
+    _finish(span)
+
+
+async def _on_request_async(request: httpx.Request) -> None:
+    _on_request(request)
+
+
+async def _on_response_async(response: httpx.Response) -> None:
+    _on_response(response)
+
+
+def traced(client: Any) -> Any:
+    """Add client spans and ``traceparent`` propagation to an httpx client.
+
+    Only ``client`` is affected; requests sent outside a span are left
+    untouched. Returns ``client`` unchanged while tracing is disabled.
+    """
+    if not TRACING_ENABLED:
+        return client
+    if isinstance(client, httpx.AsyncClient):
+        on_request, on_response = _on_request_async, _on_response_async
+    else:
+        on_request, on_response = _on_request, _on_response
+    hooks = getattr(client, "event_hooks", None) or {}
+    client.event_hooks = {
+        "request": [*hooks.get("request", []), on_request],
+        "response": [*hooks.get("response", []), on_response],
+    }
+    return client
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """Continue incoming traces and record a server span per request.
+
+    Requests pass through untouched while tracing is disabled.
+    """
+
+    def __init__(self, app, service: str):
+        super().__init__(app)
+        global _service
+        self.service = service
+        _service = service
+
+    async def dispatch(self, request: Request, call_next):
+        if not TRACING_ENABLED:
+            return await call_next(request)
+        attributes = {"http.method": request.method}
+        context_id = request.headers.get("x-context-id")
+        if context_id:
+            attributes["context_id"] = context_id
+        with start_span(
+            f"{request.method} {request.url.path}",
+            kind="server",
+            traceparent=request.headers.get("traceparent"),
+            attributes=attributes,
+            service=self.service,
+        ) as span:
+            response = await call_next(request)
+            route = getattr(request.scope.get("route"), "path", None)
+            if route:
+                span.name = f"{request.method} {route}"
+            span.attributes["http.status_code"] = response.status_code
+            span.error = response.status_code >= 500
+            response.headers["traceparent"] = span.traceparent()
+            return response
+
+
+# -- analysis --------------------------------------------------------------
+def load_spans(directory: Path = TRACE_DIR) -> List[Span]:
+    """Read all spans exported by :class:`FileSpanExporter`.
+
+    Rotated ``<service>.jsonl.1`` files are read before the current ones.
+    """
+    directory = Path(directory)
+    paths = sorted(directory.glob("*.jsonl.1")) + sorted(directory.glob("*.jsonl"))
+    spans: List[Span] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    spans.extend(from_otlp(json.loads(line)))
+    return spans
+
+
+def spans_for_context(spans: Iterable[Span], context_id: str) -> List[Span]:
+    """Return every span of the traces that touched ``context_id``."""
+    spans = list(spans)
+    traces = {s.trace_id for s in spans if s.attributes.get("context_id") == context_id}
+    return [s for s in spans if s.trace_id in traces]
+
+
+def critical_path(spans: Iterable[Span]) -> List[tuple[int, Span]]:
+    """Return ``(depth, span)`` pairs along the critical path of each trace.
+
+    From every root the path follows the child that finished last, since
+    that child determined when its parent could complete.
+    """
+    spans = list(spans)
+    ids = {s.span_id for s in spans}
+    children: Dict[str | None, List[Span]] = {}
+    for span in spans:
+        parent = span.parent_id if span.parent_id in ids else None
+        children.setdefault(parent, []).append(span)
+    path: List[tuple[int, Span]] = []
+    for root in sorted(children.get(None, []), key=lambda s: s.start_ns):
+        node, depth = root, 0
+        while node is not None:
+            path.append((depth, node))
+            kids = children.get(node.span_id)
+            node = max(kids, key=lambda s: s.end_ns or 0) if kids else None
+            depth += 1
+    return path
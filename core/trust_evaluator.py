@@ -1,65 +1,226 @@
 from __future__ import annotations
 
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
+from . import governance
 from .agent_profile import AgentIdentity
 from .audit_log import AuditEntry, AuditLog
 from .governance import AgentContract
 from .roles import resolve_roles
 from .reputation import aggregate_score
+from .utils.imports import optional_import
 
+fcntl = optional_import("fcntl")
 
-def calculate_trust(agent_id: str, context: List[Dict[str, Any]]) -> float:
-    """Return trust score between 0.0 and 1.0 based on past context."""
-    if not context:
-        return 0.0
+TRUST_DECAY = float(os.getenv("TRUST_DECAY", "1.0"))
+# task results kept per contract; the aggregate covers all of them
+TRUST_HISTORY_LIMIT = int(os.getenv("TRUST_HISTORY_LIMIT", "200"))
 
-    success = 0
-    total = 0
-    feedback_sum = 0.0
-    efficiency_sum = 0.0
-    reliability_sum = 0.0
+# without fcntl the contract lock only covers threads of this process
+_LOCAL_LOCK = threading.RLock()
 
-    for entry in context:
-        if entry.get("agent_id") != agent_id:
-            continue
-        total += 1
+
+@contextmanager
+def _locked(agent_id: str) -> Iterator[None]:
+    """Serialize contract read-modify-writes of ``agent_id`` across processes."""
+    governance.CONTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        with _LOCAL_LOCK:
+            yield
+        return
+    with open(governance.CONTRACT_DIR / f"{agent_id}.lock", "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+@dataclass
+class TrustAggregate:
+    """Running sums behind an agent's trust score.
+
+    ``decay`` below ``1.0`` weights older results down each time a new
+    result is added; ``total`` always counts raw results.
+    """
+
+    count: float = 0.0
+    success: float = 0.0
+    feedback_sum: float = 0.0
+    efficiency_sum: float = 0.0
+    reliability_sum: float = 0.0
+    total: int = 0
+    updated_at: str | None = None
+
+    def add(self, entry: Dict[str, Any], decay: float = 1.0) -> None:
+        """Fold one task result into the aggregate in O(1)."""
+        if decay != 1.0:
+            self.count *= decay
+            self.success *= decay
+            self.feedback_sum *= decay
+            self.efficiency_sum *= decay
+            self.reliability_sum *= decay
+        self.count += 1
+        self.total += 1
         if entry.get("success", True):
-            success += 1
-        feedback_sum += float(entry.get("feedback_score", 0.0))
+            self.success += 1
+        self.feedback_sum += float(entry.get("feedback_score", 0.0))
         tokens_used = float(entry.get("metrics", {}).get("tokens_used", 1))
         expected = float(entry.get("expected_tokens", tokens_used))
-        efficiency_sum += expected / tokens_used if tokens_used else 1.0
-        reliability_sum += 1.0 if not entry.get("error") else 0.0
+        self.efficiency_sum += expected / tokens_used if tokens_used else 1.0
+        self.reliability_sum += 1.0 if not entry.get("error") else 0.0
+
+    def score(self) -> float:
+        if not self.count:
+            return 0.0
+        success_rate = self.success / self.count
+        feedback_score = self.feedback_sum / self.count
+        token_efficiency = self.efficiency_sum / self.count
+        reliability = self.reliability_sum / self.count
+        trust = (success_rate + feedback_score + token_efficiency + reliability) / 4
+        return max(0.0, min(1.0, trust))
+
+
+def aggregate_history(
+    context: Iterable[Dict[str, Any]], decay: float = 1.0
+) -> Dict[str, TrustAggregate]:
+    """Build aggregates for every agent in ``context`` in a single pass."""
+    result: Dict[str, TrustAggregate] = {}
+    for entry in context:
+        agent_id = entry.get("agent_id")
+        if agent_id is None:
+            continue
+        result.setdefault(agent_id, TrustAggregate()).add(entry, decay)
+    return result
+
 
-    if total == 0:
+def calculate_trust(agent_id: str, context: List[Dict[str, Any]]) -> float:
+    """Return trust score between 0.0 and 1.0 based on past context."""
+    if not context:
         return 0.0
+    agg = TrustAggregate()
+    for entry in context:
+        if entry.get("agent_id") == agent_id:
+            agg.add(entry)
+    return agg.score()
+
+
+def load_trust_aggregate(
+    agent_id: str, contract: AgentContract | None = None
+) -> TrustAggregate:
+    """Return the stored aggregate for ``agent_id``.
+
+    Contracts without an aggregate are backfilled from their
+    ``task_history`` once; the result is saved with the contract.
+    """
+    if contract is None:
+        contract = AgentContract.load(agent_id)
+        if contract.constraints.get("trust_aggregate") is None:
+            with _locked(agent_id):
+                return _backfill(agent_id, AgentContract.load(agent_id))
+    return _backfill(agent_id, contract)
+
+
+def _backfill(agent_id: str, contract: AgentContract) -> TrustAggregate:
+    stored = contract.constraints.get("trust_aggregate")
+    if stored is not None:
+        return TrustAggregate(**stored)
+    history = contract.constraints.get("task_history", [])
+    agg = TrustAggregate()
+    for entry in history:
+        if entry.get("agent_id") == agent_id:
+            agg.add(entry)
+    if history:
+        agg.updated_at = datetime.utcnow().isoformat()
+        contract.constraints["trust_aggregate"] = asdict(agg)
+        contract.save()
+    return agg
+
+
+def trust_score(agent_id: str, contract: AgentContract | None = None) -> float:
+    """Return the current trust score of ``agent_id`` without scanning history."""
+    return load_trust_aggregate(agent_id, contract).score()
 
-    success_rate = success / total
-    feedback_score = feedback_sum / total
-    token_efficiency = efficiency_sum / total
-    reliability = reliability_sum / total
-    trust = (success_rate + feedback_score + token_efficiency + reliability) / 4
-    return max(0.0, min(1.0, trust))
+
+def record_task_result(
+    agent_id: str,
+    entry: Dict[str, Any],
+    decay: float | None = None,
+    token_limit: int | None = None,
+) -> TrustAggregate:
+    """Append ``entry`` to the task history and update the aggregate in O(1).
+
+    Only the last ``TRUST_HISTORY_LIMIT`` entries are kept. With
+    ``token_limit`` the token usage adjustment of :func:`update_trust_usage`
+    is applied in the same contract write, under a per-agent lock.
+    """
+    with _locked(agent_id):
+        contract = AgentContract.load(agent_id)
+        agg = _backfill(agent_id, contract)
+        agg.add(entry, TRUST_DECAY if decay is None else decay)
+        agg.updated_at = datetime.utcnow().isoformat()
+        history = contract.constraints.setdefault("task_history", [])
+        history.append(entry)
+        if len(history) > TRUST_HISTORY_LIMIT:
+            del history[:-TRUST_HISTORY_LIMIT]
+        contract.constraints["trust_aggregate"] = asdict(agg)
+        if token_limit is not None:
+            tokens_used = int(entry.get("metrics", {}).get("tokens_used", 0))
+            _apply_token_usage(contract, tokens_used, token_limit)
+        contract.save()
+    return agg
+
+
+def rebuild_trust_aggregates(
+    agents: Iterable[str] | None = None, decay: float | None = None
+) -> Dict[str, float]:
+    """Recompute stored aggregates from each contract's ``task_history``.
+
+    Only the retained history is replayed, see ``TRUST_HISTORY_LIMIT``.
+    """
+    if agents is None:
+        agents = [p.stem for p in governance.CONTRACT_DIR.glob("*.json")]
+    scores: Dict[str, float] = {}
+    for agent_id in agents:
+        with _locked(agent_id):
+            contract = AgentContract.load(agent_id)
+            agg = TrustAggregate()
+            for entry in contract.constraints.get("task_history", []):
+                if entry.get("agent_id") == agent_id:
+                    agg.add(entry, TRUST_DECAY if decay is None else decay)
+            agg.updated_at = datetime.utcnow().isoformat()
+            contract.constraints["trust_aggregate"] = asdict(agg)
+            contract.save()
+        scores[agent_id] = agg.score()
+    return scores
 
 
 def eligible_for_role(agent_id: str, target_role: str) -> bool:
     """Return True if the agent qualifies for ``target_role``."""
 
     contract = AgentContract.load(agent_id)
-    history = contract.constraints.get("task_history", [])
-    trust = calculate_trust(agent_id, history)
+    agg = load_trust_aggregate(agent_id, contract)
     standing = float(contract.constraints.get("standing", 1.0))
     if target_role in resolve_roles(agent_id):
         return False
-    score = trust * standing
-    return score >= contract.trust_level_required and len(history) >= 5
+    score = agg.score() * standing
+    return score >= contract.trust_level_required and agg.total >= 5
 
 
 def update_trust_usage(agent_id: str, tokens_used: int, limit: int) -> None:
     """Adjust trust_score based on token usage."""
-    contract = AgentContract.load(agent_id)
+    with _locked(agent_id):
+        contract = AgentContract.load(agent_id)
+        _apply_token_usage(contract, tokens_used, limit)
+        contract.save()
+
+
+def _apply_token_usage(contract: AgentContract, tokens_used: int, limit: int) -> None:
     score = float(contract.constraints.get("trust_score", 1.0))
     ratio = tokens_used / limit if limit else 0.0
     if ratio and ratio <= 0.8:
@@ -69,7 +230,6 @@ def update_trust_usage(agent_id: str, tokens_used: int, limit: int) -> None:
         if score < contract.trust_level_required and contract.allowed_roles:
             contract.allowed_roles = contract.allowed_roles[:1]
     contract.constraints["trust_score"] = score
-    contract.save()
 
 
 def auto_certify(agent_id: str, skill_id: str) -> bool:
@@ -80,8 +240,7 @@ def auto_certify(agent_id: str, skill_id: str) -> bool:
         return False
 
     contract = AgentContract.load(agent_id)
-    history = contract.constraints.get("task_history", [])
-    trust = calculate_trust(agent_id, history)
+    trust = trust_score(agent_id, contract)
     if trust < contract.trust_level_required:
         return False
 
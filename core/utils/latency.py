@@ -0,0 +1,46 @@
+"""Latency statistics shared by the benchmark harness and ``agentnn bench``."""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List
+
+PERCENTILE_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the ``q`` percentile (0-100) of ``values`` by nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def compare_summary(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.1
+) -> List[str]:
+    """Return regressions of the ``current`` summary against ``baseline``.
+
+    Both summaries carry ``p50_ms``, ``p95_ms``, ``p99_ms``, ``throughput``,
+    ``errors`` and ``requests``. Percentiles may grow and throughput may drop
+    by ``tolerance`` (relative); the error rate may grow by a tenth of it.
+    """
+    regressions: List[str] = []
+    for key in PERCENTILE_KEYS:
+        if baseline[key] and current[key] > baseline[key] * (1 + tolerance):
+            regressions.append(f"{key}: {baseline[key]} -> {current[key]}")
+    base_tp, cur_tp = baseline["throughput"], current["throughput"]
+    if base_tp and cur_tp < base_tp * (1 - tolerance):
+        regressions.append(f"throughput: {base_tp} -> {cur_tp}")
+    base_rate = _error_rate(baseline)
+    cur_rate = _error_rate(current)
+    if cur_rate > base_rate + tolerance / 10:
+        regressions.append(f"error_rate: {base_rate:.3f} -> {cur_rate:.3f}")
+    return regressions
+
+
+def _error_rate(summary: Dict[str, Any]) -> float:
+    return summary["errors"] / summary["requests"] if summary["requests"] else 0.0
+
+
+__all__ = ["PERCENTILE_KEYS", "percentile", "compare_summary"]
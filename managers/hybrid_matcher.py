@@ -69,35 +69,28 @@ class HybridMatcher(LoggerMixin):
             List[MatchResult]: Sorted list of match results
         """
         results = []
-        
-        # Get scores from meta-learner
-        agent_scores = self.meta_learner.score_agents(
-            task_embedding,
-            {name: data["features"] for name, data in available_agents.items()}
-        )
-        
-        # Calculate similarity scores
-        for agent_name, data in available_agents.items():
-            # Get agent embedding and features
-            agent_embedding = data["embedding"]
-            agent_features = data["features"]
-            
-            # Calculate similarity score
-            similarity = self._calculate_similarity(task_embedding, agent_embedding)
+        names = list(available_agents)
+        agent_scores: Dict[str, AgentScore] = {}
+        if names:
+            embeddings = torch.cat([available_agents[name]["embedding"] for name in names])
+            features = torch.cat([available_agents[name]["features"] for name in names])
             
-            # Get NN score from meta-learner results
-            nn_score = next(
-                (score.nn_score for score in agent_scores
-                 if score.agent_name == agent_name),
-                0.0
-            )
+            # Score all agents in one meta-learner pass
+            agent_scores = {
+                score.agent_name: score
+                for score in self.meta_learner.score_agents_batch(
+                    task_embedding, names, features, embeddings
+                )
+            }
+        
+        for agent_name in names:
+            score = agent_scores[agent_name]
+            similarity = score.embedding_score
+            nn_score = score.nn_score
+            historical = score.historical_performance
             
             # Calculate combined score
-            combined_score = self._combine_scores(
-                similarity,
-                nn_score,
-                agent_name
-            )
+            combined_score = self._weighted_score(similarity, nn_score, historical)
             
             # Calculate confidence based on score distribution
             confidence = self._calculate_confidence(
@@ -115,7 +108,7 @@ class HybridMatcher(LoggerMixin):
                 match_details={
                     "embedding_similarity": similarity,
                     "nn_score": nn_score,
-                    "historical_performance": self._get_historical_performance(agent_name)
+                    "historical_performance": historical
                 }
             ))
             
@@ -239,9 +232,26 @@ class HybridMatcher(LoggerMixin):
         Returns:
             float: Combined score
         """
-        # Get historical performance
-        historical = self._get_historical_performance(agent_name)
+        return self._weighted_score(
+            similarity,
+            nn_score,
+            self._get_historical_performance(agent_name)
+        )
+
+    def _weighted_score(self,
+                        similarity: float,
+                        nn_score: float,
+                        historical: Optional[float]) -> float:
+        """Weight similarity, NN score and historical performance.
         
+        Args:
+            similarity: Embedding similarity score
+            nn_score: Neural network score
+            historical: Historical performance score, if any
+            
+        Returns:
+            float: Combined score
+        """
         # Weights for different components
         w_similarity = 0.3
         w_nn = 0.4
@@ -104,49 +104,92 @@ class MetaLearner(nn.Module, LoggerMixin):
 
     def score_agents(self,
                     task_embedding: torch.Tensor,
-                    agents_features: Dict[str, torch.Tensor]) -> List[AgentScore]:
+                    agents_features: Dict[str, torch.Tensor],
+                    agents_embeddings: Optional[Dict[str, torch.Tensor]] = None) -> List[AgentScore]:
         """Score agents for a given task.
         
         Args:
             task_embedding: Task embedding tensor
             agents_features: Dictionary of agent name to features tensor
+            agents_embeddings: Optional dictionary of agent name to embedding
+                tensor, used for the similarity score instead of the
+                leading part of the features
             
         Returns:
             List[AgentScore]: Sorted list of agent scores
         """
-        scores = []
+        names = list(agents_features)
+        if not names:
+            return []
+            
+        embeddings = None
+        if agents_embeddings is not None:
+            embeddings = torch.cat([agents_embeddings[name] for name in names])
+            
+        scores = self.score_agents_batch(
+            task_embedding,
+            names,
+            torch.cat([agents_features[name] for name in names]),
+            embeddings
+        )
         
-        for agent_name, features in agents_features.items():
-            # Calculate embedding similarity score
-            embedding_score = self._calculate_embedding_similarity(
-                task_embedding,
-                features[:, :self.embedding_size]  # Use first part as embedding
-            )
+        # Sort by combined score
+        return sorted(scores, key=lambda x: x.combined_score, reverse=True)
+
+    def score_agents_batch(self,
+                           task_embedding: torch.Tensor,
+                           agent_names: List[str],
+                           agent_features: torch.Tensor,
+                           agent_embeddings: Optional[torch.Tensor] = None) -> List[AgentScore]:
+        """Score many agents with a single forward pass.
+        
+        Args:
+            task_embedding: Task embedding tensor of shape (1, embedding_size)
+            agent_names: Agent names, one per row of ``agent_features``
+            agent_features: Stacked agent features (num_agents, feature_size)
+            agent_embeddings: Optional stacked agent embeddings
+                (num_agents, embedding_size)
             
-            # Get NN score
-            with torch.no_grad():
-                nn_score = self(task_embedding, features).item()
-                
-            # Get historical performance
-            historical_score = self._get_historical_performance(agent_name)
+        Returns:
+            List[AgentScore]: Agent scores in the order of ``agent_names``
+        """
+        if len(agent_names) != agent_features.shape[0]:
+            raise ValueError("agent_names and agent_features differ in length")
+        if not agent_names:
+            return []
             
-            # Combine scores (weighted average)
-            combined_score = self._combine_scores(
-                embedding_score,
-                nn_score,
-                historical_score
-            )
+        if agent_embeddings is None:
+            agent_embeddings = agent_features[:, :self.embedding_size]  # Use first part as embedding
+            
+        with torch.no_grad():
+            embedding_scores = torch.cosine_similarity(
+                task_embedding,
+                agent_embeddings,
+                dim=1
+            ).tolist()
+            nn_scores = self(
+                task_embedding.expand(len(agent_names), -1),
+                agent_features
+            ).squeeze(1).tolist()
             
+        scores = []
+        for agent_name, embedding_score, nn_score in zip(
+            agent_names, embedding_scores, nn_scores
+        ):
+            historical_score = self._get_historical_performance(agent_name)
             scores.append(AgentScore(
                 agent_name=agent_name,
                 embedding_score=embedding_score,
                 nn_score=nn_score,
-                combined_score=combined_score,
+                combined_score=self._combine_scores(
+                    embedding_score,
+                    nn_score,
+                    historical_score
+                ),
                 historical_performance=historical_score
             ))
-        
-        # Sort by combined score
-        return sorted(scores, key=lambda x: x.combined_score, reverse=True)
+            
+        return scores
 
     def update_metrics(self, agent_name: str, metrics: TaskMetrics):
         """Update historical metrics for an agent.
@@ -8,6 +8,7 @@ import numpy as np
 from collections import deque
 import threading
 import queue
+import random
 import time
 from datetime import datetime
 import mlflow
@@ -63,6 +64,52 @@ class StreamingBuffer:
                     
             self.count += 1
             return added
+    
+    def add_batch(self, data: Dict[str, torch.Tensor]) -> int:
+        """Add a batch of samples using vectorized reservoir sampling.
+        
+        Equivalent to calling :meth:`add` for every row in order, but takes
+        the lock once and draws all reservoir slots in a single call.
+        
+        Args:
+            data: Data tensors by name, batch dimension first
+        
+        Returns:
+            int: Number of samples stored
+        """
+        sizes = {int(tensor.shape[0]) for tensor in data.values()}
+        if len(sizes) != 1:
+            raise ValueError("all tensors need the same batch size")
+        n = sizes.pop()
+        if n == 0:
+            return 0
+        
+        with self.lock:
+            # Stream position of every sample, 0-based
+            positions = self.count + np.arange(n)
+            slots = positions.copy()
+            full = positions >= self.capacity
+            if full.any():
+                slots[full] = np.random.randint(0, positions[full] + 1)
+            keep = slots < self.capacity
+            
+            # A later sample replacing the same slot wins, as with add()
+            rows = np.nonzero(keep)[0]
+            slots = slots[rows]
+            _, last = np.unique(slots[::-1], return_index=True)
+            rows = rows[::-1][last]
+            slots = slots[::-1][last]
+            
+            if len(rows):
+                slot_idx = torch.from_numpy(slots)
+                row_idx = torch.from_numpy(rows)
+                for name, tensor in data.items():
+                    self.buffers[name][slot_idx] = tensor[row_idx].to(
+                        self.buffers[name].dtype
+                    )
+            
+            self.count += n
+            return int(keep.sum())
             
     def get_batch(self,
                   batch_size: int) -> Optional[Dict[str, torch.Tensor]]:
@@ -78,9 +125,10 @@ class StreamingBuffer:
             if self.count == 0:
                 return None
                 
-            # Sample indices
-            size = min(batch_size, self.count)
-            indices = torch.randperm(min(self.count, self.capacity))[:size]
+            # Sample indices without permuting the whole buffer
+            filled = min(self.count, self.capacity)
+            size = min(batch_size, filled)
+            indices = torch.tensor(random.sample(range(filled), size))
             
             # Get batch
             return {
@@ -251,19 +299,58 @@ class OnlineLearner(LoggerMixin):
         """
         self.data_queue.put(data)
         
+    def add_batch(self, data: Dict[str, torch.Tensor]) -> int:
+        """Add a batch of samples straight to the buffer.
+        
+        Skips the processing queue, so producers holding whole tensors do
+        not pay a queue hop per sample.
+        
+        Args:
+            data: Data tensors, batch dimension first
+        
+        Returns:
+            int: Number of samples stored
+        """
+        return self.buffer.add_batch(data)
+        
+    def _drain_queue(self, first: Dict[str, torch.Tensor]) -> List[Dict[str, torch.Tensor]]:
+        """Collect ``first`` and whatever else is already queued."""
+        items = [first]
+        while len(items) < self.buffer.capacity:
+            try:
+                items.append(self.data_queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+        
     def _process_data(self):
         """Process incoming data."""
         while self.running:
             try:
                 # Get data from queue
-                data = self.data_queue.get(timeout=1.0)
-                
-                # Add to buffer
-                self.buffer.add(data)
-                
+                items = self._drain_queue(self.data_queue.get(timeout=1.0))
             except queue.Empty:
                 continue
+                
+            try:
+                # Add everything queued in one batch
+                batch = {
+                    name: torch.stack([item[name] for item in items])
+                    for name in items[0]
+                }
+            except (KeyError, RuntimeError):
+                # Mixed shapes or names, fall back to one sample at a time
+                for data in items:
+                    try:
+                        self.buffer.add(data)
+                    except Exception as e:
+                        self.log_error(e, {"operation": "process_data"})
+                continue
+                
+            try:
+                self.buffer.add_batch(batch)
             except Exception as e:
+                # Not retried per sample, rows may already be stored
                 self.log_error(e, {"operation": "process_data"})
                 
     def _update_model(self) -> Optional[Dict[str, float]]:
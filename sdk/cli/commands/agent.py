@@ -19,7 +19,12 @@ from core.audit_log import AuditEntry, AuditLog
 from core.crypto import generate_keypair
 from core.governance import AgentContract
 from core.level_evaluator import check_level_up
-from core.reputation import aggregate_score
+from core.reputation import (
+    RATING_DIR,
+    aggregate_score,
+    compact_ratings,
+    rebuild_summary,
+)
 from core.skills import load_skill
 from core.trust_evaluator import eligible_for_role
 from services import create_agent
@@ -464,6 +469,32 @@ def rep_leaderboard() -> None:
     typer.echo(json.dumps(results, indent=2))
 
 
+def _rated_agents(agent: List[str] | None) -> List[str]:
+    if agent:
+        return agent
+    return sorted(p.stem for p in RATING_DIR.glob("*.jsonl"))
+
+
+@rep_app.command("rebuild")
+def rep_rebuild(agent: List[str] = typer.Option(None, "--agent")) -> None:
+    """Rebuild reputation aggregates from the ratings ledgers."""
+    results = {}
+    for name in _rated_agents(agent):
+        summary = rebuild_summary(name)
+        results[name] = {"count": summary.count, "mean": round(summary.mean, 3)}
+    typer.echo(json.dumps(results, indent=2))
+
+
+@rep_app.command("compact")
+def rep_compact(
+    agent: List[str] = typer.Option(None, "--agent"),
+    keep: int = typer.Option(None, "--keep"),
+) -> None:
+    """Fold old ratings into summary records."""
+    results = {name: compact_ratings(name, keep) for name in _rated_agents(agent)}
+    typer.echo(json.dumps({"compacted": results}, indent=2))
+
+
 @delegate_app.command("grant")
 def delegate_grant(
     from_agent: str,
@@ -520,6 +551,19 @@ def delegate_list(agent: str) -> None:
     typer.echo(json.dumps([asdict(g) for g in grants], indent=2))
 
 
+@delegate_app.command("reindex")
+def delegate_reindex(
+    sweep: bool = typer.Option(False, "--sweep", help="Drop expired grants"),
+) -> None:
+    """Rebuild the delegation lookup index."""
+    from core.delegation import rebuild_delegation_index, sweep_expired_grants
+
+    index = rebuild_delegation_index()
+    removed = sweep_expired_grants() if sweep else 0
+    total = sum(len(g) for roles in index.values() for g in roles.values())
+    typer.echo(json.dumps({"grants": total - removed, "expired": removed}))
+
+
 @feedback_app.command("submit")
 def feedback_submit(
     session: str,
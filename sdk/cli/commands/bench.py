@@ -0,0 +1,118 @@
+"""Load testing commands for a running deployment."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import typer
+
+from ...client import AgentClient
+from ..utils.formatting import print_error, print_output, print_success
+from ..utils.io import ensure_parent, load_yaml, write_json
+from ..utils.loadtest import (
+    LoadProfile,
+    LoadRunner,
+    compare_reports,
+    format_histogram,
+)
+
+bench_app = typer.Typer(name="bench", help="Load tests and latency reports")
+
+
+def _sender(client: AgentClient, endpoint: str, timeout: float):
+    def send(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return client.post(endpoint, payload, timeout=timeout)
+
+    return send
+
+
+@bench_app.command("run")
+def run(
+    profile_file: Optional[Path] = typer.Option(
+        None, "--profile", help="YAML load profile with task mix"
+    ),
+    model: Optional[str] = typer.Option(None, "--model", help="open or closed"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency"),
+    rate: Optional[float] = typer.Option(None, "--rate", help="requests/s (open)"),
+    duration: Optional[float] = typer.Option(None, "--duration", help="seconds"),
+    requests: Optional[int] = typer.Option(None, "--requests"),
+    sessions: Optional[int] = typer.Option(
+        None, "--sessions", help="reuse this many session ids"
+    ),
+    out: Optional[Path] = typer.Option(None, "--out", help="write JSON report"),
+    baseline: Optional[Path] = typer.Option(
+        None, "--baseline", help="compare against an earlier report"
+    ),
+    tolerance: float = typer.Option(0.1, "--tolerance"),
+    as_json: bool = typer.Option(False, "--json"),
+) -> None:
+    """Drive the deployment with load and report latencies."""
+    data = load_yaml(profile_file) if profile_file else {}
+    overrides = {
+        "model": model,
+        "concurrency": concurrency,
+        "rate": rate,
+        "duration": duration,
+        "requests": requests,
+        "sessions": sessions,
+    }
+    data.update({k: v for k, v in overrides.items() if v is not None})
+    try:
+        profile = LoadProfile.from_dict(data)
+    except (TypeError, ValueError) as exc:
+        print_error(str(exc))
+        raise typer.Exit(1)
+
+    client = AgentClient()
+    report = LoadRunner(
+        profile, _sender(client, profile.endpoint, profile.timeout)
+    ).run()
+    if baseline:
+        report["regressions"] = compare_reports(
+            json.loads(baseline.read_text()), report, tolerance
+        )
+    if out:
+        ensure_parent(out)
+        write_json(out, report)
+
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+    else:
+        print_output([report["summary"]])
+        typer.echo(format_histogram(report["histogram_ms"]))
+        if report["errors"]:
+            print_output(
+                [{"error": k, "count": v} for k, v in report["errors"].items()]
+            )
+        if len(report["task_types"]) > 1:
+            print_output(
+                [{"task_type": k, **v} for k, v in report["task_types"].items()]
+            )
+        if out:
+            print_success(f"written to {out}")
+        for line in report.get("regressions", []):
+            print_error(f"regression: {line}")
+    if report.get("regressions"):
+        raise typer.Exit(1)
+
+
+@bench_app.command("compare")
+def compare(
+    baseline: Path,
+    current: Path,
+    tolerance: float = typer.Option(0.1, "--tolerance"),
+) -> None:
+    """Compare two reports written by ``bench run --out``."""
+    regressions = compare_reports(
+        json.loads(baseline.read_text()), json.loads(current.read_text()), tolerance
+    )
+    for line in regressions:
+        print_error(f"regression: {line}")
+    if regressions:
+        raise typer.Exit(1)
+    print_success("no regressions")
+
+
+__all__ = ["bench_app"]
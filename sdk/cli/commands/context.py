@@ -7,6 +7,7 @@ import typer
 
 from agentnn.storage import context_store
 from agentnn.context import context_map
+from core.tracing import TRACE_DIR, critical_path, load_spans, spans_for_context
 from ..utils.formatting import print_success
 
 context_app = typer.Typer(name="context", help="Context utilities")
@@ -38,4 +39,38 @@ def map_html(out: Path) -> None:
     print_success(f"written to {out}")
 
 
+@context_app.command("trace")
+def trace(
+    context_id: str,
+    trace_dir: Path = typer.Option(TRACE_DIR, "--dir", help="Exported spans"),
+    as_json: bool = typer.Option(False, "--json"),
+) -> None:
+    """Show the critical path of the traces recorded for CONTEXT_ID."""
+    spans = spans_for_context(load_spans(trace_dir), context_id)
+    if not spans:
+        typer.echo("no spans found")
+        raise typer.Exit(code=1)
+    path = critical_path(spans)
+    if as_json:
+        rows = [
+            {
+                "depth": depth,
+                "service": span.service,
+                "name": span.name,
+                "duration_ms": round(span.duration * 1000, 2),
+            }
+            for depth, span in path
+        ]
+        typer.echo(json.dumps(rows, indent=2))
+        return
+    start = min(span.start_ns for span in spans)
+    for depth, span in path:
+        offset = (span.start_ns - start) / 1e6
+        typer.echo(
+            f"{offset:9.1f}ms {span.duration * 1000:9.1f}ms  "
+            f"{'  ' * depth}{span.service}: {span.name}"
+            + ("  [error]" if span.error else "")
+        )
+
+
 __all__ = ["context_app"]
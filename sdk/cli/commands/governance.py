@@ -11,7 +11,11 @@ from pathlib import Path
 import typer
 
 from core.governance import AgentContract
-from core.trust_evaluator import calculate_trust, eligible_for_role
+from core.trust_evaluator import (
+    calculate_trust,
+    eligible_for_role,
+    rebuild_trust_aggregates,
+)
 from core.audit_log import AuditEntry, AuditLog
 from core.privacy_filter import redact_context
 from core.model_context import ModelContext, TaskContext
@@ -79,6 +83,16 @@ def trust_eligible(agent: str, for_role: str = typer.Option(..., "--for")) -> No
     )
 
 
+@trust_app.command("rebuild")
+def trust_rebuild(
+    agent: list[str] = typer.Option(None, "--agent"),
+    decay: float = typer.Option(None, "--decay"),
+) -> None:
+    """Rebuild stored trust aggregates from contract task history."""
+    scores = rebuild_trust_aggregates(agent or None, decay)
+    typer.echo(json.dumps(scores, indent=2))
+
+
 @trust_app.command("endorse")
 def trust_endorse(
     from_agent: str,
@@ -6,6 +6,7 @@ import typer
 
 from .commands.agent import agent_app
 from .commands.agentctl import register as register_agentctl
+from .commands.bench import bench_app
 from .commands.config_cmd import register as register_config
 from .commands.context import context_app
 from .commands.dev import dev_app
@@ -43,6 +44,7 @@ app.add_typer(train_app, name="train")
 app.add_typer(dev_app, name="dev")
 app.add_typer(mcp_app, name="mcp")
 app.add_typer(plugins_app, name="plugins")
+app.add_typer(bench_app, name="bench")
 register_tasks(app)
 register_model(app)
 register_config(app)
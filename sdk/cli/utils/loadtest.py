@@ -0,0 +1,248 @@
+"""Load generation helpers for ``agentnn bench``."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from core.utils.latency import compare_summary, percentile
+
+# upper bounds of the latency histogram buckets in milliseconds
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+Sender = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+@dataclass
+class TaskMix:
+    """A weighted task template of a load profile."""
+
+    task_type: str = "chat"
+    description: str = "load test"
+    mode: str = "single"
+    weight: float = 1.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class LoadProfile:
+    """Parameters of a load test run.
+
+    ``model`` is ``closed`` (``concurrency`` clients send back to back) or
+    ``open`` (requests arrive at ``rate`` per second regardless of
+    completions). A run stops after ``requests`` requests or ``duration``
+    seconds, whichever comes first.
+    """
+
+    model: str = "closed"
+    concurrency: int = 4
+    rate: float = 10.0
+    arrival: str = "uniform"  # "uniform" or "poisson" (open model only)
+    duration: float = 10.0
+    requests: Optional[int] = None
+    sessions: int = 0
+    endpoint: str = "/task"
+    timeout: float = 30.0
+    seed: Optional[int] = None
+    tasks: List[TaskMix] = field(default_factory=lambda: [TaskMix()])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadProfile":
+        data = dict(data)
+        tasks = []
+        for item in data.pop("tasks", None) or [{}]:
+            item = dict(item)
+            known = {k: item.pop(k) for k in list(item) if k in TaskMix.__annotations__}
+            tasks.append(TaskMix(**known, extra={**known.get("extra", {}), **item}))
+        known = {k: v for k, v in data.items() if k in cls.__annotations__}
+        profile = cls(**known, tasks=tasks)
+        if profile.model not in {"open", "closed"}:
+            raise ValueError(f"unknown load model: {profile.model}")
+        return profile
+
+
+@dataclass
+class Sample:
+    task_type: str
+    start: float
+    latency: float
+    error: Optional[str] = None
+
+
+class LoadRunner:
+    """Drive ``send`` according to a :class:`LoadProfile`."""
+
+    def __init__(self, profile: LoadProfile, send: Sender) -> None:
+        self.profile = profile
+        self.send = send
+        self.random = random.Random(profile.seed)
+        run_id = uuid.uuid4().hex[:8]
+        self.session_ids = [f"bench-{run_id}-{i}" for i in range(profile.sessions)]
+        self.samples: List[Sample] = []
+        self._lock = threading.Lock()
+        self._issued = 0
+
+    def _next_payload(self) -> tuple[TaskMix, Dict[str, Any]] | None:
+        with self._lock:
+            if self.profile.requests is not None and self._issued >= self.profile.requests:
+                return None
+            index = self._issued
+            self._issued += 1
+            task = self.random.choices(
+                self.profile.tasks, weights=[t.weight for t in self.profile.tasks]
+            )[0]
+        payload: Dict[str, Any] = {
+            "task_type": task.task_type,
+            "description": task.description,
+            "task": task.description,
+            "mode": task.mode,
+            **task.extra,
+        }
+        if self.session_ids:
+            payload["session_id"] = self.session_ids[index % len(self.session_ids)]
+        return task, payload
+
+    def _call(self, task: TaskMix, payload: Dict[str, Any], start: float) -> None:
+        error = None
+        try:
+            self.send(payload)
+        except httpx.HTTPStatusError as exc:
+            error = f"http_{exc.response.status_code}"
+        except Exception as exc:  # pragma: no cover - depends on transport
+            error = type(exc).__name__
+        # open loop: measured from the scheduled start to include queueing delay
+        sample = Sample(task.task_type, start, time.perf_counter() - start, error)
+        with self._lock:
+            self.samples.append(sample)
+
+    def _closed(self, deadline: float) -> None:
+        def worker() -> None:
+            while time.perf_counter() < deadline:
+                item = self._next_payload()
+                if item is None:
+                    return
+                self._call(*item, time.perf_counter())
+
+        threads = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(max(1, self.profile.concurrency))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _open(self, deadline: float) -> None:
+        interval = 1.0 / self.profile.rate if self.profile.rate > 0 else 0.0
+        # bounded only to protect the client; saturation shows up as latency
+        workers = max(self.profile.concurrency, int(self.profile.rate * 10) or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scheduled = time.perf_counter()
+            while scheduled < deadline:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                item = self._next_payload()
+                if item is None:
+                    break
+                pool.submit(self._call, *item, scheduled)
+                if self.profile.arrival == "poisson" and interval:
+                    scheduled += self.random.expovariate(self.profile.rate)
+                else:
+                    scheduled += interval
+
+    def run(self) -> Dict[str, Any]:
+        """Execute the profile and return the report."""
+        start = time.perf_counter()
+        deadline = start + self.profile.duration
+        if self.profile.model == "open":
+            self._open(deadline)
+        else:
+            self._closed(deadline)
+        return build_report(self.profile, self.samples, time.perf_counter() - start)
+
+
+def histogram(latencies_ms: List[float]) -> Dict[str, int]:
+    """Count ``latencies_ms`` per bucket of :data:`BUCKETS_MS`."""
+    counts = {_bucket_label(b): 0 for b in BUCKETS_MS}
+    for value in latencies_ms:
+        for bound in BUCKETS_MS:
+            if value <= bound:
+                counts[_bucket_label(bound)] += 1
+                break
+    return counts
+
+
+def _bucket_label(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+def _summary(samples: List[Sample], duration: float) -> Dict[str, Any]:
+    latencies = [s.latency * 1000 for s in samples if s.error is None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.error),
+        "throughput": round(len(latencies) / duration, 2) if duration else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3) if latencies else 0.0,
+    }
+
+
+def build_report(
+    profile: LoadProfile, samples: List[Sample], duration: float
+) -> Dict[str, Any]:
+    """Aggregate ``samples`` into a JSON serialisable report."""
+    by_type: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_type.setdefault(sample.task_type, []).append(sample)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "profile": asdict(profile),
+        "duration": round(duration, 3),
+        "summary": _summary(samples, duration),
+        "histogram_ms": histogram(
+            [s.latency * 1000 for s in samples if s.error is None]
+        ),
+        "errors": dict(Counter(s.error for s in samples if s.error)),
+        "task_types": {k: _summary(v, duration) for k, v in sorted(by_type.items())},
+    }
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.1
+) -> List[str]:
+    """Return regressions of ``current`` relative to ``baseline``."""
+    return compare_summary(baseline["summary"], current["summary"], tolerance)
+
+
+def format_histogram(counts: Dict[str, int], width: int = 40) -> str:
+    """Render histogram ``counts`` as text bars."""
+    peak = max(counts.values(), default=0) or 1
+    lines = []
+    for label, count in counts.items():
+        bar = "#" * round(count / peak * width)
+        lines.append(f"<= {label:>6} ms | {bar} {count}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "TaskMix",
+    "LoadProfile",
+    "LoadRunner",
+    "percentile",
+    "histogram",
+    "build_report",
+    "compare_reports",
+    "format_histogram",
+]
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 import httpx
 
-from core.model_context import ModelContext
+from core.model_context import ModelContext, TaskContext
+from core.stream_utils import parse_ndjson
 
 from ..config import SDKSettings
 
@@ -45,6 +46,19 @@ class AgentClient:
         resp.raise_for_status()
         return resp.json()
 
+    def post(
+        self, path: str, payload: Dict[str, Any], timeout: float | None = None
+    ) -> Dict[str, Any]:
+        """POST ``payload`` to ``path`` and return the JSON response."""
+        resp = self._client.post(
+            path,
+            json=payload,
+            headers=self._headers(),
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
     def list_agents(self) -> Dict[str, Any]:
         resp = self._client.get("/agents", headers=self._headers())
         resp.raise_for_status()
@@ -152,6 +166,30 @@ class AgentClient:
         resp.raise_for_status()
         return resp.json()
 
+    def dispatch_batch(
+        self,
+        tasks: Iterable[TaskContext | Dict[str, Any]],
+        max_concurrency: int | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Dispatch ``tasks`` in one request and yield results as they finish.
+
+        Each item is ``{"index": i, "context": {...}}`` or
+        ``{"index": i, "error": "..."}``; ``index`` refers to ``tasks``.
+        """
+        payload: Dict[str, Any] = {
+            "tasks": [
+                t.model_dump(mode="json") if isinstance(t, TaskContext) else t
+                for t in tasks
+            ]
+        }
+        if max_concurrency is not None:
+            payload["max_concurrency"] = max_concurrency
+        with self._client.stream(
+            "POST", "/dispatch/batch", json=payload, headers=self._headers()
+        ) as resp:
+            resp.raise_for_status()
+            yield from parse_ndjson(resp.iter_lines())
+
     def chat(self, message: str, task_type: str = "dev") -> Dict[str, Any]:
         """High-level helper for simple task dispatch."""
         from ..utils.context_builder import build_context
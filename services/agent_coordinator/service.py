@@ -10,6 +10,7 @@ import httpx
 from core.model_context import ModelContext
 from core.audit_log import AuditLog, AuditEntry
 from core.metrics_utils import TASKS_PROCESSED, TOKENS_OUT
+from core.tracing import set_attribute, traced
 
 
 class AgentCoordinatorService:
@@ -19,6 +20,7 @@ class AgentCoordinatorService:
         self.audit = AuditLog()
 
     def coordinate(self, ctx: ModelContext, mode: str = "parallel") -> ModelContext:
+        set_attribute("context_id", ctx.uuid)
         if mode == "parallel":
             for arc in ctx.agents:
                 if arc.url:
@@ -106,9 +108,9 @@ class AgentCoordinatorService:
 
     def _call_agent(self, url: str, ctx: ModelContext) -> ModelContext:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(
-                    f"{url.rstrip('/')}/run", json=ctx.model_dump(), timeout=10
+                    f"{url.rstrip('/')}/run", json=ctx.model_dump(mode="json"), timeout=10
                 )
                 resp.raise_for_status()
                 return ModelContext(**resp.json())
@@ -119,13 +121,13 @@ class AgentCoordinatorService:
         self, url: str, text: str, criteria: str, ctx: ModelContext
     ) -> Tuple[float | None, str | None]:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(
                     f"{url.rstrip('/')}/vote",
                     json={
                         "text": text,
                         "criteria": criteria,
-                        "context": ctx.model_dump(),
+                        "context": ctx.model_dump(mode="json"),
                     },
                     timeout=10,
                 )
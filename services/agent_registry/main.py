@@ -6,7 +6,9 @@ from core.run_service import run_service
 
 from core.logging_utils import LoggingMiddleware, exception_handler, init_logging
 from core.metrics_utils import MetricsMiddleware, metrics_router
+from core.tracing import TracingMiddleware
 from core.auth_utils import AuthMiddleware
+from core.http_cache import ConditionalGetMiddleware
 
 from ..health_router import health_router
 from .config import settings
@@ -17,6 +19,8 @@ app = FastAPI(title="Agent Registry Service")
 app.add_middleware(LoggingMiddleware, logger=logger)
 app.add_middleware(AuthMiddleware, logger=logger)
 app.add_middleware(MetricsMiddleware, service="agent_registry")
+app.add_middleware(TracingMiddleware, service="agent_registry")
+app.add_middleware(ConditionalGetMiddleware)
 app.add_exception_handler(Exception, exception_handler(logger))
 app.include_router(metrics_router())
 app.include_router(health_router)
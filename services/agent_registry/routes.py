@@ -5,6 +5,7 @@ from dataclasses import asdict
 from fastapi import APIRouter, HTTPException
 
 from core.agent_profile import AgentIdentity
+from core.http_cache import notify_write
 from core.schemas import StatusResponse
 from utils.api_utils import api_route
 
@@ -37,6 +38,7 @@ async def list_agents() -> AgentList:
 async def register_agent(agent: AgentInfo) -> AgentInfo:
     """Register a new agent."""
     service.register_agent(agent)
+    notify_write(["agents"])
     return agent
 
 
@@ -70,6 +72,7 @@ async def update_agent_profile(agent_name: str, data: dict) -> dict:
     if isinstance(skills, list):
         profile.skills = skills
     profile.save()
+    notify_write(["agents"])
     return asdict(profile)
 
 
@@ -83,6 +86,8 @@ async def update_agent_status(agent_name: str, data: dict) -> StatusResponse:
         response_time=data.get("last_response_duration"),
         tasks_in_progress=data.get("tasks_in_progress"),
     )
+    # no invalidation: runtime metrics change the ETag, so cached lists
+    # are refreshed on revalidation instead of after every dispatch
     return StatusResponse(status="ok")
 
 
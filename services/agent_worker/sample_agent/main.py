@@ -0,0 +1,25 @@
+"""FastAPI entrypoint for the sample agent worker."""
+
+from fastapi import FastAPI
+
+from core.run_service import run_service
+
+from core.logging_utils import LoggingMiddleware, exception_handler, init_logging
+from core.metrics_utils import MetricsMiddleware, metrics_router
+from core.tracing import TracingMiddleware
+
+from ...health_router import health_router
+from .routes import router as worker_router
+
+logger = init_logging("sample_agent")
+app = FastAPI(title="Sample Agent Worker")
+app.add_middleware(LoggingMiddleware, logger=logger)
+app.add_middleware(MetricsMiddleware, service="sample_agent")
+app.add_middleware(TracingMiddleware, service="sample_agent")
+app.add_exception_handler(Exception, exception_handler(logger))
+app.include_router(metrics_router())
+app.include_router(health_router)
+app.include_router(worker_router)
+
+if __name__ == "__main__":
+    run_service(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,27 @@
+"""API routes for the sample agent worker."""
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from core.model_context import ModelContext
+from core.stream_utils import SSE_MEDIA_TYPE
+from utils.api_utils import api_route
+
+from .service import SampleAgentService
+
+router = APIRouter()
+service = SampleAgentService()
+
+
+@api_route(version="v1.0.0")
+@router.post("/run", response_model=ModelContext)
+def run(ctx: ModelContext) -> ModelContext:
+    """Process ``ctx`` and return the signed result."""
+    return service.run(ctx)
+
+
+@api_route(version="dev")
+@router.post("/run/stream")
+def run_stream(ctx: ModelContext) -> StreamingResponse:
+    """Process ``ctx`` and stream completion tokens as server-sent events."""
+    return StreamingResponse(service.run_stream(ctx), media_type=SSE_MEDIA_TYPE)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any
+import json
+from typing import Any, Iterator
 from datetime import datetime
 
 import httpx
@@ -14,6 +15,8 @@ from core.audit_log import AuditLog, AuditEntry
 from core.crypto import sign_payload
 from core.access_control import is_authorized
 from core.agent_profile import AgentIdentity
+from core.stream_utils import parse_sse, sse_event
+from core.tracing import set_attribute, traced
 
 
 class SampleAgentService:
@@ -30,8 +33,13 @@ class SampleAgentService:
         self.session_url = session_url.rstrip("/")
         self.audit = AuditLog()
 
-    def run(self, ctx: ModelContext) -> ModelContext:
-        """Invoke the LLM Gateway and return the updated context."""
+    def _prepare(self, ctx: ModelContext) -> dict[str, Any] | None:
+        """Check permissions, audit the start and build the prompt.
+
+        Returns ``None`` when the task must not be processed; ``ctx.warning``
+        explains why.
+        """
+        set_attribute("context_id", ctx.uuid)
         profile = AgentIdentity.load("sample_agent")
         if not is_authorized(
             "sample_agent",
@@ -40,11 +48,11 @@ class SampleAgentService:
             ctx.task_context.task_type if ctx.task_context else "",
         ):
             ctx.warning = "unauthorized"
-            return ctx
+            return None
         limits = ctx.applied_limits or {}
         if limits.get("can_modify_output") is False and ctx.result is not None:
             ctx.warning = "output_modification_forbidden"
-            return ctx
+            return None
         start_id = self.audit.write(
             AuditEntry(
                 timestamp=datetime.utcnow().isoformat(),
@@ -68,7 +76,7 @@ class SampleAgentService:
         semantic = task_type in {"semantic", "qa", "search"}
         if semantic:
             try:
-                with httpx.Client() as client:
+                with traced(httpx.Client()) as client:
                     resp = client.post(
                         f"{self.vector_url}/vector_search",
                         json={"query": prompt, "collection": "default", "top_k": 3},
@@ -82,9 +90,22 @@ class SampleAgentService:
             prompt = f"{prompt}\n\n{doc_text}" if doc_text else prompt
 
         TOKENS_IN.labels("sample_agent").inc(len(prompt.split()))
+        return {
+            "prompt": prompt,
+            "documents": documents,
+            "semantic": semantic,
+            "limits": limits,
+        }
+
+    def run(self, ctx: ModelContext) -> ModelContext:
+        """Invoke the LLM Gateway and return the updated context."""
+        job = self._prepare(ctx)
+        if job is None:
+            return ctx
+        prompt = job["prompt"]
 
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(
                     f"{self.llm_url}/generate",
                     json={"prompt": prompt},
@@ -98,6 +119,65 @@ class SampleAgentService:
                 "tokens_used": 0,
                 "provider": "dummy",
             }
+        return self._finish(ctx, job, data)
+
+    def run_stream(self, ctx: ModelContext) -> Iterator[str]:
+        """Stream completion tokens as SSE frames while processing ``ctx``.
+
+        Token events from the LLM Gateway are forwarded unchanged. The final
+        ``done`` event carries the signed ``ModelContext`` which is also
+        written to the audit log and session store like :meth:`run`.
+        """
+        job = self._prepare(ctx)
+        if job is None:
+            yield sse_event("done", ctx.model_dump_json())
+            return
+        prompt = job["prompt"]
+        data: dict[str, Any] | None = None
+        parts: list[str] = []
+        try:
+            with traced(httpx.Client()) as client:
+                with client.stream(
+                    "POST",
+                    f"{self.llm_url}/chat/stream",
+                    json={"task": prompt, "user_id": ctx.user_id},
+                    timeout=10,
+                ) as resp:
+                    resp.raise_for_status()
+                    for event, payload in parse_sse(resp.iter_lines()):
+                        if event == "token":
+                            token = json.loads(payload).get("token", "")
+                            parts.append(token)
+                            yield sse_event("token", {"token": token})
+                        elif event == "done":
+                            data = json.loads(payload)
+        except Exception:
+            data = None
+        if data is None:
+            if parts:
+                text = "".join(parts)
+                data = {
+                    "completion": text,
+                    "tokens_used": len(text.split()),
+                    "provider": "unknown",
+                }
+            else:
+                data = {
+                    "completion": f"Echo: {prompt}",
+                    "tokens_used": 0,
+                    "provider": "dummy",
+                }
+                yield sse_event("token", {"token": data["completion"]})
+        ctx = self._finish(ctx, job, data)
+        yield sse_event("done", ctx.model_dump_json())
+
+    def _finish(
+        self, ctx: ModelContext, job: dict[str, Any], data: dict[str, Any]
+    ) -> ModelContext:
+        """Store the completion on ``ctx``, persist, audit and sign it."""
+        limits = job["limits"]
+        documents = job["documents"]
+        semantic = job["semantic"]
         TOKENS_OUT.labels("sample_agent").inc(data.get("tokens_used", 0))
         TASKS_PROCESSED.labels("sample_agent").inc()
         if limits.get("max_tokens") and data.get("tokens_used", 0) > limits["max_tokens"]:
@@ -119,7 +199,7 @@ class SampleAgentService:
         ctx.metrics = {"tokens_used": data.get("tokens_used", 0)}
         if ctx.session_id:
             try:
-                with httpx.Client() as client:
+                with traced(httpx.Client()) as client:
                     client.post(
                         f"{self.session_url}/update_context",
                         json=ctx.model_dump(),
@@ -39,6 +39,7 @@ async def remove(name: str) -> dict:
 
 @api_route(version="v1.0.0")
 @router.post("/dispatch/{name}", response_model=ModelContext)
-async def dispatch(name: str, ctx: ModelContext) -> ModelContext:
+def dispatch(name: str, ctx: ModelContext) -> ModelContext:
+    # sync so concurrent dispatches run in the threadpool and can be batched
     target = None if name == "auto" else name
     return service.dispatch(target, ctx)
@@ -2,13 +2,45 @@
 
 from __future__ import annotations
 
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Iterable
+from typing import Collection, Dict, Iterable, List, Tuple
 
 import httpx
 
+from core.compression import GZIP_ENCODING, gzip_body
 from core.model_context import ModelContext
+from core.stream_utils import parse_ndjson
+from core.tracing import traced
+
+FEDERATION_EWMA_ALPHA = float(os.getenv("FEDERATION_EWMA_ALPHA", "0.3"))
+# consecutive failures before a node is taken out of rotation
+FEDERATION_EJECT_FAILURES = int(os.getenv("FEDERATION_EJECT_FAILURES", "3"))
+FEDERATION_FAILOVER_ATTEMPTS = int(os.getenv("FEDERATION_FAILOVER_ATTEMPTS", "2"))
+FEDERATION_PROBE_INTERVAL = float(os.getenv("FEDERATION_PROBE_INTERVAL", "5"))
+FEDERATION_PROBE_TIMEOUT = float(os.getenv("FEDERATION_PROBE_TIMEOUT", "1"))
+# "direct" sends one request per task, "batch" groups tasks per node
+FEDERATION_FORWARD_MODE = os.getenv("FEDERATION_FORWARD_MODE", "direct").lower()
+FEDERATION_BATCH_LINGER_MS = float(os.getenv("FEDERATION_BATCH_LINGER_MS", "5"))
+FEDERATION_BATCH_MAX = int(os.getenv("FEDERATION_BATCH_MAX", "64"))
+
+
+class RemoteTaskError(RuntimeError):
+    """A node accepted a batched task but reported an error for it."""
+
+
+@dataclass
+class _BatchWindow:
+    """Tasks waiting for one node during the linger window."""
+
+    items: List[Tuple[ModelContext, Future]] = field(default_factory=list)
+    full: threading.Event = field(default_factory=threading.Event)
 
 
 @dataclass
@@ -20,14 +52,61 @@ class FederatedNode:
     last_seen: datetime = field(default_factory=datetime.utcnow)
     tasks_sent: int = 0
     failure_count: int = 0
+    latency_ewma: float = 0.0
+    error_rate: float = 0.0
+    inflight: int = 0
+    consecutive_failures: int = 0
+    healthy: bool = True
+
+    def record(self, latency: float | None, ok: bool) -> None:
+        """Fold one dispatch outcome into the node's statistics."""
+        alpha = FEDERATION_EWMA_ALPHA
+        if latency is not None:
+            if self.latency_ewma:
+                self.latency_ewma += alpha * (latency - self.latency_ewma)
+            else:
+                self.latency_ewma = latency
+        self.error_rate += alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        if ok:
+            self.consecutive_failures = 0
+            self.healthy = True
+        else:
+            self.failure_count += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= FEDERATION_EJECT_FAILURES:
+                self.healthy = False
+
+    def record_probe(self, ok: bool) -> None:
+        """Apply a health probe; dispatch statistics stay untouched."""
+        if ok:
+            self.consecutive_failures = 0
+            self.healthy = True
+        else:
+            self.consecutive_failures += 1
+            self.healthy = False
+
+    def score(self) -> tuple[float, int]:
+        """Expected cost of sending one more task; lower is better."""
+        cost = (self.latency_ewma + 0.001) * (self.inflight + 1)
+        return cost * (1 + 10 * self.error_rate), self.tasks_sent
 
 
 class FederationManagerService:
-    """Register and dispatch tasks to federated nodes."""
+    """Register and dispatch tasks to federated nodes.
+
+    Nodes are chosen by power of two choices over their latency and error
+    EWMAs. Failing nodes leave the rotation until a health probe succeeds,
+    and an automatic dispatch that fails is retried on another node.
+    """
 
     def __init__(self) -> None:
         self.nodes: Dict[str, FederatedNode] = {}
         self._rr: Iterable[str] | None = None
+        self._lock = threading.Lock()
+        self._prober: threading.Thread | None = None
+        self.forward_mode = FEDERATION_FORWARD_MODE
+        self._windows: Dict[str, _BatchWindow] = {}
+        self._http: httpx.Client | None = None
 
     def register_node(self, name: str, base_url: str) -> None:
         self.nodes[name] = FederatedNode(name, base_url.rstrip("/"))
@@ -44,33 +123,188 @@ class FederationManagerService:
         self._cleanup()
         return self.nodes
 
-    def _select_node(self) -> FederatedNode:
+    def _select_node(self, exclude: Collection[str] = ()) -> FederatedNode:
         self._cleanup()
         if not self.nodes:
             raise ValueError("no nodes registered")
-        if not self._rr or all(n not in self.nodes for n in self._rr):
-            self._rr = list(self.nodes)
-        # pick node with least tasks
-        candidate = min(self.nodes.values(), key=lambda n: n.tasks_sent)
-        return candidate
+        candidates = [n for n in self.nodes.values() if n.name not in exclude]
+        if not candidates:
+            raise ValueError("no other nodes available")
+        healthy = [n for n in candidates if n.healthy]
+        pool = healthy or candidates
+        # power of two choices: compare two random nodes instead of all
+        pair = random.sample(pool, 2) if len(pool) > 2 else pool
+        return min(pair, key=FederatedNode.score)
 
-    def dispatch(self, node_name: str | None, ctx: ModelContext) -> ModelContext:
-        node = self.nodes.get(node_name) if node_name else self._select_node()
-        if not node:
-            raise ValueError(f"node {node_name} not registered")
+    def _send(self, node: FederatedNode, ctx: ModelContext) -> ModelContext:
+        with self._lock:
+            node.inflight += 1
+        start = time.perf_counter()
         try:
-            with httpx.Client() as client:
-                resp = client.post(
-                    f"{node.base_url}/dispatch",
-                    json=ctx.model_dump(),
-                    timeout=10,
-                )
-                resp.raise_for_status()
-                node.tasks_sent += 1
-                return ModelContext(**resp.json())
+            resp = self._client().post(
+                f"{node.base_url}/dispatch",
+                json=ctx.model_dump(mode="json"),
+                timeout=10,
+            )
+            resp.raise_for_status()
+            result = ModelContext(**resp.json())
         except Exception:
-            node.failure_count += 1
+            with self._lock:
+                node.inflight -= 1
+                node.record(time.perf_counter() - start, ok=False)
             raise
+        with self._lock:
+            node.inflight -= 1
+            node.tasks_sent += 1
+            node.record(time.perf_counter() - start, ok=True)
+        return result
+
+    def _forward(self, node: FederatedNode, ctx: ModelContext) -> ModelContext:
+        if self.forward_mode == "batch":
+            return self._send_batched(node, ctx)
+        return self._send(node, ctx)
+
+    def _send_batched(self, node: FederatedNode, ctx: ModelContext) -> ModelContext:
+        """Queue ``ctx`` for ``node`` and wait for its batch to return.
+
+        The first task of a window waits ``FEDERATION_BATCH_LINGER_MS`` or
+        until ``FEDERATION_BATCH_MAX`` tasks arrived, then sends them all.
+        """
+        future: Future = Future()
+        with self._lock:
+            window = self._windows.get(node.name)
+            leader = window is None
+            if leader:
+                window = self._windows[node.name] = _BatchWindow()
+            window.items.append((ctx, future))
+            if len(window.items) >= FEDERATION_BATCH_MAX:
+                del self._windows[node.name]
+                window.full.set()
+        if leader:
+            window.full.wait(FEDERATION_BATCH_LINGER_MS / 1000)
+            with self._lock:
+                if self._windows.get(node.name) is window:
+                    del self._windows[node.name]
+            self._send_batch(node, window.items)
+        return future.result()
+
+    def _client(self) -> httpx.Client:
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    # kept open so tasks and batches reuse connections to
+                    # remote sites
+                    self._http = traced(httpx.Client())
+        return self._http
+
+    def _send_batch(
+        self, node: FederatedNode, items: List[Tuple[ModelContext, Future]]
+    ) -> None:
+        body = gzip_body(
+            json.dumps({"tasks": [_batch_task(ctx) for ctx, _ in items]}).encode()
+        )
+        with self._lock:
+            node.inflight += len(items)
+        start = time.perf_counter()
+        try:
+            with self._client().stream(
+                "POST",
+                f"{node.base_url}/dispatch/batch",
+                content=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Content-Encoding": GZIP_ENCODING,
+                },
+                timeout=10,
+            ) as resp:
+                resp.raise_for_status()
+                for line in parse_ndjson(resp.iter_lines()):
+                    future = items[line["index"]][1]
+                    if "context" in line:
+                        future.set_result(ModelContext(**line["context"]))
+                    else:
+                        future.set_exception(RemoteTaskError(line.get("error", "")))
+        except Exception as exc:
+            with self._lock:
+                node.inflight -= len(items)
+                node.record(time.perf_counter() - start, ok=False)
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        latency = time.perf_counter() - start
+        with self._lock:
+            node.inflight -= len(items)
+            node.tasks_sent += len(items)
+            node.record(latency, ok=True)
+        for _, future in items:
+            if not future.done():
+                future.set_exception(RemoteTaskError("no result in batch response"))
+
+    def dispatch(self, node_name: str | None, ctx: ModelContext) -> ModelContext:
+        if node_name:
+            node = self.nodes.get(node_name)
+            if not node:
+                raise ValueError(f"node {node_name} not registered")
+            return self._forward(node, ctx)
+        tried: list[str] = []
+        error: Exception | None = None
+        for _ in range(max(1, FEDERATION_FAILOVER_ATTEMPTS)):
+            try:
+                node = self._select_node(exclude=tried)
+            except ValueError:
+                if error is not None:
+                    raise error
+                raise
+            tried.append(node.name)
+            try:
+                return self._forward(node, ctx)
+            except RemoteTaskError:
+                raise
+            except httpx.HTTPStatusError as exc:
+                # the node rejected the task itself; another node would too
+                if exc.response.status_code < 500:
+                    raise
+                error = exc
+            except Exception as exc:
+                error = exc
+        raise error  # type: ignore[misc]
+
+    def probe_nodes(self) -> None:
+        """Check ``/health`` of every node and update its health.
+
+        A failed probe takes the node out of rotation at once; a successful
+        one brings it back.
+        """
+        for node in list(self.nodes.values()):
+            try:
+                with traced(httpx.Client()) as client:
+                    resp = client.get(
+                        f"{node.base_url}/health", timeout=FEDERATION_PROBE_TIMEOUT
+                    )
+                ok = resp.status_code == 200
+            except Exception:
+                ok = False
+            with self._lock:
+                # probes only decide health; latency and error rates come
+                # from real dispatches
+                node.record_probe(ok)
+
+    def start_probing(self, interval: float = FEDERATION_PROBE_INTERVAL) -> None:
+        """Probe nodes every ``interval`` seconds in a daemon thread."""
+        if self._prober is not None or interval <= 0:
+            return
+
+        def run() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.probe_nodes()
+                except Exception:  # pragma: no cover - probing is best effort
+                    pass
+
+        self._prober = threading.Thread(target=run, name="federation-probe", daemon=True)
+        self._prober.start()
 
     def _cleanup(self) -> None:
         ttl = timedelta(seconds=60)
@@ -78,3 +312,32 @@ class FederationManagerService:
         for name, node in list(self.nodes.items()):
             if now - node.last_seen > ttl:
                 self.nodes.pop(name)
+
+
+def _batch_task(ctx: ModelContext) -> dict:
+    """Return the ``/dispatch/batch`` task entry for a forwarded context.
+
+    The entry holds every field the remote ``/dispatch`` route reads from a
+    context, so batched and direct forwarding dispatch the same task.
+    """
+    task = (
+        ctx.task_context.model_dump(mode="json")
+        if ctx.task_context
+        else {"task_type": "generic"}
+    )
+    preferences = task.get("preferences") or {}
+    task.update(
+        session_id=ctx.session_id,
+        mode=preferences.get("mode", "single"),
+        task_value=ctx.task_value,
+        max_tokens=ctx.max_tokens,
+        priority=ctx.priority,
+        deadline=ctx.deadline,
+        required_skills=ctx.required_skills,
+        enforce_certification=ctx.enforce_certification,
+        require_endorsement=ctx.require_endorsement,
+        mission_id=ctx.mission_id,
+        mission_step=ctx.mission_step,
+        mission_role=ctx.mission_role,
+    )
+    return task
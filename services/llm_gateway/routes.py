@@ -1,8 +1,10 @@
 """API routes for the LLM Gateway service."""
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from core.model_context import ModelContext
+from core.stream_utils import SSE_MEDIA_TYPE
 from utils.api_utils import api_route
 
 from .schemas import (
@@ -39,6 +41,13 @@ async def chat(ctx: ModelContext) -> ChatResponse:
     return ChatResponse(**result)
 
 
+@api_route(version="dev")
+@router.post("/chat/stream")
+async def chat_stream(ctx: ModelContext) -> StreamingResponse:
+    """Stream chat completion tokens as server-sent events."""
+    return StreamingResponse(service.stream_chat(ctx), media_type=SSE_MEDIA_TYPE)
+
+
 @api_route(version="v1.0.0")
 @router.get("/models", response_model=dict)
 async def list_models() -> dict:
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 from core.llm_providers import LLMBackendManager
 from core.metrics_utils import TOKENS_IN, TOKENS_OUT
 from core.model_context import ModelContext
+from core.stream_utils import sse_event
 from services.session_manager.service import SessionManagerService
 
 
@@ -15,16 +16,46 @@ class LLMGatewayService:
         self.manager = manager or LLMBackendManager()
         self.session_mgr = SessionManagerService()
 
+    def _preferred_provider(self, ctx: ModelContext) -> str | None:
+        return self.session_mgr.get_model(ctx.user_id) if ctx.user_id else None
+
     def chat(self, ctx: ModelContext) -> dict[str, Any]:
-        provider_id = self.session_mgr.get_model(ctx.user_id) if ctx.user_id else None
-        provider = self.manager.get_provider(provider_id)
-        text = provider.generate_response(ctx)
+        provider, text = self.manager.router.complete(
+            ctx, self._preferred_provider(ctx)
+        )
         tokens = len(text.split())
         used = len(ctx.task.split()) if ctx.task else 0
         TOKENS_IN.labels("llm_gateway").inc(used)
         TOKENS_OUT.labels("llm_gateway").inc(tokens)
         return {"completion": text, "provider": provider.name, "tokens_used": tokens}
 
+    async def stream_chat(self, ctx: ModelContext) -> AsyncIterator[str]:
+        """Stream completion tokens for ``ctx`` as SSE frames.
+
+        Each token is sent as a ``token`` event; the final ``done`` event
+        carries the same payload as :meth:`chat`.
+        """
+        used = len(ctx.task.split()) if ctx.task else 0
+        TOKENS_IN.labels("llm_gateway").inc(used)
+        parts: list[str] = []
+        provider = None
+        async for provider, token in self.manager.router.stream(
+            ctx, self._preferred_provider(ctx)
+        ):
+            parts.append(token)
+            yield sse_event("token", {"token": token})
+        text = "".join(parts)
+        tokens = len(text.split())
+        TOKENS_OUT.labels("llm_gateway").inc(tokens)
+        yield sse_event(
+            "done",
+            {
+                "completion": text,
+                "provider": provider.name if provider else "",
+                "tokens_used": tokens,
+            },
+        )
+
     def generate(self, prompt: str) -> str:
         ctx = ModelContext(task=prompt)
         return self.chat(ctx)["completion"]
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 import yaml
 
@@ -14,23 +17,110 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     MetaLearner = None
 
+# rules under this key apply to every task type
+ANY_TASK = "*"
+
+
+class RoutingTable:
+    """Rules compiled into a hash on task type and tool bitsets.
+
+    A rule value is either a worker name or a list of
+    ``{"tools": [...], "target": worker}`` entries tried in order; an entry
+    matches when the task requires all of its tools.
+    """
+
+    def __init__(self, rules: Dict) -> None:
+        self.tool_bits: Dict[str, int] = {}
+        self.by_type: Dict[str, Tuple[Tuple[int, str], ...]] = {}
+        for task_type, spec in rules.items():
+            entries = spec if isinstance(spec, list) else [{"target": spec}]
+            compiled = []
+            for entry in entries:
+                if isinstance(entry, str):
+                    entry = {"target": entry}
+                mask = self._mask(entry.get("tools") or ())
+                compiled.append((mask, entry["target"]))
+            self.by_type[str(task_type)] = tuple(compiled)
+        self.lookup = lru_cache(maxsize=4096)(self._lookup)
+
+    def _mask(self, tools: Iterable[str]) -> int:
+        mask = 0
+        for tool in tools:
+            bit = self.tool_bits.setdefault(tool, 1 << len(self.tool_bits))
+            mask |= bit
+        return mask
+
+    def _lookup(self, task_type: str | None, tools: frozenset) -> str | None:
+        have = 0
+        for tool in tools:
+            have |= self.tool_bits.get(tool, 0)
+        for key in (task_type, ANY_TASK):
+            for mask, target in self.by_type.get(key, ()):
+                if mask & have == mask:
+                    return target
+        return None
+
+    def match(
+        self, task_type: str | None, tools: Iterable[str] | None = None
+    ) -> str | None:
+        """Return the worker of the first matching rule, if any."""
+        return self.lookup(task_type, frozenset(tools or ()))
+
 
 class RoutingAgentService:
-    """Route tasks based on YAML rules and optional model prediction."""
-
-    def __init__(self, rules_path: str | None = None) -> None:
-        path = rules_path or settings.rules_path
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as fh:
-                self.rules: Dict[str, str] = yaml.safe_load(fh) or {}
-        else:
-            self.rules = {}
+    """Route tasks based on YAML rules and optional model prediction.
+
+    The rules file is compiled into a :class:`RoutingTable` and swapped for
+    a freshly compiled one when its modification time changes.
+    """
+
+    def __init__(
+        self, rules_path: str | None = None, reload_interval: float = 1.0
+    ) -> None:
+        self.rules_path = rules_path or settings.rules_path
+        self.reload_interval = reload_interval
+        self._mtime: float | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.rules: Dict = {}
+        self.table = RoutingTable({})
+        self._load()
         self.meta = MetaLearner() if settings.meta_enabled and MetaLearner else None
 
+    def _load(self) -> None:
+        try:
+            mtime = os.stat(self.rules_path).st_mtime
+        except OSError:
+            self.rules, self.table, self._mtime = {}, RoutingTable({}), None
+            return
+        with open(self.rules_path, "r", encoding="utf-8") as fh:
+            rules = yaml.safe_load(fh) or {}
+        # compile first so concurrent routes keep using the old table
+        table = RoutingTable(rules)
+        self.rules, self.table, self._mtime = rules, table, mtime
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._checked < self.reload_interval:
+                return
+            self._checked = now
+            try:
+                mtime = os.stat(self.rules_path).st_mtime
+            except OSError:
+                mtime = None
+            if mtime != self._mtime:
+                try:
+                    self._load()
+                except Exception:  # pragma: no cover - keep last good table
+                    pass
+
     def predict_agent(self, ctx: dict) -> str:
         """Return target worker for context using rules and meta model."""
-        ttype = ctx.get("task_type")
-        target = self.rules.get(ttype)
+        self._maybe_reload()
+        target = self.table.match(ctx.get("task_type"), ctx.get("required_tools"))
         if target:
             return target
         if self.meta:
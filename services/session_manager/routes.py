@@ -16,6 +16,7 @@ from .schemas import (
 from .service import SessionManagerService
 from core.audit import audit_action
 from core.feedback_utils import FeedbackEntry
+from core.http_cache import notify_write
 
 router = APIRouter()
 service = SessionManagerService()
@@ -34,6 +35,8 @@ async def start_session() -> SessionId:
 async def update_context(ctx: ModelContext) -> StatusResponse:
     """Store or extend a session context."""
     service.update_context(ctx)
+    if ctx.session_id:
+        notify_write([f"session:{ctx.session_id}"])
     return StatusResponse(status="ok")
 
 
@@ -75,6 +78,7 @@ async def add_feedback(session_id: str, fb: Feedback) -> StatusResponse:
         score=fb.score,
         comment=fb.comment,
         timestamp=fb.timestamp,
+        task_type=fb.task_type,
     )
     service.add_feedback(entry)
     audit_action(
@@ -83,6 +87,7 @@ async def add_feedback(session_id: str, fb: Feedback) -> StatusResponse:
         context_id=session_id,
         detail={"score": fb.score, "agent_id": fb.agent_id},
     )
+    notify_write([f"session:{session_id}"])
     return StatusResponse(status="ok")
 
 
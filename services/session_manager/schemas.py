@@ -27,6 +27,7 @@ class Feedback(BaseModel):
     score: int
     comment: str | None = None
     timestamp: str
+    task_type: str | None = None
 
 
 class FeedbackList(BaseModel):
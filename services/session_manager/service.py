@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import os
-from typing import List
+from typing import Any, List
 
 from core.config import settings
 from core.memory_store import (
@@ -77,14 +77,15 @@ class SessionManagerService:
         """Append the given context to its session and memory log."""
         if not ctx.session_id:
             ctx.session_id = self.start_session()
+        last = ctx.agents[-1] if ctx.agents else None
         entry = {
-            "agent": ctx.agent_selection
-            or (ctx.agents[-1].agent_id if ctx.agents else None),
+            "agent": ctx.agent_selection or (last.agent_id if last else None),
             "input": ctx.task_context.description if ctx.task_context else None,
             "output": ctx.result,
-            "score": ctx.agents[-1].score if ctx.agents else None,
+            "score": last.score if last else None,
             "user_id": ctx.user_id,
-            "feedback": ctx.agents[-1].feedback if ctx.agents else None,
+            # run records of older callers may lack a feedback field
+            "feedback": getattr(last, "feedback", None),
             "timestamp": ctx.timestamp.isoformat(),
         }
         self.memory.append_memory(ctx.session_id, entry)
@@ -114,7 +115,16 @@ class SessionManagerService:
         return self._user_models.get(user_id)
 
     def add_feedback(self, entry: FeedbackEntry) -> None:
-        """Store feedback for a session."""
+        """Store feedback for a session.
+
+        Callers should set ``entry.task_type``; otherwise it is taken from
+        the session's latest context.
+        """
+        if entry.task_type is None:
+            ctx = self.store.last_context(entry.session_id)
+            task = ctx.get("task_context") if ctx else None
+            if task:
+                entry.task_type = task.get("task_type")
         self.feedback_store.add_feedback(entry)
         label = entry.agent_id or "unknown"
         if entry.score > 0:
@@ -125,8 +135,5 @@ class SessionManagerService:
     def get_feedback(self, session_id: str) -> List[FeedbackEntry]:
         return self.feedback_store.get_feedback(session_id)
 
-    def get_feedback_stats(self) -> dict[str, int]:
-        items = self.feedback_store.all_feedback()
-        pos = sum(1 for i in items if i.score > 0)
-        neg = sum(1 for i in items if i.score <= 0)
-        return {"total": len(items), "positive": pos, "negative": neg}
+    def get_feedback_stats(self) -> dict[str, Any]:
+        return self.feedback_store.stats()
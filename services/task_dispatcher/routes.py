@@ -2,22 +2,38 @@
 
 import os
 
-from fastapi import APIRouter
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from core.compression import GZIP_ENCODING, accepts_gzip, gzip_stream
 from core.model_context import ModelContext, TaskContext
+from core.rate_limit import RateLimiter
+from core.stream_utils import NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE, ndjson_line
 from utils.api_utils import api_route
 
-from .schemas import TaskRequest
-from .service import TaskDispatcherService
+from .schemas import BatchRequest, TaskRequest
+from .service import DISPATCH_BATCH_CONCURRENCY, TaskDispatcherService
 
 router = APIRouter()
 service = TaskDispatcherService()
 RATE_LIMIT_TASK = os.getenv("RATE_LIMIT_TASK", "10/minute")
 RATE_LIMITS_ENABLED = os.getenv("RATE_LIMITS_ENABLED", "true").lower() == "true"
-limiter = Limiter(key_func=get_remote_address)
+limiter = RateLimiter()
 limit_task = limiter.limit(RATE_LIMIT_TASK) if RATE_LIMITS_ENABLED else (lambda f: f)
+DISPATCH_BATCH_MAX = int(os.getenv("DISPATCH_BATCH_MAX", "1000"))
+
+
+def _batch_cost(kwargs: dict) -> int:
+    # one token per task; oversized batches are rejected with 413 for free
+    tasks = len(kwargs["batch"].tasks)
+    return tasks if tasks <= DISPATCH_BATCH_MAX else 0
+
+
+limit_batch = (
+    limiter.limit(RATE_LIMIT_TASK, cost=_batch_cost)
+    if RATE_LIMITS_ENABLED
+    else (lambda f: f)
+)
 
 
 @api_route(version="v1.0.0")
@@ -36,6 +52,23 @@ async def create_task(task: TaskRequest) -> ModelContext:
     )
 
 
+@api_route(version="dev")
+@router.post("/task/stream")
+@limit_task
+async def create_task_stream(task: TaskRequest) -> StreamingResponse:
+    """Dispatch a task and stream worker tokens as server-sent events."""
+    events = service.stream_task(
+        task,
+        session_id=task.session_id,
+        mode=task.mode,
+        task_value=task.task_value,
+        max_tokens=task.max_tokens,
+        priority=task.priority,
+        deadline=task.deadline,
+    )
+    return StreamingResponse(events, media_type=SSE_MEDIA_TYPE)
+
+
 @api_route(version="v1.0.0")
 @router.post("/dispatch", response_model=ModelContext)
 @limit_task
@@ -63,6 +96,46 @@ async def dispatch(ctx: ModelContext) -> ModelContext:
     )
 
 
+@api_route(version="dev")
+@router.post("/dispatch/batch")
+@limit_batch
+async def dispatch_batch(batch: BatchRequest, request: Request) -> StreamingResponse:
+    """Dispatch many tasks and stream each result as an NDJSON line.
+
+    Lines arrive in completion order and carry the task's ``index`` in the
+    request together with either its ``context`` or an ``error``. The
+    stream is gzipped line by line for clients that accept it.
+    """
+    if len(batch.tasks) > DISPATCH_BATCH_MAX:
+        raise HTTPException(
+            status_code=413, detail=f"at most {DISPATCH_BATCH_MAX} tasks per batch"
+        )
+    results = service.dispatch_batch(
+        batch.tasks,
+        max_concurrency=min(
+            batch.max_concurrency or DISPATCH_BATCH_CONCURRENCY,
+            DISPATCH_BATCH_CONCURRENCY,
+        ),
+    )
+
+    def lines():
+        for index, outcome in results:
+            if isinstance(outcome, Exception):
+                yield ndjson_line({"index": index, "error": str(outcome)})
+            else:
+                yield ndjson_line(
+                    {"index": index, "context": outcome.model_dump(mode="json")}
+                )
+
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        return StreamingResponse(
+            gzip_stream(lines()),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Content-Encoding": GZIP_ENCODING},
+        )
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
 @api_route(version="v1.0.0")
 @router.post("/queue/promote/{task_id}")
 async def promote(task_id: str) -> dict:
@@ -1,6 +1,6 @@
 """Pydantic models for Task Dispatcher API."""
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from core.model_context import TaskContext
 
@@ -17,3 +17,13 @@ class TaskRequest(TaskContext):
     required_skills: list[str] | None = Field(default=None)
     enforce_certification: bool = Field(default=False)
     require_endorsement: bool = Field(default=False)
+    mission_id: str | None = Field(default=None)
+    mission_step: int | None = Field(default=None)
+    mission_role: str | None = Field(default=None)
+
+
+class BatchRequest(BaseModel):
+    """Several tasks dispatched concurrently by ``/dispatch/batch``."""
+
+    tasks: list[TaskRequest] = Field(default_factory=list)
+    max_concurrency: int | None = Field(default=None, ge=1)
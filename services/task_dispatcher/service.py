@@ -2,10 +2,13 @@
 
 import logging
 import os
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar
 from dataclasses import asdict
 from datetime import datetime
-from typing import Any, List
+from typing import Any, Callable, Generator, Iterable, Iterator, List
 
 import httpx
 
@@ -15,17 +18,112 @@ from core.audit_log import AuditEntry, AuditLog
 from core.crypto import verify_signature
 from core.dispatch_queue import DispatchQueue
 from core.governance import AgentContract
-from core.metrics_utils import TASKS_PROCESSED, TOKENS_IN, TOKENS_OUT
+from core.metrics_utils import (
+    QUEUE_WAIT,
+    TASKS_PROCESSED,
+    TOKENS_IN,
+    TOKENS_OUT,
+    stage_timer,
+)
 from core.model_context import AgentRunContext, ModelContext, TaskContext
 from core.privacy_filter import filter_permissions, redact_context
 from core.role_capabilities import apply_role_capabilities
 from core.roles import resolve_roles
 from core.skill_matcher import match_agent_to_task
-from core.trust_evaluator import calculate_trust, update_trust_usage
+from core.stream_utils import parse_sse, sse_event
+from core.tracing import set_attribute, traced
+from core.trust_evaluator import (
+    TrustAggregate,
+    aggregate_history,
+    record_task_result,
+)
 
 from .config import settings
 
 
+class _TimedAuditLog(AuditLog):
+    """AuditLog recording write latency as a dispatcher stage."""
+
+    def write(self, entry: AuditEntry) -> str:
+        with stage_timer("task_dispatcher", "audit_write", entry.context_id):
+            return super().write(entry)
+
+
+DISPATCH_BATCH_CONCURRENCY = int(os.getenv("DISPATCH_BATCH_CONCURRENCY", "8"))
+
+
+class _BatchCache:
+    """Registry lookups and eligibility shared by the tasks of one batch.
+
+    Eligibility is only shared between contexts without session history,
+    whose governance checks therefore depend on nothing but the key.
+    Results that consumed a temporary role or a delegation grant are never
+    shared. A context reusing a result gets its own audit entry pointing at
+    the context that ran the checks, not the audit ids of that context.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: dict[Any, threading.Lock] = {}
+        self._agents: dict[str, list[dict[str, Any]]] = {}
+        self._eligible: dict[tuple, tuple[list[dict[str, Any]], str | None, str]] = {}
+
+    def _key_lock(self, key: Any) -> threading.Lock:
+        with self._lock:
+            return self._keys.setdefault(key, threading.Lock())
+
+    def agents(
+        self, capability: str, fetch: Callable[[str], list[dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        with self._key_lock(("agents", capability)):
+            if capability not in self._agents:
+                self._agents[capability] = fetch(capability)
+        return [dict(a) for a in self._agents[capability]]
+
+    @staticmethod
+    def eligibility_key(ctx: ModelContext) -> tuple | None:
+        if ctx.session_id:
+            return None
+        return (
+            ctx.task_context.task_type,
+            ctx.max_tokens,
+            ctx.mission_role,
+            ctx.require_endorsement,
+        )
+
+    def eligible(
+        self,
+        key: tuple,
+        ctx: ModelContext,
+        compute: Callable[[], list[dict[str, Any]]],
+        audit: AuditLog,
+    ) -> list[dict[str, Any]]:
+        with self._key_lock(("eligible", key)):
+            cached = self._eligible.get(key)
+            if cached is None:
+                agents = compute()
+                if not ctx.elevated_roles and not ctx.delegate_info:
+                    self._eligible[key] = (agents, ctx.warning, ctx.uuid)
+                return agents
+        agents, warning, source = cached
+        if warning:
+            ctx.warning = warning
+        log_id = audit.write(
+            AuditEntry(
+                timestamp=datetime.utcnow().isoformat(),
+                actor="dispatcher",
+                action="eligibility_shared",
+                context_id=ctx.uuid,
+                detail={"source_context": source, "warning": warning},
+            )
+        )
+        ctx.audit_trace.append(log_id)
+        return [dict(a) for a in agents]
+
+
+_batch_cache: ContextVar[_BatchCache | None] = ContextVar("batch_cache", default=None)
+
+
 class TaskDispatcherService:
     """Dispatch incoming tasks to worker agents."""
 
@@ -44,7 +142,8 @@ class TaskDispatcherService:
         self.routing_url = (routing_url or settings.routing_url).rstrip("/")
         self.queue = DispatchQueue()
         self.log = logging.getLogger(__name__)
-        self.audit = AuditLog()
+        self.audit = _TimedAuditLog()
+        self._trust_cache: tuple[tuple[str, int], dict[str, TrustAggregate]] | None = None
 
     def _apply_role_limits(self, ctx: ModelContext, role: str) -> None:
         """Limit context according to ROLE_CAPABILITIES."""
@@ -64,14 +163,28 @@ class TaskDispatcherService:
             )
             ctx.audit_trace.append(log_id)
 
-    def _governance_allowed(self, agent: dict[str, Any], ctx: ModelContext) -> bool:
-        contract = AgentContract.load(agent["name"])
+    def _session_trust(self, ctx: ModelContext) -> dict[str, TrustAggregate]:
+        """Return per-agent trust aggregates of the session history.
+
+        The history is aggregated once per context instead of once per
+        candidate agent.
+        """
         history = (
             ctx.task_context.preferences.get("history", [])
             if ctx.task_context and ctx.task_context.preferences
             else []
         )
-        trust = calculate_trust(agent["name"], history)
+        key = (ctx.uuid, len(history))
+        cached = self._trust_cache
+        if cached is None or cached[0] != key:
+            cached = (key, aggregate_history(history))
+            self._trust_cache = cached
+        return cached[1]
+
+    def _governance_allowed(self, agent: dict[str, Any], ctx: ModelContext) -> bool:
+        contract = AgentContract.load(agent["name"])
+        agg = self._session_trust(ctx).get(agent["name"])
+        trust = agg.score() if agg else 0.0
         if trust < contract.trust_level_required:
             ctx.warning = "trust level too low"
             log_id = self.audit.write(
@@ -284,6 +397,7 @@ class TaskDispatcherService:
             mission_step=mission_step,
             mission_role=mission_role,
         )
+        set_attribute("context_id", ctx.uuid)
         log_id = self.audit.write(
             AuditEntry(
                 timestamp=datetime.utcnow().isoformat(),
@@ -296,19 +410,38 @@ class TaskDispatcherService:
         ctx.audit_trace.append(log_id)
         return ctx
 
-    def _execute_context(
-        self, ctx: ModelContext, mode: str, enforce_certification: bool = False
-    ) -> ModelContext:
-        agents = self._fetch_agents(ctx.task_context.task_type)
-        agents = [a for a in agents if self._governance_allowed(a, ctx)]
-        agents = [a for a in agents if self._endorsement_allowed(a, ctx)]
+    def _select_agents(
+        self, ctx: ModelContext, enforce_certification: bool = False
+    ) -> list[dict[str, Any]]:
+        """Return eligible agents for ``ctx`` ordered by preference.
+
+        An empty list means the task cannot run; ``ctx.warning`` is set
+        unless certification was enforced without any certified agent.
+        """
+        batch = _batch_cache.get()
+        with stage_timer("task_dispatcher", "agent_fetch", ctx.uuid):
+            if batch is not None:
+                agents = batch.agents(ctx.task_context.task_type, self._fetch_agents)
+            else:
+                agents = self._fetch_agents(ctx.task_context.task_type)
+
+        def governed() -> list[dict[str, Any]]:
+            allowed = [a for a in agents if self._governance_allowed(a, ctx)]
+            return [a for a in allowed if self._endorsement_allowed(a, ctx)]
+
+        with stage_timer("task_dispatcher", "governance_filter", ctx.uuid):
+            key = batch.eligibility_key(ctx) if batch is not None else None
+            if key is not None:
+                agents = batch.eligible(key, ctx, governed, self.audit)
+            else:
+                agents = governed()
         if ctx.required_skills:
             agents = [a for a in agents if self._skills_allowed(a, ctx)]
             if enforce_certification and not agents:
-                return ctx
+                return []
         if not agents:
             ctx.warning = "no eligible agents"
-            return ctx
+            return []
         if ctx.task_value is not None:
             for a in agents:
                 cost = a.get("estimated_cost_per_token", 0.0) or 1e-6
@@ -317,33 +450,69 @@ class TaskDispatcherService:
 
         if ctx.max_tokens is not None and ctx.token_spent >= ctx.max_tokens:
             ctx.warning = "budget exceeded"
+            return []
+        return agents
+
+    def _select_single(self, ctx: ModelContext, agent: dict[str, Any]) -> None:
+        ctx.agent_selection = agent["id"]
+        log_id = self.audit.write(
+            AuditEntry(
+                timestamp=datetime.utcnow().isoformat(),
+                actor="dispatcher",
+                action="agent_selected",
+                context_id=ctx.uuid,
+                detail={"agent": agent["name"]},
+            )
+        )
+        ctx.audit_trace.append(log_id)
+        self._apply_role_limits(ctx, agent.get("role", ""))
+
+    def _apply_single_result(
+        self, ctx: ModelContext, agent: dict[str, Any], arc: AgentRunContext
+    ) -> None:
+        ctx.agents.append(arc)
+        ctx.result = arc.result
+        ctx.metrics = arc.metrics
+        # failed worker calls carry an error and no metrics; record them too
+        metrics = dict(arc.metrics or {})
+        success = bool(metrics) and arc.error is None and arc.result is not None
+        limit = ctx.applied_limits.get("max_tokens", ctx.max_tokens or 0)
+        record_task_result(
+            agent["name"],
+            {
+                "agent_id": agent["name"],
+                "success": success,
+                "feedback_score": float(metrics.get("rating", 0.0)),
+                "metrics": metrics,
+                "error": arc.error,
+            },
+            token_limit=limit,
+        )
+
+    def _finalize_context(self, ctx: ModelContext) -> ModelContext:
+        if ctx.metrics:
+            ctx.token_spent += int(ctx.metrics.get("tokens_used", 0))
+        if ctx.max_tokens is not None and ctx.token_spent > ctx.max_tokens:
+            ctx.warning = "budget exceeded"
+        TASKS_PROCESSED.labels("task_dispatcher").inc()
+        tokens = ctx.metrics.get("tokens_used", 0) if ctx.metrics else 0
+        TOKENS_OUT.labels("task_dispatcher").inc(tokens)
+        if ctx.mission_id is not None:
+            self._record_mission_progress(ctx)
+        return ctx
+
+    def _execute_context(
+        self, ctx: ModelContext, mode: str, enforce_certification: bool = False
+    ) -> ModelContext:
+        agents = self._select_agents(ctx, enforce_certification)
+        if not agents:
             return ctx
 
         if mode == "single":
-            agent = agents[0] if agents else None
-            ctx.agent_selection = agent["id"] if agent else None
-            if agent:
-                log_id = self.audit.write(
-                    AuditEntry(
-                        timestamp=datetime.utcnow().isoformat(),
-                        actor="dispatcher",
-                        action="agent_selected",
-                        context_id=ctx.uuid,
-                        detail={"agent": agent["name"]},
-                    )
-                )
-                ctx.audit_trace.append(log_id)
-            if agent:
-                self._apply_role_limits(ctx, agent.get("role", ""))
-                arc = self._run_agent(agent, ctx)
-                ctx.agents.append(arc)
-                ctx.result = arc.result
-                ctx.metrics = arc.metrics
-                if arc.metrics:
-                    limit = ctx.applied_limits.get("max_tokens", ctx.max_tokens or 0)
-                    update_trust_usage(
-                        agent["name"], int(arc.metrics.get("tokens_used", 0)), limit
-                    )
+            agent = agents[0]
+            self._select_single(ctx, agent)
+            arc = self._run_agent(agent, ctx)
+            self._apply_single_result(ctx, agent, arc)
         elif mode == "coalition":
             coalition = self._init_coalition(
                 ctx.task_context.description or "",
@@ -381,16 +550,7 @@ class TaskDispatcherService:
                 self._apply_role_limits(ctx, arc.role or "")
             ctx = self._send_to_coordinator(ctx, mode)
 
-        if ctx.metrics:
-            ctx.token_spent += int(ctx.metrics.get("tokens_used", 0))
-        if ctx.max_tokens is not None and ctx.token_spent > ctx.max_tokens:
-            ctx.warning = "budget exceeded"
-        TASKS_PROCESSED.labels("task_dispatcher").inc()
-        tokens = ctx.metrics.get("tokens_used", 0) if ctx.metrics else 0
-        TOKENS_OUT.labels("task_dispatcher").inc(tokens)
-        if ctx.mission_id is not None:
-            self._record_mission_progress(ctx)
-        return ctx
+        return self._finalize_context(ctx)
 
     def dispatch_task(
         self,
@@ -429,6 +589,119 @@ class TaskDispatcherService:
         ctx.dispatch_state = "running"
         ctx = self._execute_context(ctx, mode, enforce_certification)
         ctx.dispatch_state = "completed"
+        self._record_outcome_feedback(ctx)
+        return ctx
+
+    def dispatch_batch(
+        self,
+        tasks: Iterable[TaskContext],
+        max_concurrency: int = DISPATCH_BATCH_CONCURRENCY,
+    ) -> Iterator[tuple[int, ModelContext | Exception]]:
+        """Dispatch ``tasks`` concurrently and yield results as they complete.
+
+        Yields ``(index, context)`` pairs, or ``(index, exception)`` for tasks
+        that failed. Per-task options (``session_id``, ``mode``, ...) are read
+        from the task objects, e.g. ``TaskRequest`` instances. Registry lookups
+        and agent eligibility are shared between tasks of the same type.
+        """
+        cache = _BatchCache()
+
+        def run(task: TaskContext) -> ModelContext:
+            _batch_cache.set(cache)
+            try:
+                return self.dispatch_task(
+                    task,
+                    session_id=getattr(task, "session_id", None),
+                    mode=getattr(task, "mode", "single"),
+                    task_value=getattr(task, "task_value", None),
+                    max_tokens=getattr(task, "max_tokens", None),
+                    priority=getattr(task, "priority", None),
+                    deadline=getattr(task, "deadline", None),
+                    required_skills=getattr(task, "required_skills", None),
+                    enforce_certification=getattr(task, "enforce_certification", False),
+                    require_endorsement=getattr(task, "require_endorsement", False),
+                    mission_id=getattr(task, "mission_id", None),
+                    mission_step=getattr(task, "mission_step", None),
+                    mission_role=getattr(task, "mission_role", None),
+                )
+            finally:
+                _batch_cache.set(None)
+
+        tasks = iter(tasks)
+        limit = max(1, max_concurrency)
+        with ThreadPoolExecutor(max_workers=limit) as pool:
+            pending: dict[Any, int] = {}
+            index = 0
+            for task in tasks:
+                pending[pool.submit(run, task)] = index
+                index += 1
+                if len(pending) >= limit:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    exc = future.exception()
+                    yield i, exc if exc is not None else future.result()
+                    task = next(tasks, None)
+                    if task is not None:
+                        pending[pool.submit(run, task)] = index
+                        index += 1
+
+    def stream_task(
+        self,
+        task: TaskContext,
+        session_id: str | None = None,
+        mode: str = "single",
+        task_value: float | None = None,
+        max_tokens: int | None = None,
+        priority: int | None = None,
+        deadline: str | None = None,
+        required_skills: list[str] | None = None,
+        enforce_certification: bool = False,
+        require_endorsement: bool = False,
+        mission_id: str | None = None,
+        mission_step: int | None = None,
+        mission_role: str | None = None,
+    ) -> Iterator[str]:
+        """Dispatch ``task`` and stream the worker's tokens as SSE frames.
+
+        Only ``single`` mode streams tokens; other modes run to completion.
+        The final ``done`` event always carries the assembled ModelContext.
+        """
+        legacy_map = {"say_hello": "dev", "hello": "dev"}
+        if task.task_type in legacy_map:
+            task.task_type = legacy_map[task.task_type]
+        ctx = self._prepare_context(
+            task,
+            session_id,
+            task_value,
+            max_tokens,
+            priority,
+            deadline,
+            required_skills,
+            enforce_certification,
+            require_endorsement,
+            mission_id,
+            mission_step,
+            mission_role,
+        )
+        ctx.dispatch_state = "running"
+        if mode == "single":
+            agents = self._select_agents(ctx, enforce_certification)
+            if agents:
+                agent = agents[0]
+                self._select_single(ctx, agent)
+                arc = yield from self._run_agent_stream(agent, ctx)
+                self._apply_single_result(ctx, agent, arc)
+                ctx = self._finalize_context(ctx)
+        else:
+            ctx = self._execute_context(ctx, mode, enforce_certification)
+        ctx.dispatch_state = "completed"
+        self._record_outcome_feedback(ctx)
+        yield sse_event("done", ctx.model_dump_json())
+
+    def _record_outcome_feedback(self, ctx: ModelContext) -> None:
         if ctx.warning or any(
             (a.metrics or {}).get("rating", 1.0) < 0.5 for a in ctx.agents
         ):
@@ -453,7 +726,6 @@ class TaskDispatcherService:
                         detail={"type": "task_failed"},
                     )
                 )
-        return ctx
 
     def enqueue_task(
         self,
@@ -489,18 +761,30 @@ class TaskDispatcherService:
         self.queue.enqueue(ctx)
         return ctx
 
+    def _observe_queue_wait(self, ctx: ModelContext) -> None:
+        if not ctx.submitted_at:
+            return
+        try:
+            waited = datetime.utcnow() - datetime.fromisoformat(ctx.submitted_at)
+        except (TypeError, ValueError):
+            return
+        QUEUE_WAIT.labels("task_dispatcher").observe(
+            max(waited.total_seconds(), 0.0), exemplar={"context_id": ctx.uuid}
+        )
+
     def process_queue_once(self, mode: str = "single") -> ModelContext | None:
         self.queue.expire_old_tasks()
         ctx = self.queue.dequeue()
         if not ctx:
             return None
+        self._observe_queue_wait(ctx)
         ctx = self._execute_context(ctx, mode, ctx.enforce_certification)
         ctx.dispatch_state = "completed"
         return ctx
 
     def _fetch_agents(self, capability: str) -> list[dict[str, Any]]:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.get(f"{self.registry_url}/agents")
                 resp.raise_for_status()
                 agents = resp.json().get("agents", [])
@@ -533,7 +817,7 @@ class TaskDispatcherService:
         """Call routing-agent service to get target worker."""
         payload = {"task_type": task_type}
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(f"{self.routing_url}/route", json=payload, timeout=5)
                 resp.raise_for_status()
                 return resp.json().get("target_worker")
@@ -542,19 +826,22 @@ class TaskDispatcherService:
 
     def _fetch_history(self, session_id: str) -> list[dict]:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client, stage_timer(
+                "task_dispatcher", "history_fetch"
+            ):
                 resp = client.get(f"{self.session_url}/context/{session_id}")
                 resp.raise_for_status()
                 return resp.json().get("context", [])
         except Exception:
             return []
 
-    def _run_agent(self, agent: dict[str, Any], ctx: ModelContext) -> AgentRunContext:
-        """Call the worker's /run endpoint and return AgentRunContext."""
-        start = time.perf_counter()
-        contract = AgentContract.load(agent["name"])
-        send_ctx = redact_context(ctx, contract.max_access_level)
-        send_ctx = filter_permissions(send_ctx, agent.get("role", ""))
+    def _redacted_context(
+        self, agent: dict[str, Any], ctx: ModelContext, contract: AgentContract
+    ) -> ModelContext:
+        """Return the view of ``ctx`` the agent is allowed to receive."""
+        with stage_timer("task_dispatcher", "redaction", ctx.uuid):
+            send_ctx = redact_context(ctx, contract.max_access_level)
+            send_ctx = filter_permissions(send_ctx, agent.get("role", ""))
         if send_ctx.metrics and send_ctx.metrics.get("context_redacted_fields"):
             self.log.info(
                 "context_redacted",
@@ -574,63 +861,124 @@ class TaskDispatcherService:
                 )
             )
             ctx.audit_trace.append(log_id)
+        return send_ctx
+
+    def _accept_response(
+        self,
+        agent: dict[str, Any],
+        ctx: ModelContext,
+        contract: AgentContract,
+        data: ModelContext,
+    ) -> AgentRunContext:
+        """Verify the worker signature and build the AgentRunContext."""
+        verify = os.getenv("DISABLE_SIGNATURE_VALIDATION", "false").lower() != "true"
+        valid = True
+        if verify:
+            if data.signed_by and data.signature:
+                with stage_timer("task_dispatcher", "signature_verify", ctx.uuid):
+                    payload = data.model_dump(exclude={"signature", "signed_by"})
+                    valid = verify_signature(
+                        data.signed_by, payload, data.signature
+                    )
+            else:
+                valid = False
+            if not valid:
+                log_id = self.audit.write(
+                    AuditEntry(
+                        timestamp=datetime.utcnow().isoformat(),
+                        actor="dispatcher",
+                        action="signature_invalid",
+                        context_id=ctx.uuid,
+                        detail={"agent": agent["name"]},
+                    )
+                )
+                ctx.audit_trace.append(log_id)
+                if contract.require_signature:
+                    ctx.warning = "missing_signature"
+        ctx.signed_by = data.signed_by
+        ctx.signature = data.signature
+        return AgentRunContext(
+            agent_id=agent["id"],
+            role=agent.get("role"),
+            url=agent.get("url"),
+            result=data.result,
+            metrics=data.metrics,
+            error=data.warning,
+        )
+
+    def _run_agent(self, agent: dict[str, Any], ctx: ModelContext) -> AgentRunContext:
+        """Call the worker's /run endpoint and return AgentRunContext."""
+        start = time.perf_counter()
+        contract = AgentContract.load(agent["name"])
+        send_ctx = self._redacted_context(agent, ctx, contract)
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client, stage_timer(
+                "task_dispatcher", "worker_call", ctx.uuid
+            ):
                 resp = client.post(
                     f"{agent['url'].rstrip('/')}/run",
-                    json=send_ctx.model_dump(),
+                    json=send_ctx.model_dump(mode="json"),
                     timeout=10,
                 )
                 resp.raise_for_status()
                 data = ModelContext(**resp.json())
-                verify = (
-                    os.getenv("DISABLE_SIGNATURE_VALIDATION", "false").lower() != "true"
-                )
-                valid = True
-                if verify:
-                    if data.signed_by and data.signature:
-                        payload = data.model_dump(exclude={"signature", "signed_by"})
-                        valid = verify_signature(
-                            data.signed_by, payload, data.signature
-                        )
-                    else:
-                        valid = False
-                    if not valid:
-                        log_id = self.audit.write(
-                            AuditEntry(
-                                timestamp=datetime.utcnow().isoformat(),
-                                actor="dispatcher",
-                                action="signature_invalid",
-                                context_id=ctx.uuid,
-                                detail={"agent": agent["name"]},
-                            )
-                        )
-                        ctx.audit_trace.append(log_id)
-                        if contract.require_signature:
-                            ctx.warning = "missing_signature"
-                ctx.signed_by = data.signed_by
-                ctx.signature = data.signature
-                arc = AgentRunContext(
-                    agent_id=agent["id"],
-                    role=agent.get("role"),
-                    url=agent.get("url"),
-                    result=data.result,
-                    metrics=data.metrics,
-                )
-        except Exception:
+                arc = self._accept_response(agent, ctx, contract, data)
+        except Exception as exc:
             arc = AgentRunContext(
-                agent_id=agent["id"], role=agent.get("role"), url=agent.get("url")
+                agent_id=agent["id"],
+                role=agent.get("role"),
+                url=agent.get("url"),
+                error=str(exc),
             )
         duration = time.perf_counter() - start
         self._update_status(agent["name"], duration)
         return arc
 
+    def _run_agent_stream(
+        self, agent: dict[str, Any], ctx: ModelContext
+    ) -> Generator[str, None, AgentRunContext]:
+        """Call the worker's /run/stream endpoint, forwarding token events.
+
+        The generator's return value is the AgentRunContext built from the
+        worker's final ``done`` event. A failed call is logged and reported
+        as an ``error`` event before the dispatcher's own ``done`` event.
+        """
+        start = time.perf_counter()
+        contract = AgentContract.load(agent["name"])
+        send_ctx = self._redacted_context(agent, ctx, contract)
+        arc = AgentRunContext(
+            agent_id=agent["id"], role=agent.get("role"), url=agent.get("url")
+        )
+        try:
+            with traced(httpx.Client()) as client:
+                with client.stream(
+                    "POST",
+                    f"{agent['url'].rstrip('/')}/run/stream",
+                    content=send_ctx.model_dump_json(),
+                    headers={"Content-Type": "application/json"},
+                    timeout=10,
+                ) as resp:
+                    resp.raise_for_status()
+                    for event, payload in parse_sse(resp.iter_lines()):
+                        if event == "done":
+                            data = ModelContext.model_validate_json(payload)
+                            arc = self._accept_response(agent, ctx, contract, data)
+                        else:
+                            yield sse_event(event, payload)
+        except Exception as exc:
+            self.log.warning("worker stream from %s failed: %s", agent["name"], exc)
+            arc.error = str(exc)
+            yield sse_event("error", {"agent": agent["name"], "error": str(exc)})
+        duration = time.perf_counter() - start
+        self._update_status(agent["name"], duration)
+        return arc
+
     def _send_to_coordinator(self, ctx: ModelContext, mode: str) -> ModelContext:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(
                     f"{self.coordinator_url}/coordinate",
-                    json={"context": ctx.model_dump(), "mode": mode},
+                    json={"context": ctx.model_dump(mode="json"), "mode": mode},
                     timeout=10,
                 )
                 resp.raise_for_status()
@@ -640,7 +988,7 @@ class TaskDispatcherService:
 
     def _init_coalition(self, goal: str, members: List[str]) -> dict:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(
                     f"{self.coalition_url}/coalition/init",
                     json={
@@ -664,7 +1012,7 @@ class TaskDispatcherService:
 
     def _assign_subtask(self, coalition_id: str, title: str, assigned_to: str) -> None:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 client.post(
                     f"{self.coalition_url}/coalition/{coalition_id}/assign",
                     json={"title": title, "assigned_to": assigned_to},
@@ -734,7 +1082,9 @@ class TaskDispatcherService:
             "last_response_duration": duration,
         }
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client, stage_timer(
+                "task_dispatcher", "status_update"
+            ):
                 client.post(
                     f"{self.registry_url}/agent_status/{agent_name}",
                     json=payload,
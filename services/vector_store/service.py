@@ -12,6 +12,7 @@ import chromadb
 
 from core.metrics_utils import TASKS_PROCESSED, TOKENS_IN, TOKENS_OUT
 from core.config import settings
+from core.tracing import traced
 
 
 class VectorStoreService:
@@ -32,7 +33,7 @@ class VectorStoreService:
 
     def _embed(self, text: str) -> List[float]:
         try:
-            with httpx.Client() as client:
+            with traced(httpx.Client()) as client:
                 resp = client.post(f"{self.llm_url}/embed", json={"text": text}, timeout=10)
                 resp.raise_for_status()
                 data = resp.json()
@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from api_gateway.admission import AdaptiveLimiter, AdmissionMiddleware, priority_for
+
+pytestmark = pytest.mark.unit
+
+
+def test_priority_classes_shed_bulk_first():
+    limiter = AdaptiveLimiter(initial=10)
+    assert priority_for("/chat/stream") == "interactive"
+    assert priority_for("/embed") == "bulk"
+    assert priority_for("/agents") == "standard"
+    admitted = {}
+    for priority in ("bulk", "standard", "interactive"):
+        while limiter.try_acquire(priority):
+            pass
+        admitted[priority] = limiter.inflight
+    assert admitted == {"bulk": 5, "standard": 8, "interactive": 10}
+
+
+def test_limit_shrinks_under_latency_and_grows_when_healthy():
+    limiter = AdaptiveLimiter(initial=10, min_limit=2, max_limit=12)
+    limiter.inflight = 9
+    for _ in range(5):
+        limiter.observe(0.01)
+    assert limiter.limit > 10
+    grown = limiter.limit
+    limiter._last_decrease = 0.0
+    limiter.observe(1.0)
+    assert limiter.limit < grown
+    for _ in range(100):
+        limiter._last_decrease = 0.0
+        limiter.observe(0.01, overloaded=True)
+    assert limiter.limit == 2
+
+
+def test_middleware_sheds_with_retry_after():
+    app = FastAPI()
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1)
+    app.add_middleware(
+        AdmissionMiddleware, service="test", limiter=limiter, enabled=True
+    )
+    release = asyncio.Event()
+
+    @app.get("/agents")
+    async def agents() -> dict:
+        await release.wait()
+        return {"agents": []}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gw") as c:
+            slow = asyncio.ensure_future(c.get("/agents"))
+            while limiter.inflight == 0:
+                await asyncio.sleep(0.01)
+            shed = await c.get("/agents")
+            metrics = await c.get("/metrics")
+            release.set()
+            return shed, metrics, await slow
+
+    shed, metrics, ok = asyncio.run(scenario())
+    assert shed.status_code == 503
+    assert int(shed.headers["retry-after"]) >= 1
+    assert metrics.status_code == 404  # exempt path passes through
+    assert ok.status_code == 200
+    assert limiter.inflight == 0
+
+
+def test_slot_released_when_client_leaves_before_response_starts():
+    app = FastAPI()
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1)
+    app.add_middleware(
+        AdmissionMiddleware, service="test", limiter=limiter, enabled=True
+    )
+
+    @app.get("/agents")
+    async def agents() -> StreamingResponse:
+        return StreamingResponse(iter([b"a", b"b"]))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/agents",
+        "raw_path": b"/agents",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("gw", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("client disconnected")
+
+    with pytest.raises(OSError):
+        asyncio.run(app(scope, receive, send))
+    assert limiter.inflight == 0
@@ -0,0 +1,136 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api_gateway.cache import ResponseCache
+from api_gateway.connectors import ServiceConnector
+from core.http_cache import ConditionalGetMiddleware
+
+pytestmark = pytest.mark.unit
+
+
+def _backend(state):
+    app = FastAPI()
+    app.add_middleware(ConditionalGetMiddleware)
+
+    @app.get("/agents")
+    async def agents() -> dict:
+        state["calls"] += 1
+        return {"agents": state["agents"]}
+
+    return app
+
+
+def _gateway(state, ttl=60.0):
+    backend = _backend(state)
+    conn = ServiceConnector("http://registry-cache")
+    conn.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=backend))
+    cache = ResponseCache(size=8, default_ttl=ttl, ttls={}, enabled=True)
+    app = FastAPI()
+
+    @app.get("/agents")
+    async def agents(request: Request):
+        return await cache.respond(
+            "agents", request, request.headers.get("X-User", ""), conn, "/agents",
+            ["agents"],
+        )
+
+    return TestClient(app), cache
+
+
+def test_backend_answers_revalidation_with_304():
+    state = {"calls": 0, "agents": ["a"]}
+    client = TestClient(_backend(state))
+    first = client.get("/agents")
+    etag = first.headers["etag"]
+    again = client.get("/agents", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_gateway_serves_cached_and_honours_etag():
+    state = {"calls": 0, "agents": ["a"]}
+    client, cache = _gateway(state)
+    first = client.get("/agents")
+    assert first.json() == {"agents": ["a"]}
+    assert "max-age=60" in first.headers["cache-control"]
+    assert client.get("/agents").json() == {"agents": ["a"]}
+    assert state["calls"] == 1
+    cond = client.get("/agents", headers={"If-None-Match": first.headers["etag"]})
+    assert cond.status_code == 304
+    # auth scope is part of the key
+    client.get("/agents", headers={"X-User": "other"})
+    assert state["calls"] == 2
+
+
+def test_invalidation_and_revalidation():
+    state = {"calls": 0, "agents": ["a"]}
+    client, cache = _gateway(state, ttl=0.0)
+    etag = client.get("/agents").headers["etag"]
+    # expired entry is revalidated; unchanged backend answers 304
+    assert client.get("/agents").headers["etag"] == etag
+    assert cache.revalidated == 1
+    state["agents"] = ["a", "b"]
+    assert cache.invalidate(["agents"]) == 1
+    assert client.get("/agents").json() == {"agents": ["a", "b"]}
+
+
+def test_stale_copy_served_when_backend_fails():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        if len(calls) > 1:
+            raise httpx.ConnectError("down")
+        return httpx.Response(200, json={"agents": []}, headers={"ETag": 'W/"x"'})
+
+    conn = ServiceConnector("http://registry-stale")
+    conn.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cache = ResponseCache(size=8, default_ttl=0.0, ttls={}, enabled=True)
+    request = Request(
+        {"type": "http", "method": "GET", "path": "/agents", "query_string": b"",
+         "headers": []}
+    )
+
+    async def scenario():
+        first = await cache.respond("agents", request, "", conn, "/agents")
+        second = await cache.respond("agents", request, "", conn, "/agents")
+        return first.body, second.body
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert len(calls) == 2
+
+
+def test_notify_write_posts_in_background_with_token(monkeypatch, caplog):
+    from core import http_cache
+
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(403 if len(sent) > 1 else 200)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        http_cache.httpx,
+        "AsyncClient",
+        lambda: real_client(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(http_cache, "GATEWAY_CACHE_INVALIDATE_URL", "http://gw/x")
+    monkeypatch.setattr(http_cache, "GATEWAY_SERVICE_TOKEN", "svc")
+
+    async def scenario():
+        http_cache.notify_write(["agents"])
+        # scheduled, not sent yet
+        assert sent == []
+        await asyncio.gather(*http_cache._pending)
+        http_cache.notify_write(["session:1"])
+        await asyncio.gather(*http_cache._pending)
+
+    asyncio.run(scenario())
+    assert sent[0].headers["authorization"] == "Bearer svc"
+    assert "cache invalidation for ['session:1'] failed" in caplog.text
@@ -0,0 +1,26 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import api_gateway.main as gateway
+from core.stream_utils import parse_sse
+
+pytestmark = pytest.mark.unit
+
+
+def test_stream_failure_is_reported_as_error_event(monkeypatch):
+    def down(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    monkeypatch.setattr(
+        gateway.dispatcher_conn,
+        "client",
+        httpx.AsyncClient(transport=httpx.MockTransport(down)),
+    )
+    client = TestClient(gateway.app)
+    resp = client.post("/chat/stream", json={"session_id": "s1", "message": "hi"})
+    assert resp.status_code == 200
+    events = list(parse_sse(resp.text.splitlines()))
+    assert events[0][0] == "session"
+    assert events[-1][0] == "error"
+    assert "ServiceUnavailable" in str(events[-1][1])
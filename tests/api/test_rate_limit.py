@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import rate_limit
+from core.rate_limit import (
+    MemoryBucketStore,
+    RateLimiter,
+    SQLiteBucketStore,
+    parse_rate,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class CountingStore(MemoryBucketStore):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def take(self, key, want, capacity, period):
+        self.calls += 1
+        return super().take(key, want, capacity, period)
+
+
+def _app(limiter, spec):
+    app = FastAPI()
+
+    @app.post("/task")
+    @limiter.limit(spec)
+    async def create_task(payload: dict) -> dict:
+        return payload
+
+    return TestClient(app)
+
+
+def test_parse_rate():
+    assert parse_rate("60/minute") == (60, 60.0)
+    assert parse_rate("5/seconds") == (5, 1.0)
+
+
+def test_limit_without_request_parameter():
+    client = _app(RateLimiter(store=MemoryBucketStore()), "2/minute")
+    assert client.post("/task", json={"a": 1}).json() == {"a": 1}
+    assert client.post("/task", json={}).status_code == 200
+    denied = client.post("/task", json={})
+    assert denied.status_code == 429
+    assert int(denied.headers["retry-after"]) >= 1
+
+
+def test_tokens_are_leased_in_batches():
+    store = CountingStore()
+    limiter = RateLimiter(store=store, batch=10)
+    for _ in range(100):
+        assert limiter.hit("k", 1000, 60) is None
+    assert store.calls == 10
+    # denials are remembered locally until tokens refill
+    limiter = RateLimiter(store=store, batch=10)
+    store.calls = 0
+    assert limiter.hit("small", 1, 60) is None
+    assert limiter.hit("small", 1, 60) is not None
+    assert limiter.hit("small", 1, 60) is not None
+    assert store.calls == 2
+
+
+def test_sqlite_store_is_shared(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = RateLimiter(store=SQLiteBucketStore(path), batch=1)
+    second = RateLimiter(store=SQLiteBucketStore(path), batch=1)
+    assert first.hit("ip:1", 3, 3600) is None
+    assert second.hit("ip:1", 3, 3600) is None
+    assert first.hit("ip:1", 3, 3600) is None
+    assert second.hit("ip:1", 3, 3600) is not None
+
+
+def test_user_and_tenant_quotas(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_TOKENS", {"svc"})
+    limiter = RateLimiter(
+        store=MemoryBucketStore(), user_limit="1/hour", tenant_limit="2/hour"
+    )
+    client = _app(limiter, "100/minute")
+
+    def post(user, tenant=None):
+        headers = {"Authorization": "Bearer svc", "X-User-Id": user}
+        if tenant:
+            headers["X-Tenant-Id"] = tenant
+        return client.post("/task", json={}, headers=headers).status_code
+
+    assert post("u1") == 200
+    assert post("u1") == 429
+    assert post("u2", "t") == 200
+    assert post("u3", "t") == 200
+    assert post("u4", "t") == 429
+
+
+def test_identity_headers_need_a_trusted_token(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_TOKENS", {"svc"})
+    limiter = RateLimiter(store=MemoryBucketStore(), user_limit="1/hour")
+    client = _app(limiter, "100/minute")
+    # rotating headers without a trusted token still hits the address quota
+    assert client.post("/task", json={}, headers={"X-User-Id": "a"}).status_code == 200
+    headers = {"X-User-Id": "b", "Authorization": "Bearer guess"}
+    assert client.post("/task", json={}, headers=headers).status_code == 429
+
+
+def test_limiter_overhead_is_small():
+    limiter = RateLimiter(store=MemoryBucketStore())
+    start = time.perf_counter()
+    for _ in range(1000):
+        limiter.hit("fast", 10**6, 60)
+    assert (time.perf_counter() - start) / 1000 < 0.001
+
+
+def test_local_leases_are_bounded():
+    limiter = RateLimiter(store=MemoryBucketStore(), local_keys=3)
+    for i in range(10):
+        limiter.hit(f"ip:{i}", 100, 60)
+    assert list(limiter._local) == ["ip:7", "ip:8", "ip:9"]
+
+
+def test_shared_store_runs_off_the_event_loop(tmp_path):
+    threads = []
+
+    class RecordingStore(SQLiteBucketStore):
+        def take(self, key, want, capacity, period):
+            threads.append(threading.get_ident())
+            return super().take(key, want, capacity, period)
+
+    limiter = RateLimiter(store=RecordingStore(str(tmp_path / "rl.db")), batch=1)
+
+    async def scenario():
+        return await limiter.ahit("k", 5, 60), threading.get_ident()
+
+    wait, loop_thread = asyncio.run(scenario())
+    assert wait is None
+    assert threads and threads[0] != loop_thread
+
+
+def test_missing_redis_is_an_error(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_BACKEND", "redis")
+    monkeypatch.setattr(rate_limit, "redis", None)
+    with pytest.raises(RuntimeError):
+        rate_limit.store_from_env()
+
+
+def test_cost_spends_several_tokens():
+    limiter = RateLimiter(store=MemoryBucketStore(), batch=1)
+    assert limiter.hit("k", 10, 60, tokens=6) is None
+    # four tokens left: a cost of five waits, a single call still passes
+    assert limiter.hit("k", 10, 60, tokens=5) is not None
+    assert limiter.hit("k", 10, 60) is None
+    assert limiter.hit("k", 10, 60, tokens=3) is None
+    assert limiter.hit("k", 10, 60) is not None
+
+
+def test_limit_charges_cost_of_call():
+    limiter = RateLimiter(store=MemoryBucketStore())
+    app = FastAPI()
+
+    @app.post("/batch")
+    @limiter.limit("5/minute", cost=lambda kwargs: len(kwargs["payload"]["tasks"]))
+    async def batch(payload: dict) -> dict:
+        return {"n": len(payload["tasks"])}
+
+    client = TestClient(app)
+    assert client.post("/batch", json={"tasks": [1, 2, 3]}).status_code == 200
+    assert client.post("/batch", json={"tasks": [1, 2, 3]}).status_code == 429
+    assert client.post("/batch", json={"tasks": [1, 2]}).status_code == 200
@@ -0,0 +1,183 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from api_gateway import connectors
+from api_gateway.connectors import CircuitBreaker, ServiceConnector, deadline_budget
+
+pytestmark = pytest.mark.unit
+
+
+def _connector(handler, base_url, **kw):
+    conn = ServiceConnector(base_url, **kw)
+    conn.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return conn
+
+
+async def _elapsed(fn):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await fn()
+    return loop.time() - start
+
+
+def test_identical_gets_share_one_call():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"agents": []})
+
+    async def scenario():
+        conn = _connector(handler, "http://registry-sf")
+        results = await asyncio.gather(*(conn.get("/agents") for _ in range(5)))
+        await conn.post("/x", {})
+        await conn.post("/x", {})
+        return results
+
+    assert asyncio.run(scenario()) == [{"agents": []}] * 5
+    assert calls == ["/agents", "/x", "/x"]
+
+
+def test_breaker_opens_and_probes():
+    calls = []
+    healthy = False
+
+    async def handler(request):
+        calls.append(1)
+        return httpx.Response(200 if healthy else 500, json={})
+
+    conn = _connector(handler, "http://flaky", retries=0)
+    conn.breaker = CircuitBreaker(failures=2, reset_timeout=0.05)
+
+    async def call():
+        try:
+            return await conn.get("/agents")
+        except HTTPException as exc:
+            return exc.detail
+
+    async def scenario():
+        nonlocal healthy
+        assert await call() == "ServiceUnavailable"
+        assert await call() == "ServiceUnavailable"
+        assert await call() == "CircuitOpen"
+        assert len(calls) == 2
+        await asyncio.sleep(0.06)
+        healthy = True
+        assert await call() == {}
+        assert conn.breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_retries_stop_at_deadline():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.headers.get(connectors.DEADLINE_HEADER))
+        raise httpx.ConnectError("down")
+
+    async def scenario():
+        conn = _connector(handler, "http://slow-dl", retries=5)
+        with deadline_budget(0.3):
+            with pytest.raises(HTTPException):
+                await conn.post("/task", {})
+
+    assert asyncio.run(_elapsed(scenario)) < 0.5
+    assert 1 <= len(calls) < 6
+    assert float(calls[0]) <= 0.3
+
+
+def test_hedged_get_uses_faster_reply():
+    replies = iter([5.0, 0.0])
+
+    async def handler(request):
+        await asyncio.sleep(next(replies, 0.0))
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        conn = _connector(handler, "http://hedge", hedge=True)
+        conn.latencies.extend([0.01] * connectors.HEDGE_MIN_SAMPLES)
+        return await conn.get("/context/s1")
+
+    assert asyncio.run(_elapsed(scenario)) < 1.0
+
+
+def test_probe_is_released_after_unexpected_error():
+    async def handler(request):
+        return httpx.Response(200, content=b"not json")
+
+    conn = _connector(handler, "http://wedged", retries=0)
+    conn.breaker = CircuitBreaker(failures=1, reset_timeout=0.0)
+    conn.breaker.record_failure()
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await conn.post("/x", {})
+        assert conn.breaker.state == "half_open"
+        assert conn.breaker.allow()
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_key_includes_method_and_body():
+    assert connectors._flight_key("GET", "/a", None) == connectors._flight_key(
+        "GET", "/a", None
+    )
+    assert connectors._flight_key("GET", "/a", None) != connectors._flight_key(
+        "POST", "/a", None
+    )
+    assert connectors._flight_key("POST", "/a", {"x": 1}) != connectors._flight_key(
+        "POST", "/a", {"x": 2}
+    )
+
+
+def test_shared_get_respects_each_callers_deadline():
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        conn = _connector(handler, "http://shared-dl")
+
+        async def short():
+            with deadline_budget(0.05):
+                try:
+                    return await conn.get("/agents")
+                except HTTPException as exc:
+                    return exc.detail
+
+        async def long():
+            with deadline_budget(1.0):
+                return await conn.get("/agents")
+
+        return await asyncio.gather(short(), long())
+
+    assert asyncio.run(scenario()) == ["DeadlineExceeded", {"ok": True}]
+
+
+def test_abandoned_shared_get_is_cancelled():
+    cancelled = []
+
+    async def handler(request):
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(request.url.path)
+            raise
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        conn = _connector(handler, "http://abandoned")
+        with deadline_budget(0.05):
+            with pytest.raises(HTTPException):
+                await conn.get("/agents")
+        await asyncio.sleep(0.01)
+        assert not conn._inflight
+
+    asyncio.run(scenario())
+    assert cancelled == ["/agents"]
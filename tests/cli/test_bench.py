@@ -0,0 +1,91 @@
+import json
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from sdk.cli.commands.bench import bench_app
+from sdk.cli.utils.loadtest import LoadProfile, LoadRunner, compare_reports, histogram
+
+pytestmark = pytest.mark.unit
+
+
+def test_runner_mix_and_sessions():
+    sent = []
+
+    def send(payload):
+        sent.append(payload)
+        if payload["task_type"] == "bad":
+            raise httpx.HTTPStatusError(
+                "boom", request=None, response=httpx.Response(503)
+            )
+        return {}
+
+    profile = LoadProfile.from_dict(
+        {
+            "model": "closed",
+            "concurrency": 2,
+            "requests": 20,
+            "sessions": 3,
+            "seed": 1,
+            "tasks": [
+                {"task_type": "chat", "weight": 3},
+                {"task_type": "bad", "weight": 1, "priority": 2},
+            ],
+        }
+    )
+    report = LoadRunner(profile, send).run()
+
+    assert report["summary"]["requests"] == 20
+    assert report["errors"] == {"http_503": report["task_types"]["bad"]["errors"]}
+    assert len({p["session_id"] for p in sent}) == 3
+    assert all(p["priority"] == 2 for p in sent if p["task_type"] == "bad")
+    assert sum(report["histogram_ms"].values()) == report["task_types"]["chat"][
+        "requests"
+    ]
+
+
+def test_open_loop_rate():
+    profile = LoadProfile(model="open", rate=200, duration=0.2)
+    report = LoadRunner(profile, lambda payload: {}).run()
+    assert 20 <= report["summary"]["requests"] <= 41
+
+
+def test_histogram_and_compare():
+    assert histogram([1, 7, 20000])["5"] == 1
+    assert histogram([1, 7, 20000])["+Inf"] == 1
+    base = {"summary": {"p50_ms": 10, "p95_ms": 20, "p99_ms": 30,
+                        "throughput": 100, "errors": 0, "requests": 100}}
+    cur = {"summary": {"p50_ms": 10, "p95_ms": 30, "p99_ms": 30,
+                       "throughput": 100, "errors": 5, "requests": 100}}
+    regressions = compare_reports(base, cur)
+    assert regressions == ["p95_ms: 20 -> 30", "error_rate: 0.000 -> 0.050"]
+
+
+def test_bench_run_command(tmp_path, monkeypatch):
+    original = httpx.Client
+    seen = []
+
+    def handler(request):
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={"result": "ok"})
+
+    monkeypatch.setattr(
+        "httpx.Client",
+        lambda base_url: original(
+            base_url=base_url, transport=httpx.MockTransport(handler)
+        ),
+    )
+    profile = tmp_path / "profile.yaml"
+    profile.write_text("tasks:\n  - task_type: chat\n    description: hi\n")
+    out = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        bench_app,
+        ["run", "--profile", str(profile), "--requests", "5", "--out", str(out)],
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(out.read_text())["summary"]["requests"] == 5
+    assert seen[0]["description"] == "hi"
+
+    result = CliRunner().invoke(bench_app, ["compare", str(out), str(out)])
+    assert result.exit_code == 0
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import core.delegation as delegation
+from core.agent_profile import AgentIdentity
+
+pytestmark = pytest.mark.unit
+
+
+def test_index_tracks_grants_and_expiry(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.agent_profile.PROFILE_DIR", tmp_path / "profiles")
+    monkeypatch.setattr(delegation, "DELEGATION_DIR", tmp_path / "delegations")
+    monkeypatch.setattr(delegation, "_index", None)
+    for name in ("boss", "lead", "dev"):
+        AgentIdentity(
+            name=name, role="", traits={}, skills=[], memory_index=None, created_at="now"
+        ).save()
+
+    past = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    future = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    delegation.grant_delegation("boss", "dev", "writer", expires_at=past)
+    assert delegation.has_valid_delegation("dev", "writer") is None
+
+    delegation.grant_delegation("lead", "dev", "writer", expires_at=future)
+    grant = delegation.has_valid_delegation("dev", "writer")
+    assert grant is not None and grant.delegator == "lead"
+
+    assert delegation.sweep_expired_grants() == 1
+    entries = delegation.load_delegation_index()["dev"]["writer"]
+    assert [g["delegator"] for g in entries] == ["lead"]
+
+    delegation.revoke_grant("lead", "dev", "writer")
+    assert delegation.has_valid_delegation("dev", "writer") is None
+
+    # the index is rebuilt from the grant files when missing
+    delegation.grant_delegation("boss", "dev", "reviewer")
+    (tmp_path / "delegations" / "index.json").unlink()
+    monkeypatch.setattr(delegation, "_index", None)
+    assert delegation.has_valid_delegation("dev", "reviewer").delegator == "boss"
@@ -0,0 +1,148 @@
+import importlib
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.model_context import ModelContext, TaskContext
+from services.task_dispatcher.schemas import TaskRequest
+from services.task_dispatcher.service import TaskDispatcherService
+
+pytestmark = pytest.mark.unit
+
+
+class DummyResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+class DummyClient:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def post(self, url, json=None, timeout=10):
+        ctx = ModelContext(**json)
+        # the dispatcher sends the redacted description
+        text = ctx.task_context.description.text
+        if text == "fail":
+            raise RuntimeError("worker down")
+        ctx.result = text
+        return DummyResponse(ctx.model_dump())
+
+
+def _service(monkeypatch, fetched, checked):
+    monkeypatch.setenv("DISABLE_SIGNATURE_VALIDATION", "true")
+    monkeypatch.setattr("httpx.Client", lambda: DummyClient())
+    service = TaskDispatcherService()
+
+    def fetch(capability):
+        fetched.append(capability)
+        return [{"id": "a1", "name": "a1", "role": "writer", "url": "http://a1"}]
+
+    def allowed(agent, ctx):
+        checked.append(ctx.uuid)
+        return True
+
+    monkeypatch.setattr(service, "_fetch_agents", fetch)
+    monkeypatch.setattr(service, "_governance_allowed", allowed)
+    return service
+
+
+def test_batch_shares_lookups(monkeypatch):
+    fetched, checked = [], []
+    service = _service(monkeypatch, fetched, checked)
+    tasks = [TaskContext(task_type="demo", description=str(i)) for i in range(6)]
+    tasks.append(TaskRequest(task_type="other", description="x", session_id=None))
+
+    results = dict(service.dispatch_batch(tasks, max_concurrency=3))
+
+    assert sorted(results) == list(range(7))
+    assert [results[i].result for i in range(6)] == [str(i) for i in range(6)]
+    assert sorted(fetched) == ["demo", "other"]
+    assert len(checked) == 2
+
+
+def test_batch_route_streams_ndjson(monkeypatch):
+    monkeypatch.setenv("RATE_LIMITS_ENABLED", "false")
+    routes = importlib.reload(importlib.import_module("services.task_dispatcher.routes"))
+    fetched, checked = [], []
+    monkeypatch.setattr(routes, "service", _service(monkeypatch, fetched, checked))
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    resp = TestClient(app).post(
+        "/dispatch/batch",
+        json={
+            "tasks": [
+                {"task_type": "demo", "description": "ok"},
+                {"task_type": "demo", "description": "fail"},
+            ],
+            "max_concurrency": 2,
+        },
+    )
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = {item["index"]: item for item in map(json.loads, resp.text.splitlines())}
+    assert lines[0]["context"]["result"] == "ok"
+    # worker errors are absorbed into the context like for /task
+    assert lines[1]["context"]["result"] is None
+
+
+
+def test_batch_route_charges_one_token_per_task(monkeypatch):
+    monkeypatch.setenv("RATE_LIMITS_ENABLED", "true")
+    monkeypatch.setenv("RATE_LIMIT_TASK", "3/minute")
+    routes = importlib.reload(importlib.import_module("services.task_dispatcher.routes"))
+    monkeypatch.setattr(routes, "service", _service(monkeypatch, [], []))
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+    tasks = [{"task_type": "demo", "description": "ok"}] * 2
+
+    assert client.post("/dispatch/batch", json={"tasks": tasks}).status_code == 200
+    assert client.post("/dispatch/batch", json={"tasks": tasks}).status_code == 429
+
+def test_batch_does_not_share_delegated_eligibility(monkeypatch):
+    fetched, checked = [], []
+    service = _service(monkeypatch, fetched, checked)
+
+    def delegated(agent, ctx):
+        checked.append(ctx.uuid)
+        ctx.delegate_info = {"delegator": "boss", "role": agent["role"]}
+        return True
+
+    monkeypatch.setattr(service, "_governance_allowed", delegated)
+    tasks = [TaskContext(task_type="demo", description=str(i)) for i in range(3)]
+
+    results = dict(service.dispatch_batch(tasks, max_concurrency=1))
+
+    assert len(checked) == 3
+    assert all(results[i].delegate_info for i in range(3))
+
+
+def test_shared_eligibility_is_audited_per_context(monkeypatch):
+    fetched, checked = [], []
+    service = _service(monkeypatch, fetched, checked)
+    entries = []
+    monkeypatch.setattr(
+        service.audit, "write", lambda entry: entries.append(entry) or str(len(entries))
+    )
+    tasks = [TaskContext(task_type="demo", description=str(i)) for i in range(3)]
+
+    results = dict(service.dispatch_batch(tasks, max_concurrency=1))
+
+    shared = [e for e in entries if e.action == "eligibility_shared"]
+    assert len(shared) == 2
+    by_id = {str(i + 1): e for i, e in enumerate(entries)}
+    for ctx in results.values():
+        for log_id in ctx.audit_trace:
+            assert by_id[log_id].context_id == ctx.uuid
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from core.governance import AgentContract
+from core.model_context import ModelContext, TaskContext
+from core.stream_utils import parse_sse, sse_event
+from services.task_dispatcher.service import TaskDispatcherService
+
+pytestmark = pytest.mark.unit
+
+
+class DummyStream:
+    def __init__(self, lines):
+        self._lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+
+class DummyClient:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def post(self, url, json=None, timeout=10):
+        return None
+
+    def stream(self, method, url, content=None, headers=None, timeout=10):
+        assert url.endswith("/run/stream")
+        ctx = ModelContext.model_validate_json(content)
+        ctx.result = "hi there"
+        ctx.metrics = {"tokens_used": 2}
+        frames = (
+            sse_event("token", {"token": "hi"})
+            + sse_event("token", {"token": " there"})
+            + sse_event("done", ctx.model_dump_json())
+        )
+        return DummyStream(frames.splitlines())
+
+
+def test_stream_task_forwards_tokens(monkeypatch, tmp_path):
+    monkeypatch.setenv("DISABLE_SIGNATURE_VALIDATION", "true")
+    monkeypatch.setenv("CONTRACT_DIR", str(tmp_path))
+    AgentContract(
+        agent="a1",
+        allowed_roles=["writer"],
+        max_tokens=0,
+        trust_level_required=0.0,
+        constraints={},
+    ).save()
+    monkeypatch.setattr("httpx.Client", lambda: DummyClient())
+    service = TaskDispatcherService()
+    monkeypatch.setattr(
+        service,
+        "_fetch_agents",
+        lambda c: [{"id": "a1", "name": "a1", "role": "writer", "url": "http://a1"}],
+    )
+    frames = "".join(service.stream_task(TaskContext(task_type="demo")))
+    events = list(parse_sse(frames.splitlines()))
+    tokens = [json.loads(d)["token"] for e, d in events if e == "token"]
+    assert tokens == ["hi", " there"]
+    event, data = events[-1]
+    assert event == "done"
+    ctx = ModelContext.model_validate_json(data)
+    assert ctx.agent_selection == "a1"
+    assert ctx.result == "hi there"
+    assert ctx.dispatch_state == "completed"
+
+
+def test_stream_task_reports_worker_errors(monkeypatch, tmp_path):
+    monkeypatch.setenv("DISABLE_SIGNATURE_VALIDATION", "true")
+    monkeypatch.setenv("CONTRACT_DIR", str(tmp_path))
+
+    class FailingClient(DummyClient):
+        def stream(self, method, url, content=None, headers=None, timeout=10):
+            raise RuntimeError("worker down")
+
+    monkeypatch.setattr("httpx.Client", lambda: FailingClient())
+    service = TaskDispatcherService()
+    monkeypatch.setattr(
+        service,
+        "_fetch_agents",
+        lambda c: [{"id": "a1", "name": "a1", "role": "writer", "url": "http://a1"}],
+    )
+    frames = "".join(service.stream_task(TaskContext(task_type="demo")))
+    events = list(parse_sse(frames.splitlines()))
+    assert [e for e, _ in events] == ["error", "done"]
+    assert json.loads(events[0][1]) == {"agent": "a1", "error": "worker down"}
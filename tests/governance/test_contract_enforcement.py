@@ -1,3 +1,5 @@
+import pytest
+
 from core.model_context import TaskContext, AgentRunContext
 from core.governance import AgentContract
 from services.task_dispatcher.service import TaskDispatcherService
@@ -22,3 +24,51 @@ def test_dispatch_denies_untrusted(monkeypatch, tmp_path):
 
     ctx = service.dispatch_task(TaskContext(task_type="demo"))
     assert ctx.warning == "trust level too low"
+
+
+@pytest.mark.unit
+def test_recorded_error_comes_from_agent_run(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    from core.model_context import ModelContext
+
+    service = TaskDispatcherService()
+    agent = {"id": "a1", "name": "a1", "role": "demo", "url": "http://a1"}
+    # warning left by the governance check of another candidate
+    ctx = ModelContext(task_context=TaskContext(task_type="demo"))
+    ctx.warning = "trust level too low"
+    arc = AgentRunContext(agent_id="a1", result="ok", metrics={"tokens_used": 5})
+    service._apply_single_result(ctx, agent, arc)
+
+    history = AgentContract.load("a1").constraints["task_history"]
+    assert history[-1]["error"] is None
+
+
+@pytest.mark.unit
+def test_failed_worker_call_is_recorded(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    from core.model_context import ModelContext
+
+    service = TaskDispatcherService()
+    agent = {"id": "a1", "name": "a1", "role": "demo", "url": "http://a1"}
+    ctx = ModelContext(task_context=TaskContext(task_type="demo"))
+    service._apply_single_result(ctx, agent, AgentRunContext(agent_id="a1", error="down"))
+
+    contract = AgentContract.load("a1")
+    assert contract.constraints["task_history"][-1]["success"] is False
+    assert contract.constraints["task_history"][-1]["error"] == "down"
+    assert contract.constraints["trust_aggregate"]["reliability_sum"] == 0.0
+
+
+@pytest.mark.unit
+def test_failed_save_leaves_no_temp_file(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    contract = AgentContract(
+        agent="a1",
+        allowed_roles=["demo"],
+        max_tokens=100,
+        trust_level_required=0.0,
+        constraints={"bad": object()},
+    )
+    with pytest.raises(TypeError):
+        contract.save()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.stream_utils import parse_sse
+from services.llm_gateway.routes import router
+
+pytestmark = pytest.mark.unit
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_chat_stream_emits_tokens_and_done():
+    resp = client.post("/chat/stream", json={"task": "hello streaming world"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = list(parse_sse(resp.text.splitlines()))
+    tokens = [json.loads(d)["token"] for e, d in events if e == "token"]
+    assert len(tokens) == 3
+    event, data = events[-1]
+    assert event == "done"
+    done = json.loads(data)
+    assert "".join(tokens) == done["completion"]
+    assert done["tokens_used"] == 3
@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from agentnn.mcp.mcp_client import AsyncMCPClient
+from agentnn.session.session_manager import SessionManager
+from core import tracing
+from core.model_context import ModelContext, TaskContext
+
+pytestmark = pytest.mark.unit
+
+
+class SlowClient:
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+
+    async def execute(self, ctx):
+        self.calls.append(ctx.agent_selection)
+        await asyncio.sleep(self.delay)
+        if ctx.agent_selection in self.fail:
+            raise RuntimeError("down")
+        ctx.result = f"{ctx.agent_selection} done"
+        return ctx
+
+
+def _manager(client):
+    manager = SessionManager()
+    manager.async_client = client
+    return manager
+
+
+def test_tier_runs_concurrently():
+    client = SlowClient()
+    manager = _manager(client)
+    sid = manager.create_session()
+    for name in ("a", "b", "c", "d"):
+        manager.add_agent(sid, name)
+
+    start = time.perf_counter()
+    ctx = asyncio.run(manager.run_task_async(sid, "hi"))
+    assert time.perf_counter() - start < 4 * client.delay
+    assert ctx.result == "d done"
+    assert len(manager.get_session(sid)["message_history"]) == 4
+
+
+def test_exclusive_stops_lower_tiers_and_errors_recorded():
+    client = SlowClient(fail={"b"})
+    manager = _manager(client)
+    sid = manager.create_session()
+    manager.add_agent(sid, "a", priority=1, exclusive=True)
+    manager.add_agent(sid, "b", priority=1)
+    manager.add_agent(sid, "c", priority=2)
+
+    ctx = asyncio.run(manager.run_task_async(sid, "hi"))
+    assert ctx.result == "a done"
+    assert "c" not in client.calls
+    history = manager.get_session(sid)["message_history"]
+    assert [h["agent"] for h in history] == ["a", "b"]
+    assert history[1]["error"] == "down"
+
+
+def test_all_agents_failing_raises():
+    manager = _manager(SlowClient(delay=0, fail={"a"}))
+    sid = manager.create_session()
+    manager.add_agent(sid, "a")
+    with pytest.raises(RuntimeError):
+        asyncio.run(manager.run_task_async(sid, "hi"))
+
+
+def test_async_client_shares_pool(monkeypatch):
+    original = httpx.AsyncClient
+
+    def handler(request):
+        return httpx.Response(200, json={"result": "ok", "task": "x"})
+
+    monkeypatch.setattr(
+        "httpx.AsyncClient",
+        lambda **kw: original(transport=httpx.MockTransport(handler), **kw),
+    )
+
+    async def scenario():
+        client = AsyncMCPClient("http://mcp")
+        ctx = ModelContext(task_context=TaskContext(task_type="chat"))
+        results = await asyncio.gather(*(client.execute(ctx) for _ in range(3)))
+        pool = client._client
+        await client.execute(ctx)
+        assert client._client is pool
+        await client.aclose()
+        return results
+
+    assert [r.result for r in asyncio.run(scenario())] == ["ok"] * 3
+
+
+def test_async_client_closes_pool_of_previous_loop(monkeypatch):
+    original = httpx.AsyncClient
+
+    def handler(request):
+        return httpx.Response(200, json={"result": "ok", "task": "x"})
+
+    monkeypatch.setattr(
+        "httpx.AsyncClient",
+        lambda **kw: original(transport=httpx.MockTransport(handler), **kw),
+    )
+    client = AsyncMCPClient("http://mcp")
+    ctx = ModelContext(task_context=TaskContext(task_type="chat"))
+
+    asyncio.run(client.execute(ctx))
+    first = client._client
+    asyncio.run(client.execute(ctx))
+    assert client._client is not first
+    assert first.is_closed
+    asyncio.run(client.aclose())
+
+
+def test_async_client_propagates_traceparent(monkeypatch):
+    seen = []
+
+    async def handle(transport, request):
+        seen.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json={"result": "ok", "task": "x"})
+
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", handle)
+    tracing.set_exporter(tracing.NoOpSpanExporter())
+
+    async def scenario():
+        client = AsyncMCPClient("http://mcp")
+        ctx = ModelContext(task_context=TaskContext(task_type="chat"))
+        with tracing.start_span("root") as root:
+            await client.execute(ctx)
+        await client.aclose()
+        return root
+
+    try:
+        root = asyncio.run(scenario())
+    finally:
+        tracing.set_exporter(None)
+    assert seen[0].startswith(f"00-{root.trace_id}-")
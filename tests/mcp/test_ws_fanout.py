@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agentnn.mcp.mcp_ws import MCPWebSocketServer, Subscription
+
+pytestmark = pytest.mark.unit
+
+
+def _client(server):
+    app = FastAPI()
+    app.include_router(server.router)
+    return TestClient(app)
+
+
+def test_events_routed_by_session():
+    server = MCPWebSocketServer()
+    with _client(server) as client:
+        with client.websocket_connect("/ws/session/a") as ws_a, \
+                client.websocket_connect("/ws/session/*") as ws_all:
+            with client.websocket_connect("/ws/session/b") as ws_b:
+                # publish from a foreign thread, as the sync SessionManager does
+                thread = threading.Thread(
+                    target=lambda: [
+                        server.publish({"event": "x", "session_id": "b"}),
+                        server.publish({"event": "y", "session_id": "a"}),
+                    ]
+                )
+                thread.start()
+                thread.join()
+                assert ws_b.receive_json()["event"] == "x"
+                assert ws_a.receive_json()["event"] == "y"
+                assert [ws_all.receive_json()["event"] for _ in range(2)] == ["x", "y"]
+            for _ in range(100):
+                if len(server.connections) == 2:
+                    break
+                time.sleep(0.01)
+            assert len(server.connections) == 2
+
+
+def test_slow_consumer_coalesced_or_dropped():
+    async def scenario():
+        sub = Subscription(websocket=None, sid="s", maxsize=2)
+        for i in range(5):
+            assert sub.offer({"n": i}, "coalesce")
+        assert sub.dropped == 3
+        assert [sub.queue.get_nowait()["n"] for _ in range(2)] == [3, 4]
+
+        sub = Subscription(websocket=None, sid="s", maxsize=1)
+        assert sub.offer({"n": 0}, "disconnect")
+        assert not sub.offer({"n": 1}, "disconnect")
+
+    asyncio.run(scenario())
+
+
+def test_publish_without_subscribers_is_noop():
+    server = MCPWebSocketServer()
+    server.publish({"event": "x", "session_id": "a"})
+    asyncio.run(server.broadcast({"event": "x"}))
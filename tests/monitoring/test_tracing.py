@@ -0,0 +1,117 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import tracing
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def _enabled(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+
+
+def test_spans_propagate_and_export(tmp_path):
+    exporter = tracing.FileSpanExporter(tmp_path)
+    tracing.set_exporter(exporter)
+    try:
+        app = FastAPI()
+        app.add_middleware(tracing.TracingMiddleware, service="svc")
+
+        @app.get("/ctx/{cid}")
+        async def handler(cid: str) -> dict:
+            tracing.set_attribute("context_id", cid)
+            with tracing.start_span("slow"):
+                with tracing.start_span("inner"):
+                    pass
+            with tracing.start_span("fast"):
+                pass
+            return tracing.inject_headers()
+
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        parent = f"00-{trace_id}-00f067aa0ba902b7-01"
+        resp = TestClient(app).get("/ctx/c1", headers={"traceparent": parent})
+        assert resp.json()["traceparent"].startswith(f"00-{trace_id}-")
+        exporter.flush()
+    finally:
+        tracing.set_exporter(None)
+
+    spans = tracing.spans_for_context(tracing.load_spans(tmp_path), "c1")
+    assert {s.trace_id for s in spans} == {trace_id}
+    server = next(s for s in spans if s.kind == "server")
+    assert server.name == "GET /ctx/{cid}"
+    assert server.parent_id == "00f067aa0ba902b7"
+
+    path = [(depth, span.name) for depth, span in tracing.critical_path(spans)]
+    assert path == [(0, "GET /ctx/{cid}"), (1, "fast")]
+
+
+def test_invalid_traceparent_starts_new_trace():
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+
+
+def test_traced_client_propagates_only_on_wrapped_clients(tmp_path):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("traceparent"))
+        return httpx.Response(200)
+
+    exporter = tracing.FileSpanExporter(tmp_path)
+    tracing.set_exporter(exporter)
+    try:
+        with tracing.start_span("root") as root:
+            transport = httpx.MockTransport(handler)
+            with tracing.traced(httpx.Client(transport=transport)) as client:
+                client.get("http://svc/a")
+            with httpx.Client(transport=transport) as client:
+                client.get("http://svc/b")
+        exporter.flush()
+    finally:
+        tracing.set_exporter(None)
+
+    client_span = next(s for s in tracing.load_spans(tmp_path) if s.kind == "client")
+    assert client_span.parent_id == root.span_id
+    assert client_span.attributes["http.status_code"] == "200"
+    assert seen == [client_span.traceparent(), None]
+
+
+def test_traced_is_noop_when_disabled(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    client = httpx.Client()
+    assert tracing.traced(client).event_hooks == {"request": [], "response": []}
+
+
+def test_file_exporter_rotates(tmp_path):
+    exporter = tracing.FileSpanExporter(tmp_path, max_bytes=1)
+    span = tracing.Span(name="s", service="svc", trace_id="1" * 32, end_ns=1)
+    for _ in range(3):
+        exporter.export([span])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["svc.jsonl", "svc.jsonl.1"]
+
+
+def test_load_spans_reads_rotated_files(tmp_path):
+    exporter = tracing.FileSpanExporter(tmp_path, max_bytes=1)
+    for name in ("old", "new"):
+        span = tracing.Span(name=name, service="svc", trace_id="1" * 32, end_ns=1)
+        exporter.export([span])
+    assert [s.name for s in tracing.load_spans(tmp_path)] == ["old", "new"]
+
+
+def test_middleware_passes_through_when_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    app = FastAPI()
+    app.add_middleware(tracing.TracingMiddleware, service="svc")
+
+    @app.get("/")
+    async def handler() -> dict:
+        return {"span": tracing.current_span() is not None}
+
+    resp = TestClient(app).get("/")
+    assert resp.json() == {"span": False}
+    assert "traceparent" not in resp.headers
+
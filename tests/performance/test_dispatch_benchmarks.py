@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import core.governance
+from benchmarks.dispatch_benchmarks import StubConfig, compare, percentile, run_suite
+
+pytestmark = pytest.mark.unit
+
+
+def test_suite_reports_all_modes(tmp_path, monkeypatch):
+    monkeypatch.delenv("DISABLE_SIGNATURE_VALIDATION", raising=False)
+    contracts = core.governance.CONTRACT_DIR
+    cwd = Path.cwd()
+    config = StubConfig(agents=2, worker_latency_ms=0, worker_jitter_ms=0)
+    modes = ["single", "parallel", "voting", "orchestrated", "coalition"]
+    report = run_suite(modes, 4, 2, config, tmp_path / "bench")
+
+    assert Path.cwd() == cwd
+    assert "DISABLE_SIGNATURE_VALIDATION" not in os.environ
+    assert core.governance.CONTRACT_DIR == contracts
+    assert (tmp_path / "bench" / "contracts" / "bench_agent0.json").exists()
+    assert any((tmp_path / "bench" / "audit").iterdir())
+
+    assert [r["mode"] for r in report["results"]] == modes
+    for result in report["results"]:
+        assert result["errors"] == 0
+        assert result["throughput"] > 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_compare_flags_regressions():
+    base = {
+        "results": [
+            {"mode": "single", "p50_ms": 10, "p95_ms": 20, "p99_ms": 30,
+             "throughput": 100, "errors": 0, "requests": 10}
+        ]
+    }
+    current = {
+        "results": [
+            {"mode": "single", "p50_ms": 10.5, "p95_ms": 25, "p99_ms": 30,
+             "throughput": 80, "errors": 1, "requests": 10}
+        ]
+    }
+    regressions = compare(current, base, tolerance=0.1)
+    assert any("p95_ms" in r for r in regressions)
+    assert any("throughput" in r for r in regressions)
+    assert "single: error_rate: 0.000 -> 0.100" in regressions
+    assert not any("p50_ms" in r for r in regressions)
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([1, 2], 99) == 2
+    assert percentile([5], 0) == 5
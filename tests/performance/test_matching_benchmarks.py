@@ -0,0 +1,27 @@
+import pytest
+
+from core.utils.imports import torch
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.skipif(torch is None, reason="Torch not installed"),
+]
+
+from benchmarks.matching_benchmarks import _agents, _batched, _per_agent, main  # noqa: E402
+from managers.hybrid_matcher import HybridMatcher  # noqa: E402
+
+
+def test_batched_ranking_matches_per_agent_baseline():
+    matcher = HybridMatcher()
+    matcher.meta_learner.eval()
+    agents = _agents(20, matcher)
+    task_embedding = torch.randn(1, matcher.embedding_size)
+    assert _batched(matcher, task_embedding, agents) == _per_agent(
+        matcher, task_embedding, agents
+    )
+
+
+def test_main_writes_report(tmp_path):
+    out = tmp_path / "report.json"
+    assert main(["--agents", "3,10", "--repeats", "1", "--out", str(out)]) == 0
+    assert out.read_text().count('"mode"') == 4
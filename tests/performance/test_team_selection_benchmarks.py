@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.team_selection_benchmarks import main, measure
+
+pytestmark = pytest.mark.unit
+
+
+def test_measure_skips_large_exhaustive_search():
+    assert measure("exhaustive", 150, 3, repeats=1, train_rounds=5).skipped
+    result = measure("beam", 150, 3, repeats=1, train_rounds=5)
+    assert not result.skipped
+    assert result.median_ms is not None
+
+
+def test_main_writes_report(tmp_path):
+    out = tmp_path / "report.json"
+    assert main(["--agents", "6,12", "--repeats", "1", "--out", str(out)]) == 0
+    assert out.read_text().count('"selection"') == 6
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+import core.reputation as mod
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def ratings(tmp_path, monkeypatch):
+    monkeypatch.setattr(mod, "RATING_DIR", tmp_path)
+    monkeypatch.setattr(mod, "REPUTATION_COMPACT_AT", 6)
+    monkeypatch.setattr(mod, "REPUTATION_KEEP", 2)
+    monkeypatch.setattr(mod, "_COMPACTIONS", {})
+    return tmp_path
+
+
+def _rating(value, to_agent="a2"):
+    return mod.AgentRating(
+        "a1", to_agent, None, value, None, [], datetime.utcnow().isoformat()
+    )
+
+
+def test_summary_maintained_and_compacted(ratings):
+    values = [0.2, 0.4, 0.6, 0.8, 1.0, 0.5, 0.9]
+    for value in values:
+        mod.save_rating(_rating(value))
+    # the seventh rating scheduled compaction of all but the newest two
+    mod._COMPACTIONS["a2"].join(timeout=5)
+
+    summary = mod.load_summary("a2")
+    assert summary.count == len(values)
+    assert summary.ledger_lines == 3
+    assert abs(summary.mean - sum(values) / len(values)) < 1e-9
+    assert summary.window[-1] == 0.9
+    lines = (ratings / "a2.jsonl").read_text().splitlines()
+    assert len(lines) == 3
+    assert [r.rating for r in mod.load_ratings("a2")] == [0.5, 0.9]
+
+    (ratings / "a2.summary.json").unlink()
+    rebuilt = mod.rebuild_summary("a2")
+    assert rebuilt.count == summary.count
+    assert abs(rebuilt.mean - summary.mean) < 1e-9
+    assert abs(rebuilt.decayed_mean - summary.decayed_mean) < 1e-9
+
+
+def test_concurrent_ratings_are_all_counted(ratings, monkeypatch):
+    monkeypatch.setattr(mod, "REPUTATION_COMPACT_AT", 0)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: mod.save_rating(_rating(i / 40)), range(40)))
+    summary = mod.load_summary("a2")
+    assert summary.count == summary.ledger_lines == 40
+    assert len(mod.load_ratings("a2")) == 40
@@ -1,5 +1,11 @@
 import json
+
+import httpx
+import pytest
+
+from core.model_context import TaskContext
 from sdk.client import AgentClient
+from sdk.config import SDKSettings
 
 
 class DummyResponse:
@@ -58,3 +64,42 @@ def test_new_helpers(monkeypatch):
     assert "/sessions" in paths[1]
     assert "/embed" in paths[2]
     assert "/dispatch" in paths[3]
+
+
+@pytest.mark.unit
+def test_dispatch_batch_streams_results(monkeypatch):
+    original = httpx.Client
+
+    def handler(request):
+        tasks = json.loads(request.content)["tasks"]
+        lines = [json.dumps({"index": i, "context": {"result": i}}) for i in range(len(tasks))]
+        return httpx.Response(200, text="\n".join(reversed(lines)) + "\n")
+
+    monkeypatch.setattr(
+        "httpx.Client",
+        lambda base_url: original(base_url=base_url, transport=httpx.MockTransport(handler)),
+    )
+    client = AgentClient()
+    results = list(
+        client.dispatch_batch([TaskContext(task_type="demo"), {"task_type": "x"}])
+    )
+    assert [r["index"] for r in results] == [1, 0]
+
+
+@pytest.mark.unit
+def test_post_sends_token_and_timeout(monkeypatch):
+    original = httpx.Client
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    monkeypatch.setattr(
+        "httpx.Client",
+        lambda base_url: original(base_url=base_url, transport=httpx.MockTransport(handler)),
+    )
+    client = AgentClient(SDKSettings(host="http://gw", api_token="t"))
+    assert client.post("/task", {"task": "x"}, timeout=2.0) == {"ok": True}
+    assert seen[0].headers["Authorization"] == "Bearer t"
+    assert seen[0].extensions["timeout"]["read"] == 2.0
@@ -0,0 +1,146 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core import tracing
+from core.model_context import ModelContext
+from services.federation_manager.service import FederationManagerService
+
+pytestmark = pytest.mark.unit
+
+
+class DummyResp:
+    def __init__(self, data, status=200):
+        self._data = data
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            request = httpx.Request("POST", "http://node")
+            raise httpx.HTTPStatusError(
+                "error", request=request, response=httpx.Response(self.status_code)
+            )
+
+    def json(self):
+        return self._data
+
+
+def _service(*names):
+    svc = FederationManagerService()
+    for name in names:
+        svc.register_node(name, f"http://{name}")
+    return svc
+
+
+def test_slow_and_failing_nodes_are_avoided():
+    svc = _service("fast", "slow", "flaky")
+    svc.nodes["fast"].latency_ewma = 0.01
+    svc.nodes["slow"].latency_ewma = 1.0
+    svc.nodes["flaky"].latency_ewma = 0.01
+    svc.nodes["flaky"].error_rate = 0.9
+    picks = [svc._select_node().name for _ in range(200)]
+    assert picks.count("fast") > 120
+    assert "slow" in picks or "flaky" in picks  # p2c still samples others
+    svc.nodes["fast"].healthy = False
+    assert "fast" not in {svc._select_node().name for _ in range(50)}
+
+
+def test_failover_to_another_node():
+    svc = _service("n1", "n2")
+    svc.nodes["n2"].latency_ewma = 5.0
+    calls = []
+
+    def fake_post(url, json, timeout):
+        calls.append(url)
+        if url.startswith("http://n1"):
+            raise httpx.ConnectError("down")
+        return DummyResp(json)
+
+    with patch("httpx.Client.post", side_effect=fake_post):
+        result = svc.dispatch(None, ModelContext(task="t"))
+
+    assert result.task == "t"
+    assert calls == ["http://n1/dispatch", "http://n2/dispatch"]
+    assert svc.nodes["n1"].failure_count == 1
+    assert svc.nodes["n2"].tasks_sent == 1
+
+
+def test_client_errors_are_not_failed_over():
+    svc = _service("n1", "n2")
+
+    def fake_post(url, json, timeout):
+        return DummyResp({}, status=422)
+
+    with patch("httpx.Client.post", side_effect=fake_post) as post:
+        with pytest.raises(httpx.HTTPStatusError):
+            svc.dispatch(None, ModelContext(task="t"))
+    assert post.call_count == 1
+
+
+def test_probes_eject_and_restore_nodes():
+    svc = _service("n1", "n2")
+    up = {"http://n1/health": False, "http://n2/health": True}
+
+    def fake_get(url, timeout):
+        if not up[url]:
+            raise httpx.ConnectError("down")
+        return DummyResp({"status": "ok"})
+
+    with patch("httpx.Client.get", side_effect=fake_get):
+        svc.probe_nodes()
+        assert not svc.nodes["n1"].healthy
+        assert {svc._select_node().name for _ in range(20)} == {"n2"}
+        up["http://n1/health"] = True
+        svc.probe_nodes()
+    assert svc.nodes["n1"].healthy
+
+
+def test_probes_leave_dispatch_statistics_alone():
+    svc = _service("n1")
+    node = svc.nodes["n1"]
+    node.record(0.2, ok=False)
+    before = (node.error_rate, node.failure_count, node.latency_ewma)
+
+    with patch("httpx.Client.get", side_effect=httpx.ConnectError("down")):
+        svc.probe_nodes()
+    assert not node.healthy and node.consecutive_failures == 2
+    with patch("httpx.Client.get", return_value=DummyResp({"status": "ok"})):
+        svc.probe_nodes()
+    assert node.healthy and node.consecutive_failures == 0
+    assert (node.error_rate, node.failure_count, node.latency_ewma) == before
+
+
+def test_forwarded_tasks_carry_traceparent(monkeypatch):
+    seen = []
+
+    def handle(transport, request):
+        seen.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json=ModelContext(task="t").model_dump(mode="json"))
+
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", handle)
+    tracing.set_exporter(tracing.NoOpSpanExporter())
+    try:
+        svc = _service("n1")
+        with tracing.start_span("root") as root:
+            svc.dispatch("n1", ModelContext(task="t"))
+    finally:
+        tracing.set_exporter(None)
+    assert seen[0].startswith(f"00-{root.trace_id}-")
+
+
+def test_direct_mode_reuses_shared_client():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json=ModelContext(task="t").model_dump(mode="json"))
+
+    svc = _service("n1")
+    svc.forward_mode = "direct"
+    svc._http = httpx.Client(transport=httpx.MockTransport(handler))
+    for _ in range(3):
+        assert svc.dispatch("n1", ModelContext(task="t")).task == "t"
+    assert requests == ["/dispatch"] * 3
+    assert svc._client() is svc._http
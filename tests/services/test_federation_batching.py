@@ -0,0 +1,177 @@
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from core.compression import GzipRequestMiddleware, gzip_body, gzip_stream
+from core.model_context import ModelContext, TaskContext
+from core.stream_utils import ndjson_line
+from services.federation_manager import service as fed
+from services.federation_manager.service import (
+    FederationManagerService,
+    RemoteTaskError,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _remote(requests):
+    def handler(request):
+        assert request.headers["content-encoding"] == "gzip"
+        payload = json.loads(gzip.decompress(request.content))
+        requests.append(payload["tasks"])
+        lines = []
+        for i, task in enumerate(payload["tasks"]):
+            if task["task_type"] == "bad":
+                lines.append(ndjson_line({"index": i, "error": "rejected"}))
+            else:
+                ctx = ModelContext(
+                    task_context=TaskContext(task_type=task["task_type"]),
+                    session_id=task["session_id"],
+                )
+                context = ctx.model_dump(mode="json")
+                lines.append(ndjson_line({"index": i, "context": context}))
+        # answer in reverse order to exercise demultiplexing
+        return httpx.Response(200, content="".join(reversed(lines)).encode())
+
+    return handler
+
+
+def _service(requests, monkeypatch, linger_ms=50):
+    monkeypatch.setattr(fed, "FEDERATION_BATCH_LINGER_MS", linger_ms)
+    svc = FederationManagerService()
+    svc.forward_mode = "batch"
+    svc.register_node("remote", "http://remote")
+    svc._http = httpx.Client(transport=httpx.MockTransport(_remote(requests)))
+    return svc
+
+
+def test_concurrent_dispatches_share_one_request(monkeypatch):
+    requests = []
+    svc = _service(requests, monkeypatch)
+
+    def send(i):
+        ctx = ModelContext(
+            task_context=TaskContext(task_type="chat"), session_id=f"s{i}"
+        )
+        return svc.dispatch("remote", ctx)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(send, range(8)))
+
+    assert [r.session_id for r in results] == [f"s{i}" for i in range(8)]
+    assert len(requests) == 1
+    assert len(requests[0]) == 8
+    assert svc.nodes["remote"].tasks_sent == 8
+
+
+def test_batch_max_closes_window_early(monkeypatch):
+    requests = []
+    svc = _service(requests, monkeypatch, linger_ms=5000)
+    monkeypatch.setattr(fed, "FEDERATION_BATCH_MAX", 2)
+    ctx = ModelContext(task_context=TaskContext(task_type="chat"))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda _: svc.dispatch("remote", ctx), range(2)))
+    assert [len(r) for r in requests] == [2]
+
+
+def test_per_task_errors_are_not_failed_over(monkeypatch):
+    requests = []
+    svc = _service(requests, monkeypatch, linger_ms=0)
+    svc.register_node("other", "http://other")
+    svc.nodes["other"].latency_ewma = 10.0
+    with pytest.raises(RemoteTaskError):
+        svc.dispatch(None, ModelContext(task_context=TaskContext(task_type="bad")))
+    assert len(requests) == 1
+
+
+def test_gzip_request_middleware_and_stream():
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.add_middleware(GzipRequestMiddleware)
+
+    @app.post("/echo")
+    async def echo(payload: dict) -> dict:
+        return payload
+
+    client = TestClient(app)
+    resp = client.post(
+        "/echo",
+        content=gzip_body(b'{"a": 1}'),
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+    assert resp.json() == {"a": 1}
+    bad = client.post("/echo", content=b"nope", headers={"Content-Encoding": "gzip"})
+    assert bad.status_code == 400
+    assert gzip.decompress(b"".join(gzip_stream(["a\n", "b\n"]))) == b"a\nb\n"
+
+
+def test_gzip_request_middleware_caps_inflated_size():
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.add_middleware(GzipRequestMiddleware, max_size=1024)
+
+    @app.post("/echo")
+    async def echo(payload: dict) -> dict:
+        return payload
+
+    client = TestClient(app)
+    bomb = gzip_body(b'{"a": "' + b"x" * 10_000_000 + b'"}')
+    assert len(bomb) < 20_000
+    resp = client.post("/echo", content=bomb, headers={"Content-Encoding": "gzip"})
+    assert resp.status_code == 413
+    two = gzip_body(b'{"a":') + gzip_body(b" 1}")
+    resp = client.post(
+        "/echo",
+        content=two,
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+    assert resp.json() == {"a": 1}
+    truncated = gzip_body(b'{"a": 1}')[:-6]
+    resp = client.post("/echo", content=truncated, headers={"Content-Encoding": "gzip"})
+    assert resp.status_code == 400
+
+
+def test_dispatcher_authenticates_before_inflating():
+    from services.task_dispatcher.main import app
+
+    layers = [m.cls.__name__ for m in app.user_middleware]
+    assert layers.index("AuthMiddleware") < layers.index("GzipRequestMiddleware")
+
+
+def test_batch_forwards_what_dispatch_reads(monkeypatch):
+    from services.task_dispatcher import routes
+
+    calls = []
+
+    def dispatch_task(task, **kw):
+        calls.append((task, kw))
+        return ModelContext(task_context=task)
+
+    monkeypatch.setattr(routes.service, "dispatch_task", dispatch_task)
+    ctx = ModelContext(
+        task_context=TaskContext(task_type="chat", preferences={"mode": "voting"}),
+        session_id="s1",
+        task_value=2.0,
+        max_tokens=50,
+        priority=3,
+        required_skills=["x"],
+        mission_id="m1",
+        mission_step=1,
+        mission_role="writer",
+    )
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    TestClient(app).post("/dispatch", json=ctx.model_dump(mode="json"))
+    task = routes.TaskRequest(**fed._batch_task(ctx))
+    list(routes.service.dispatch_batch([task]))
+    (direct_task, direct), (_, batched) = calls
+    assert batched == direct
+    assert direct_task.task_type == "chat"
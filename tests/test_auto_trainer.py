@@ -1,4 +1,8 @@
-from core.auto_trainer import AutoTrainer
+import pytest
+
+import core.auto_trainer as auto_trainer
+from core.auto_trainer import AutoTrainer, _match_session
+from core.session_store import FileSessionStore
 from services.session_manager.service import SessionManagerService
 from core.feedback_utils import FeedbackEntry
 from core.model_context import ModelContext, TaskContext
@@ -31,3 +35,65 @@ def test_auto_trainer_adjusts_weights():
     trainer.run()
     assert trainer.weights.get("worker_openhands", 0) > 0
 
+
+
+@pytest.mark.unit
+def test_match_session_filters_by_task_type():
+    contexts = [
+        {"agent_selection": "a", "task_context": {"task_type": "docker"}},
+        {"agent_selection": "b", "task_context": {"task_type": "chat"}},
+        {"agent_selection": "c", "task_context": None},
+    ]
+    feedback = [("a", 1.0), ("b", 2.0), ("c", 3.0), ("a", 0.5)]
+    assert _match_session(contexts, feedback, "docker") == [("a", 1.0), ("a", 0.5)]
+
+
+def _feedback(sid, agent, score):
+    return FeedbackEntry(
+        session_id=sid, user_id="u", agent_id=agent, score=score, timestamp="t"
+    )
+
+
+@pytest.mark.unit
+def test_new_feedback_is_marked_processed_only_after_success(tmp_path):
+    service = SessionManagerService()
+    service.feedback_store.add_feedback(_feedback("s1", "a", 1))
+    trainer = AutoTrainer(service, checkpoint=tmp_path / "ckpt.json", workers=1)
+
+    grouped, seen = trainer._new_feedback()
+    assert grouped == {"s1": [("a", 1)]} and seen == {"s1": 1}
+    assert trainer.processed == {}
+
+    def broken(grouped):
+        raise RuntimeError("store down")
+
+    trainer._collect = broken
+    with pytest.raises(RuntimeError):
+        trainer.run()
+    assert trainer.processed == {}
+
+    del trainer._collect
+    trainer.run()
+    service.feedback_store.add_feedback(_feedback("s1", "b", 2))
+    assert trainer._new_feedback()[0] == {"s1": [("b", 2)]}
+    assert AutoTrainer(service, checkpoint=tmp_path / "ckpt.json").processed == {
+        "s1": 1
+    }
+
+
+@pytest.mark.unit
+def test_pool_reads_session_files_and_counts_feedback_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(auto_trainer, "AUTOTRAINER_POOL_MIN", 1)
+    store = FileSessionStore(str(tmp_path / "sessions"))
+    service = SessionManagerService(store=store)
+    sid = service.start_session()
+    for _ in range(2):
+        store.update_context(
+            sid, {"agent_selection": "a", "task_context": {"task_type": "docker"}}
+        )
+    service.feedback_store.add_feedback(_feedback(sid, "a", 1))
+    pooled = AutoTrainer(service, checkpoint=None, workers=2)
+    pooled.run()
+    serial = AutoTrainer(service, checkpoint=None, workers=1)
+    serial.run()
+    assert pooled.weights == serial.weights == {"a": 1.0}
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.feedback_utils import FeedbackEntry, FileFeedbackStore
+from core.model_context import ModelContext, TaskContext
+from services.session_manager.service import SessionManagerService
+
+pytestmark = pytest.mark.unit
+
+
+def _entry(sid, agent, score, task_type=None):
+    return FeedbackEntry(
+        session_id=sid,
+        user_id="u",
+        agent_id=agent,
+        score=score,
+        timestamp="t",
+        task_type=task_type,
+    )
+
+
+def test_file_feedback_store_counters(tmp_path):
+    store = FileFeedbackStore(str(tmp_path))
+    store.add_feedback(_entry("s1", "a", 1, "docker"))
+    store.add_feedback(_entry("s1", "b", -1, "docker"))
+    store.add_feedback(_entry("s2", "a", 0))
+
+    assert [e.agent_id for e in store.get_feedback("s1")] == ["a", "b"]
+    assert (tmp_path / "s1.jsonl").read_text().count("\n") == 2
+    stats = store.stats()
+    assert (stats["total"], stats["positive"], stats["negative"]) == (3, 1, 2)
+    assert stats["by_agent"]["a"] == {"positive": 1, "negative": 1}
+    assert stats["by_task_type"]["docker"] == {"positive": 1, "negative": 1}
+
+    # counters survive a restart and match a full recount
+    reopened = FileFeedbackStore(str(tmp_path))
+    assert reopened.stats() == stats
+    assert reopened.rebuild_stats() == stats
+    assert sum(1 for _ in reopened.iter_feedback()) == 3
+
+
+def test_legacy_session_files_are_read(tmp_path):
+    (tmp_path / "old.json").write_text(
+        '[{"session_id": "old", "user_id": "u", "agent_id": "a", "score": 1}]'
+    )
+    store = FileFeedbackStore(str(tmp_path))
+    assert store.stats()["total"] == 1
+    store.add_feedback(_entry("old", "a", -1))
+    assert [e.score for e in store.get_feedback("old")] == [1, -1]
+
+
+def test_counters_are_shared_between_stores(tmp_path):
+    first = FileFeedbackStore(str(tmp_path))
+    second = FileFeedbackStore(str(tmp_path))
+
+    def add(store, i):
+        store.add_feedback(_entry(f"s{i % 3}", "a", 1 if i % 2 else -1))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(add, [first, second] * 20, range(40)))
+
+    assert first.stats()["total"] == second.stats()["total"] == 40
+    assert second.stats() == second.rebuild_stats()
+
+
+def test_task_type_comes_from_latest_context():
+    service = SessionManagerService()
+    sid = service.start_session()
+    for task_type in ("chat", "docker"):
+        service.update_context(
+            ModelContext(session_id=sid, task_context=TaskContext(task_type=task_type))
+        )
+    entry = _entry(sid, "a", 1)
+    service.add_feedback(entry)
+    assert entry.task_type == "docker"
@@ -1,3 +1,5 @@
+import pytest
+
 from core import llm_providers
 from core.llm_providers.base import LLMProvider
 
@@ -32,3 +34,93 @@ providers:
     mgr = llm_providers.LLMBackendManager()
     assert mgr.get_provider().generate_response(None) == "openai"
     assert mgr.get_provider("local").generate_response(None) == "local"
+
+
+def _collect(provider, ctx):
+    import asyncio
+
+    async def run():
+        return [token async for token in provider.stream_response(ctx)]
+
+    return asyncio.run(run())
+
+
+def _mock_async_client(monkeypatch, module, handler):
+    import httpx
+
+    real = httpx.AsyncClient
+    monkeypatch.setattr(
+        module.httpx, "AsyncClient", lambda: real(transport=httpx.MockTransport(handler))
+    )
+
+
+@pytest.mark.unit
+def test_openai_streams_natively(monkeypatch):
+    import httpx
+    from core.llm_providers import openai_provider
+    from core.model_context import ModelContext
+
+    def handler(request):
+        assert request.headers["authorization"] == "Bearer key"
+        body = "".join(
+            f"data: {chunk}\n\n"
+            for chunk in (
+                '{"choices": [{"delta": {"role": "assistant"}}]}',
+                '{"choices": [{"delta": {"content": "Hel"}}]}',
+                '{"choices": [{"delta": {"content": "lo"}}]}',
+                "[DONE]",
+            )
+        )
+        return httpx.Response(200, text=body)
+
+    _mock_async_client(monkeypatch, openai_provider, handler)
+    provider = openai_provider.OpenAIProvider(api_key="key")
+    assert _collect(provider, ModelContext(task="hi")) == ["Hel", "lo"]
+
+
+@pytest.mark.unit
+def test_anthropic_streams_natively(monkeypatch):
+    import httpx
+    from core.llm_providers import anthropic_provider
+    from core.model_context import ModelContext
+
+    def handler(request):
+        assert request.headers["x-api-key"] == "key"
+        delta = '{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "%s"}}'
+        body = (
+            'event: message_start\ndata: {"type": "message_start"}\n\n'
+            f"event: content_block_delta\ndata: {delta % 'Hi'}\n\n"
+            f"event: content_block_delta\ndata: {delta % ' you'}\n\n"
+            'event: message_stop\ndata: {"type": "message_stop"}\n\n'
+        )
+        return httpx.Response(200, text=body)
+
+    _mock_async_client(monkeypatch, anthropic_provider, handler)
+    provider = anthropic_provider.AnthropicProvider(api_key="key")
+    assert _collect(provider, ModelContext(task="hi")) == ["Hi", " you"]
+
+
+@pytest.mark.unit
+def test_fallback_stream_runs_generation_in_thread():
+    import threading
+
+    from core.model_context import ModelContext
+
+    threads = []
+
+    class Blocking(DummyProvider):
+        def generate_response(self, ctx):
+            threads.append(threading.get_ident())
+            return "a b"
+
+    assert _collect(Blocking("x"), ModelContext(task="t")) == ["a", " b"]
+    assert threads[0] != threading.get_ident()
+
+
+@pytest.mark.unit
+def test_unresolved_key_placeholder_is_ignored(monkeypatch):
+    from core.llm_providers.manager import _api_key
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert _api_key("OPENAI_API_KEY", {"api_key": "${OPENAI_API_KEY}"}) is None
+    assert _api_key("OPENAI_API_KEY", {"api_key": "sk"}) == "sk"
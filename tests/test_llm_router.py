@@ -0,0 +1,117 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from core import llm_providers
+from core.llm_providers.base import LLMProvider
+from core.llm_providers.manager import LLMConfig
+from core.model_context import ModelContext
+
+pytestmark = pytest.mark.unit
+
+
+class DummyProvider(LLMProvider):
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False) -> None:
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+
+    def generate_response(self, ctx):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("down")
+        return self.name
+
+
+def _manager(providers, routing=None, **cfg):
+    config = LLMConfig(
+        default_provider="a",
+        providers={name: {"type": "dummy", **cfg.get(name, {})} for name in providers},
+        routing=routing or {},
+    )
+    mgr = llm_providers.LLMBackendManager(config)
+    mgr.get_provider = lambda name=None: providers[name or "a"]
+    return mgr
+
+
+def test_fails_over_to_next_provider():
+    mgr = _manager({"a": DummyProvider("a", fail=True), "b": DummyProvider("b")})
+    provider, text = mgr.router.complete(ModelContext(task="hi"))
+    assert text == "b"
+    assert mgr.router.stats["a"].error_rate > 0
+
+
+def test_circuit_opens_and_half_opens():
+    now = [0.0]
+    mgr = _manager(
+        {"a": DummyProvider("a", fail=True), "b": DummyProvider("b")},
+        routing={"failure_threshold": 2, "cooldown_seconds": 10},
+    )
+    mgr.router._clock = lambda: now[0]
+    for _ in range(2):
+        mgr.router.complete(ModelContext(task="hi"), "a")
+    assert mgr.router.candidates("a") == ["b"]
+    now[0] = 11.0
+    assert "a" in mgr.router.candidates("a")
+
+
+def test_hedges_slow_primary():
+    mgr = _manager(
+        {"a": DummyProvider("a", delay=0.5), "b": DummyProvider("b")},
+        routing={"hedge_min_samples": 3},
+    )
+    for _ in range(3):
+        mgr.router.record("a", 0.01, ok=True)
+    start = time.perf_counter()
+    provider, text = mgr.router.complete(ModelContext(task="hi"), "a")
+    assert text == "b"
+    assert time.perf_counter() - start < 0.4
+
+
+def test_orders_by_cost_and_latency():
+    mgr = _manager(
+        {"a": DummyProvider("a"), "b": DummyProvider("b")},
+        a={"cost_per_1k_tokens": 2.0},
+        b={"cost_per_1k_tokens": 0.5},
+    )
+    assert mgr.router.candidates() == ["b", "a"]
+    mgr.router.record("b", 5.0, ok=True)
+    mgr.router.record("a", 0.1, ok=True)
+    assert mgr.router.candidates()[0] == "a"
+
+
+
+def test_candidates_do_not_claim_half_open_probe():
+    now = [0.0]
+    providers = {"a": DummyProvider("a", fail=True), "b": DummyProvider("b")}
+    mgr = _manager(providers, routing={"failure_threshold": 1, "cooldown_seconds": 10})
+    mgr.router._clock = lambda: now[0]
+    mgr.router.complete(ModelContext(task="hi"), "a")
+    now[0] = 11.0
+    for _ in range(3):
+        assert mgr.router.candidates("a")[0] == "a"
+    providers["a"].fail = False
+    provider, text = mgr.router.complete(ModelContext(task="hi"), "a")
+    assert text == "a"
+    assert mgr.router.stats["a"].open_until == 0.0
+
+
+def test_hedge_cancels_queued_losers():
+    mgr = _manager(
+        {"a": DummyProvider("a", delay=0.2), "b": DummyProvider("b")},
+        routing={"hedge_min_samples": 3},
+    )
+    for _ in range(3):
+        mgr.router.record("a", 0.01, ok=True)
+    pool = ThreadPoolExecutor(max_workers=1)
+    queued = Future()  # the hedge waits behind the primary
+
+    def submit(fn, name, ctx):
+        return pool.submit(fn, name, ctx) if name == "a" else queued
+
+    mgr.router._pool = type("Pool", (), {"submit": staticmethod(submit)})()
+    provider, text = mgr.router.complete(ModelContext(task="hi"), "a")
+    pool.shutdown(wait=True)
+    assert text == "a"
+    assert queued.cancelled()
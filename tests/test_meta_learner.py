@@ -98,6 +98,37 @@ class TestMetaLearner(unittest.TestCase):
             )
         )
 
+    @pytest.mark.unit
+    def test_score_agents_batch(self):
+        """Test batched scoring matches per-agent forward passes."""
+        self.meta_learner.eval()
+        features = torch.randn(5, 64)
+        embeddings = torch.randn(5, 768)
+        names = [f"agent{i}" for i in range(5)]
+
+        scores = self.meta_learner.score_agents_batch(
+            self.task_embedding, names, features, embeddings
+        )
+
+        self.assertEqual([s.agent_name for s in scores], names)
+        for i, score in enumerate(scores):
+            expected = self.meta_learner(
+                self.task_embedding, features[i : i + 1]
+            ).item()
+            self.assertAlmostEqual(score.nn_score, expected, places=5)
+            self.assertAlmostEqual(
+                score.embedding_score,
+                torch.cosine_similarity(
+                    self.task_embedding, embeddings[i : i + 1]
+                ).item(),
+                places=5,
+            )
+
+        with self.assertRaises(ValueError):
+            self.meta_learner.score_agents_batch(
+                self.task_embedding, names[:2], features
+            )
+
     def test_update_metrics(self):
         """Test metrics updating."""
         metrics = TaskMetrics(
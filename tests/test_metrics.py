@@ -20,3 +20,25 @@ def test_metrics_route_available(module_name, monkeypatch):
     resp = client.get("/metrics")
     assert resp.status_code == 200
     assert "agentnn_response_seconds" in resp.text
+
+
+@pytest.mark.unit
+def test_route_template_labels_and_stage_exemplars():
+    from fastapi import FastAPI
+    from core.metrics_utils import MetricsMiddleware, metrics_router, stage_timer
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, service="metrics_test")
+    app.include_router(metrics_router())
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str) -> dict:
+        with stage_timer("metrics_test", "lookup", context_id=item_id):
+            return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/abc123")
+    resp = client.get("/metrics", headers={"accept": "application/openmetrics-text"})
+    assert 'path="/items/{item_id}",service="metrics_test"' in resp.text
+    assert "/items/abc123" not in resp.text
+    assert '# {context_id="abc123"}' in resp.text
@@ -6,6 +6,7 @@ from core.utils.imports import torch
 pytestmark = pytest.mark.heavy
 pytestmark = pytest.mark.skipif(torch is None, reason="Torch not installed")
 import torch.nn as nn
+import numpy as np
 import tempfile
 import threading
 import queue
@@ -81,6 +82,102 @@ class TestOnlineLearning(unittest.TestCase):
         self.assertEqual(batch["input"].shape[1], self.input_dim)
         self.assertEqual(batch["target"].shape[1], self.output_dim)
 
+    @pytest.mark.unit
+    def test_streaming_buffer_add_batch(self):
+        """Test vectorized batch insert."""
+        buffer = StreamingBuffer(capacity=8, feature_dims={"x": 2})
+
+        # Fills free slots in order
+        first = torch.arange(10.0).reshape(5, 2)
+        self.assertEqual(buffer.add_batch({"x": first}), 5)
+        self.assertTrue(torch.equal(buffer.buffers["x"][:5], first))
+
+        # Overflow is reservoir sampled
+        rest = torch.arange(100.0, 190.0).reshape(45, 2)
+        stored = buffer.add_batch({"x": rest})
+        self.assertEqual(buffer.count, 50)
+        self.assertLessEqual(stored, 45)
+        self.assertGreaterEqual(stored, 3)
+        rows = {tuple(r.tolist()) for r in torch.cat([first, rest])}
+        for row in buffer.buffers["x"]:
+            self.assertIn(tuple(row.tolist()), rows)
+
+        batch = buffer.get_batch(batch_size=6)
+        self.assertEqual(batch["x"].shape, (6, 2))
+        self.assertEqual(len({tuple(r.tolist()) for r in batch["x"]}), 6)
+
+        with self.assertRaises(ValueError):
+            buffer.add_batch({"x": torch.zeros(2, 2), "y": torch.zeros(3, 2)})
+
+    @pytest.mark.unit
+    def test_add_batch_keeps_uniform_sample(self):
+        """Test batch insert keeps reservoir sampling uniform."""
+        np.random.seed(0)
+        hits = np.zeros(40)
+        for _ in range(500):
+            buffer = StreamingBuffer(capacity=10, feature_dims={"x": 1})
+            buffer.add_batch({"x": torch.arange(40.0).unsqueeze(1)})
+            hits[buffer.buffers["x"].squeeze(1).long().numpy()] += 1
+        # every sample is kept with probability capacity / count
+        self.assertTrue(np.allclose(hits / 500, 0.25, atol=0.08))
+
+    @pytest.mark.unit
+    def test_learner_add_batch_bypasses_queue(self):
+        """Test batch ingestion on the learner."""
+        learner = OnlineLearner(self.model, buffer_capacity=100)
+        stored = learner.add_batch({
+            "input": torch.randn(16, self.input_dim),
+            "target": torch.randn(16, self.output_dim),
+        })
+        self.assertEqual(stored, 16)
+        self.assertTrue(learner.data_queue.empty())
+        self.assertEqual(learner.get_stats()["buffer_size"], 16)
+
+    def _process_queued(self, learner):
+        """Run the processing thread until the queue is drained."""
+        learner.running = True
+        thread = threading.Thread(target=learner._process_data)
+        thread.start()
+        while not learner.data_queue.empty():
+            time.sleep(0.01)
+        learner.running = False
+        thread.join()
+
+    @pytest.mark.unit
+    def test_process_data_falls_back_on_mixed_samples(self):
+        """Test queued samples that do not stack are added one by one."""
+        learner = OnlineLearner(self.model, buffer_capacity=100)
+        learner.log_error = MagicMock()
+        learner.data_queue.put({
+            "input": torch.randn(self.input_dim),
+            "target": torch.randn(self.output_dim),
+        })
+        learner.data_queue.put({"input": torch.randn(self.input_dim)})
+        self._process_queued(learner)
+        self.assertEqual(learner.buffer.count, 2)
+        learner.log_error.assert_not_called()
+
+    @pytest.mark.unit
+    def test_process_data_logs_failed_batch_without_readding(self):
+        """Test a failing batch insert is logged, not retried per sample."""
+        learner = OnlineLearner(self.model, buffer_capacity=100)
+        learner.log_error = MagicMock()
+        add_batch = learner.buffer.add_batch
+
+        def failing(batch):
+            add_batch(batch)
+            raise RuntimeError("boom")
+
+        learner.buffer.add_batch = failing
+        for _ in range(3):
+            learner.data_queue.put({
+                "input": torch.randn(self.input_dim),
+                "target": torch.randn(self.output_dim),
+            })
+        self._process_queued(learner)
+        self.assertEqual(learner.buffer.count, 3)
+        learner.log_error.assert_called_once()
+
     def test_streaming_dataset(self):
         """Test streaming dataset."""
         data_queue = queue.Queue()
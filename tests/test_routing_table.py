@@ -0,0 +1,44 @@
+import os
+import time
+
+import pytest
+
+from services.routing_agent.service import RoutingAgentService, RoutingTable
+
+pytestmark = pytest.mark.unit
+
+
+def test_tool_rules_match_in_order():
+    table = RoutingTable(
+        {
+            "coding": [
+                {"tools": ["docker", "git"], "target": "worker_ops"},
+                {"tools": ["docker"], "target": "worker_openhands"},
+                {"target": "worker_dev"},
+            ],
+            "search": "wikipedia",
+            "*": [{"tools": ["browser"], "target": "worker_web"}],
+        }
+    )
+    assert table.match("coding", ["git", "docker"]) == "worker_ops"
+    assert table.match("coding", ["docker", "unknown"]) == "worker_openhands"
+    assert table.match("coding") == "worker_dev"
+    assert table.match("search", ["docker"]) == "wikipedia"
+    assert table.match("other", ["browser"]) == "worker_web"
+    assert table.match("other") is None
+    hits = table.lookup.cache_info().hits
+    assert table.match("coding", ["docker", "git"]) == "worker_ops"
+    assert table.lookup.cache_info().hits == hits + 1
+
+
+def test_rules_reload_when_file_changes(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("greeting: worker_a\n")
+    service = RoutingAgentService(rules_path=str(rules), reload_interval=0)
+    assert service.route("greeting")["target_worker"] == "worker_a"
+    old_table = service.table
+    rules.write_text("greeting: worker_b\n")
+    stamp = time.time() + 5
+    os.utime(rules, (stamp, stamp))
+    assert service.route("greeting")["target_worker"] == "worker_b"
+    assert service.table is not old_table
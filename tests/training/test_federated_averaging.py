@@ -0,0 +1,49 @@
+import pytest
+import torch
+
+from training.federated import FederatedAveraging
+
+pytestmark = pytest.mark.unit
+
+
+def _state(value, dtype=torch.float32):
+    return {"w": torch.full((3,), value, dtype=dtype), "b": torch.tensor([value])}
+
+
+def test_streaming_matches_buffered_average():
+    buffered = FederatedAveraging()
+    streaming = FederatedAveraging(streaming=True)
+    for i, samples in enumerate([10, 30, 60]):
+        buffered.add_update(f"c{i}", _state(float(i)), samples)
+        streaming.add_update(f"c{i}", _state(float(i)), samples)
+    assert streaming._updates == []
+    expected = buffered.aggregate()
+    result = streaming.aggregate()
+    for key in expected:
+        assert torch.allclose(result[key], expected[key])
+    assert streaming.clients == []
+
+
+def test_streaming_from_files(tmp_path):
+    from safetensors.torch import save_file
+
+    save_file(_state(1.0), str(tmp_path / "a.safetensors"))
+    torch.save(_state(3.0), tmp_path / "b.pt")
+    fed = FederatedAveraging(streaming=True)
+    fed.add_file("a", tmp_path / "a.safetensors", samples=1)
+    fed.add_file("b", tmp_path / "b.pt", samples=1)
+    assert torch.allclose(fed.aggregate()["w"], torch.full((3,), 2.0))
+
+
+def test_partial_updates_and_min_clients():
+    fed = FederatedAveraging(streaming=True)
+    fed.add_update("full", _state(1.0, torch.float16), samples=1)
+    fed.add_update("head", {"b": torch.tensor([5.0])}, samples=3)
+    with pytest.raises(ValueError):
+        fed.aggregate(min_clients=3)
+    result = fed.aggregate(min_clients=2)
+    assert result["w"].dtype == torch.float32
+    assert torch.allclose(result["w"], torch.ones(3))
+    assert torch.allclose(result["b"], torch.tensor([4.0]))
+    with pytest.raises(ValueError):
+        fed.aggregate()
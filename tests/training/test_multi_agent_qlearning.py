@@ -1,3 +1,8 @@
+import random
+import time
+
+import pytest
+
 from training.reinforcement_learning import MultiAgentQLearner
 from core.model_context import TaskContext
 
@@ -16,3 +21,72 @@ def test_select_team_returns_best():
     learner.table[("docker", ("a1", "a3"))] = 0.8
     team = learner.select_team(task, ["a1", "a2", "a3"])
     assert team == ("a1", "a3")
+
+
+def _trained(selection, agents, good, rounds=200):
+    learner = MultiAgentQLearner(
+        learning_rate=0.5, epsilon=0.0, team_size=3, selection=selection
+    )
+    task = TaskContext(task_type="docker")
+    rng = random.Random(0)
+    for _ in range(rounds):
+        team = tuple(rng.sample(agents, 3))
+        learner.learn_team(task, team, reward=sum(a in good for a in team) / 3)
+    for _ in range(20):
+        learner.learn_team(task, good, reward=1.0)
+    return learner, task
+
+
+@pytest.mark.unit
+def test_factorized_selection_finds_good_team():
+    agents = [f"a{i}" for i in range(30)]
+    good = ("a3", "a7", "a11")
+    for selection in ("greedy", "beam"):
+        learner, task = _trained(selection, agents, good)
+        assert learner.select_team(task, agents) == good
+
+
+@pytest.mark.unit
+def test_factorized_selection_scales_to_many_agents():
+    agents = [f"a{i}" for i in range(150)]
+    learner = MultiAgentQLearner(epsilon=0.0, team_size=5, selection="beam")
+    task = TaskContext(task_type="docker")
+    learner.learn_team(task, ("a140", "a2", "a99", "a7", "a50"), reward=1.0)
+    start = time.perf_counter()
+    team = learner.select_team(task, agents)
+    assert time.perf_counter() - start < 0.5
+    assert set(team) == {"a140", "a2", "a99", "a7", "a50"}
+    # order follows the agent list, like the exhaustive combinations
+    assert team == ("a2", "a7", "a50", "a99", "a140")
+
+
+@pytest.mark.unit
+def test_unknown_selection_is_rejected():
+    with pytest.raises(ValueError, match="unknown selection"):
+        MultiAgentQLearner(selection="gredy")
+
+
+@pytest.mark.unit
+def test_save_and_load_keep_team_values_and_factors(tmp_path):
+    agents = [f"a{i}" for i in range(30)]
+    good = ("a3", "a7", "a11")
+    learner, task = _trained("beam", agents, good)
+    path = tmp_path / "team_q.json"
+    learner.save(str(path))
+
+    restored = MultiAgentQLearner(epsilon=0.0, team_size=3, selection="beam")
+    restored.load(str(path))
+    assert restored.table == learner.table
+    assert restored.factors["docker"].index == learner.factors["docker"].index
+    assert restored.select_team(task, agents) == good
+
+
+@pytest.mark.unit
+def test_factorized_selection_cold_start():
+    task = TaskContext(task_type="unseen")
+    for selection in ("greedy", "beam"):
+        learner = MultiAgentQLearner(epsilon=0.0, selection=selection)
+        assert learner.select_team(task, ["a", "b", "c"]) == ("a", "b")
+        # a learned state still scores agents it has not seen
+        learner.learn_team(task, ("b", "c"), reward=1.0)
+        assert learner.select_team(task, ["a", "b", "c", "d"]) == ("b", "c")
@@ -0,0 +1,95 @@
+import pytest
+
+from core.governance import AgentContract
+from core.trust_evaluator import (
+    TrustAggregate,
+    calculate_trust,
+    load_trust_aggregate,
+    rebuild_trust_aggregates,
+    record_task_result,
+    trust_score,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _contract(history):
+    return AgentContract(
+        agent="agg",
+        allowed_roles=[],
+        max_tokens=0,
+        trust_level_required=0.0,
+        constraints={"task_history": history},
+    )
+
+
+def test_incremental_matches_full_scan(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    history = [
+        {"agent_id": "agg", "success": True, "feedback_score": 0.8},
+        {"agent_id": "agg", "success": False, "error": "boom"},
+        {"agent_id": "agg", "metrics": {"tokens_used": 20}, "expected_tokens": 10},
+    ]
+    _contract([]).save()
+    for entry in history:
+        record_task_result("agg", entry, decay=1.0)
+
+    assert trust_score("agg") == calculate_trust("agg", history)
+    assert load_trust_aggregate("agg").total == 3
+
+
+def test_backfill_and_decay(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    history = [{"agent_id": "agg", "success": False}] + [
+        {"agent_id": "agg", "success": True} for _ in range(3)
+    ]
+    _contract(history).save()
+    # no stored aggregate yet: derived lazily from the history
+    assert trust_score("agg") == calculate_trust("agg", history)
+
+    scores = rebuild_trust_aggregates(["agg"], decay=0.5)
+    stored = AgentContract.load("agg").constraints["trust_aggregate"]
+    assert TrustAggregate(**stored).score() == scores["agg"]
+    # recent successes dominate once older results decay
+    assert scores["agg"] > calculate_trust("agg", history)
+
+
+def test_history_is_capped_and_usage_applied_in_one_write(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    monkeypatch.setattr("core.trust_evaluator.TRUST_HISTORY_LIMIT", 3)
+    _contract([]).save()
+    saves = []
+    original = AgentContract.save
+    monkeypatch.setattr(
+        AgentContract, "save", lambda self: (saves.append(1), original(self))
+    )
+    for i in range(5):
+        entry = {"agent_id": "agg", "metrics": {"tokens_used": 10}, "n": i}
+        record_task_result("agg", entry, decay=1.0, token_limit=100)
+
+    assert len(saves) == 5
+    constraints = AgentContract.load("agg").constraints
+    assert [e["n"] for e in constraints["task_history"]] == [2, 3, 4]
+    assert constraints["trust_aggregate"]["total"] == 5
+    assert constraints["trust_score"] == 1.0
+
+
+def test_backfill_is_persisted(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    _contract([{"agent_id": "agg", "success": True}]).save()
+    load_trust_aggregate("agg")
+    stored = AgentContract.load("agg").constraints["trust_aggregate"]
+    assert stored["total"] == 1
+
+
+def test_concurrent_results_are_not_lost(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr("core.governance.CONTRACT_DIR", tmp_path)
+    _contract([]).save()
+    entry = {"agent_id": "agg", "success": True, "feedback_score": 1.0}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: record_task_result("agg", dict(entry)), range(40)))
+    contract = AgentContract.load("agg")
+    assert len(contract.constraints["task_history"]) == 40
+    assert load_trust_aggregate("agg").total == 40
@@ -3,10 +3,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field  # noqa: E402
 from datetime import datetime  # noqa: E402
-from typing import Dict  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Dict, Iterable, Iterator, Tuple  # noqa: E402
 
 import torch  # noqa: E402
 
+try:  # noqa: E402
+    from safetensors import safe_open  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    safe_open = None
+
 
 @dataclass
 class ClientUpdate:
@@ -18,22 +24,99 @@ class ClientUpdate:
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
+def iter_state_file(path: str | Path) -> Iterator[Tuple[str, torch.Tensor]]:
+    """Yield ``(name, tensor)`` pairs of a saved state dict one at a time.
+
+    ``.safetensors`` files are read tensor by tensor; other files are
+    loaded with ``torch.load(mmap=True)`` so only touched pages are read.
+    """
+    path = Path(path)
+    if path.suffix == ".safetensors":
+        if safe_open is None:
+            raise RuntimeError("safetensors is required to read .safetensors files")
+        with safe_open(str(path), framework="pt") as fh:
+            for name in fh.keys():
+                yield name, fh.get_tensor(name)
+        return
+    state = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    yield from state.items()
+
+
 class FederatedAveraging:
-    """Aggregate model updates from multiple clients."""
+    """Aggregate model updates from multiple clients.
+
+    With ``streaming=True`` every update is folded into a running weighted
+    average when it arrives instead of being kept until :meth:`aggregate`.
+    Memory then stays at about two model copies, the average and the update
+    being folded in, whatever the number of clients. Weights are tracked
+    per tensor, so clients may send only some of the tensors.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, streaming: bool = False) -> None:
+        self.streaming = streaming
         self._updates: list[ClientUpdate] = []
+        self._average: Dict[str, torch.Tensor] = {}
+        self._weights: Dict[str, float] = {}
+        self.clients: list[str] = []
 
     def add_update(
         self, client_id: str, state: Dict[str, torch.Tensor], samples: int
     ) -> None:
-        self._updates.append(ClientUpdate(client_id, state, samples))
+        if not self.streaming:
+            self._updates.append(ClientUpdate(client_id, state, samples))
+            self.clients.append(client_id)
+            return
+        self._fold(client_id, state.items(), samples)
+
+    def add_file(self, client_id: str, path: str | Path, samples: int) -> None:
+        """Add a client update saved as ``.safetensors`` or ``torch.save`` file."""
+        if not self.streaming:
+            self.add_update(client_id, dict(iter_state_file(path)), samples)
+            return
+        self._fold(client_id, iter_state_file(path), samples)
 
-    def aggregate(self) -> Dict[str, torch.Tensor]:
-        if not self._updates:
+    def _fold(
+        self,
+        client_id: str,
+        tensors: Iterable[Tuple[str, torch.Tensor]],
+        samples: int,
+    ) -> None:
+        if samples <= 0:
+            raise ValueError("samples must be positive")
+        for name, tensor in tensors:
+            total = self._weights.get(name, 0.0) + samples
+            current = self._average.get(name)
+            if current is None:
+                self._average[name] = tensor.detach().to(
+                    dtype=_accumulator_dtype(tensor), device="cpu", copy=True
+                )
+            else:
+                # running mean: avg += (x - avg) * w / W, done in place
+                current.mul_(1 - samples / total).add_(
+                    tensor.detach().to(device="cpu"), alpha=samples / total
+                )
+            self._weights[name] = total
+        self.clients.append(client_id)
+
+    def aggregate(self, min_clients: int = 1) -> Dict[str, torch.Tensor]:
+        """Return the weighted average of this round and start a new one.
+
+        Only clients that sent an update take part. Raises ``ValueError``
+        if fewer than ``min_clients`` did.
+        """
+        if not self.clients:
             raise ValueError("no updates to aggregate")
+        if len(self.clients) < min_clients:
+            raise ValueError(
+                f"only {len(self.clients)} of {min_clients} clients reported"
+            )
+        if self.streaming:
+            agg = self._average
+            self._average, self._weights = {}, {}
+            self.clients = []
+            return agg
         total_samples = sum(u.samples for u in self._updates)
-        agg: Dict[str, torch.Tensor] = {}
+        agg = {}
         for update in self._updates:
             for k, v in update.weights.items():
                 if k not in agg:
@@ -41,4 +124,15 @@ class FederatedAveraging:
                 else:
                     agg[k] += v * (update.samples / total_samples)
         self._updates.clear()
+        self.clients = []
         return agg
+
+
+def _accumulator_dtype(tensor: torch.Tensor) -> torch.dtype:
+    # half precision loses too much when many updates are averaged
+    if not tensor.is_floating_point() or tensor.dtype in (
+        torch.float16,
+        torch.bfloat16,
+    ):
+        return torch.float32
+    return tensor.dtype
@@ -5,10 +5,14 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Dict, Iterable, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
 
 from core.model_context import TaskContext
 
+SELECTION_MODES = ("exhaustive", "greedy", "beam")
+
 
 @dataclass
 class QTableLearner:
@@ -57,13 +61,100 @@ class QTableLearner:
         self.table = table
 
 
+class TeamFactors:
+    """Numpy Q-values of one state factorised into agent and pair terms.
+
+    A team is valued as the sum of its agents' values plus the interaction
+    value of every pair in it.
+    """
+
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.unary = np.zeros(0)
+        self.pairwise = np.zeros((0, 0))
+
+    def to_dict(self) -> Dict[str, object]:
+        size = len(self.index)
+        return {
+            "agents": sorted(self.index, key=self.index.get),
+            "unary": self.unary[:size].tolist(),
+            "pairwise": self.pairwise[:size, :size].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "TeamFactors":
+        factors = cls()
+        agents = list(data.get("agents", []))
+        factors.index = {agent: i for i, agent in enumerate(agents)}
+        factors.unary = np.asarray(data.get("unary", []), dtype=float)
+        factors.pairwise = np.asarray(
+            data.get("pairwise", []), dtype=float
+        ).reshape(len(agents), len(agents))
+        return factors
+
+    def indices(self, agents: Iterable[str], grow: bool = False) -> np.ndarray:
+        idx = []
+        for agent in agents:
+            if agent not in self.index:
+                if not grow:
+                    idx.append(-1)
+                    continue
+                self.index[agent] = len(self.index)
+            idx.append(self.index[agent])
+        size = len(self.index)
+        if size > len(self.unary):
+            capacity = max(size, 2 * len(self.unary), 8)
+            old = len(self.unary)
+            unary = np.zeros(capacity)
+            unary[:old] = self.unary
+            pairwise = np.zeros((capacity, capacity))
+            pairwise[:old, :old] = self.pairwise
+            self.unary, self.pairwise = unary, pairwise
+        return np.asarray(idx, dtype=int)
+
+    def value(self, idx: np.ndarray) -> float:
+        pairs = self.pairwise[np.ix_(idx, idx)]
+        return float(self.unary[idx].sum() + np.triu(pairs, 1).sum())
+
+    def update(self, idx: np.ndarray, reward: float, rate: float) -> None:
+        """Move the team's value towards ``reward`` by ``rate``.
+
+        With more than one agent, half of the step goes to the agent terms
+        and half to the pair terms.
+        """
+        error = rate * (reward - self.value(idx))
+        if len(idx) == 1:
+            self.unary[idx] += error
+            return
+        self.unary[idx] += error / (2 * len(idx))
+        step = error / (len(idx) * (len(idx) - 1))
+        self.pairwise[np.ix_(idx, idx)] += step
+        self.pairwise[idx, idx] -= step
+
+
 @dataclass
 class MultiAgentQLearner(QTableLearner):
-    """Q-learning for selecting a team of agents."""
+    """Q-learning for selecting a team of agents.
+
+    ``selection="exhaustive"`` scores every combination from ``table``.
+    ``greedy`` and ``beam`` use per-state :class:`TeamFactors` instead and
+    build the team one agent at a time by marginal value, which stays
+    fast for hundreds of agents.
+    """
 
     reward_shaping: Callable[[float, TaskContext], float] | None = None
     team_size: int = 2
     table: Dict[Tuple[str, Tuple[str, ...]], float] = field(default_factory=dict)
+    selection: str = "exhaustive"
+    beam_width: int = 4
+    factors: Dict[str, TeamFactors] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.selection not in SELECTION_MODES:
+            raise ValueError(
+                f"unknown selection: {self.selection}"
+                f" (expected one of {', '.join(SELECTION_MODES)})"
+            )
 
     def select_team(self, task: TaskContext, agents: Iterable[str]) -> Tuple[str, ...]:
         """Choose a team of agents via epsilon-greedy policy."""
@@ -71,6 +162,13 @@ class MultiAgentQLearner(QTableLearner):
         import random
 
         agent_list = list(agents)
+        if self.selection != "exhaustive":
+            if len(agent_list) < self.team_size:
+                raise ValueError("no agent combinations available")
+            if random.random() < self.epsilon:
+                chosen = set(random.sample(range(len(agent_list)), self.team_size))
+                return tuple(a for i, a in enumerate(agent_list) if i in chosen)
+            return self._search_team(task, agent_list)
         combos = list(itertools.combinations(agent_list, self.team_size))
         if not combos:
             raise ValueError("no agent combinations available")
@@ -80,6 +178,46 @@ class MultiAgentQLearner(QTableLearner):
         q_vals = {c: self.table.get((state, c), 0.0) for c in combos}
         return max(q_vals, key=q_vals.get)
 
+    def _search_team(
+        self, task: TaskContext, agent_list: List[str]
+    ) -> Tuple[str, ...]:
+        factors = self.factors.get(self._state_key(task)) or TeamFactors()
+        idx = factors.indices(agent_list)
+        known = idx >= 0
+        n = len(agent_list)
+        # unseen agents are worth 0 and have no pair terms
+        unary = np.zeros(n)
+        unary[known] = factors.unary[idx[known]]
+        pairwise = np.zeros((n, n))
+        pairwise[np.ix_(known, known)] = factors.pairwise[
+            np.ix_(idx[known], idx[known])
+        ]
+        width = 1 if self.selection == "greedy" else max(1, self.beam_width)
+        # each beam entry: (value, chosen mask, pair sums of chosen per agent)
+        beams = [(0.0, np.zeros(n, dtype=bool), np.zeros(n))]
+        for _ in range(self.team_size):
+            candidates = []
+            for value, chosen, linked in beams:
+                gains = np.where(chosen, -np.inf, unary + linked)
+                top = np.argsort(-gains, kind="stable")[:width]
+                for j in top:
+                    if np.isfinite(gains[j]):
+                        candidates.append((value + gains[j], chosen, linked, j))
+            candidates.sort(key=lambda c: -c[0])
+            beams, seen = [], set()
+            for value, chosen, linked, j in candidates:
+                new_chosen = chosen.copy()
+                new_chosen[j] = True
+                key = new_chosen.tobytes()
+                if key in seen:
+                    continue
+                seen.add(key)
+                beams.append((value, new_chosen, linked + pairwise[j]))
+                if len(beams) >= width:
+                    break
+        best = beams[0][1]
+        return tuple(a for a, keep in zip(agent_list, best) if keep)
+
     def learn_team(
         self, task: TaskContext, team: Tuple[str, ...], reward: float
     ) -> None:
@@ -90,3 +228,31 @@ class MultiAgentQLearner(QTableLearner):
         key = (state, team)
         current = self.table.get(key, 0.0)
         self.table[key] = current + self.learning_rate * (reward - current)
+        factors = self.factors.setdefault(state, TeamFactors())
+        factors.update(factors.indices(team, grow=True), reward, self.learning_rate)
+
+    def save(self, path: str) -> None:
+        data = {
+            "table": [
+                {"state": state, "team": list(team), "value": value}
+                for (state, team), value in self.table.items()
+            ],
+            "factors": {s: f.to_dict() for s, f in self.factors.items()},
+        }
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+
+    def load(self, path: str) -> None:
+        file = Path(path)
+        if not file.exists():
+            return
+        with open(file, encoding="utf-8") as fh:
+            data = json.load(fh)
+        self.table = {
+            (entry["state"], tuple(entry["team"])): float(entry["value"])
+            for entry in data.get("table", [])
+        }
+        self.factors = {
+            state: TeamFactors.from_dict(item)
+            for state, item in data.get("factors", {}).items()
+        }